@@ -0,0 +1,341 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import resource
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+
+# Fixed reference time of the seeded databases, so every run benchmarks the same data
+SEED_NOW = "2026-01-01T00:00:00"
+# Medellín, the default area of the seed generator
+BBOX = (-75.70, 6.10, -75.45, 6.40)
+WORDS = ["Central", "Parque", "Laureles", "Prado", "Boston", "Belén", "Poblado", "Robledo"]
+
+# Metrics compared against the baseline, and the minimum slowdown worth reporting
+COMPARED_METRICS = ("p50_ms", "p95_ms")
+NOISE_FLOOR_MS = 0.5
+
+
+def _random_point(rng: random.Random) -> tuple[float, float]:
+    return rng.uniform(BBOX[1], BBOX[3]), rng.uniform(BBOX[0], BBOX[2])
+
+
+def _random_box(rng: random.Random, size: float = 0.02) -> str:
+    lat, lon = _random_point(rng)
+    return f"{lon},{lat},{lon + size},{lat + size}"
+
+
+def _tile(rng: random.Random, zoom: int) -> tuple[int, int]:
+    lat, lon = _random_point(rng)
+    n = 1 << zoom
+    x = int((lon + 180) / 360 * n)
+    y = int((1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * n)
+    return x, y
+
+
+def _new_location(rng: random.Random, ctx: dict) -> dict:
+    lat, lon = _random_point(rng)
+    return {"name": f"Bench {rng.choice(WORDS)}", "latitude": lat, "longitude": lon, "rate": round(rng.uniform(0, 5), 1),
+            "description": "Benchmark location", "category_ids": [rng.choice(ctx["category_ids"])]}
+
+
+def _pop(ctx: dict, key: str):
+    return ctx[key].pop() if ctx[key] else None
+
+
+def _bench_categories(ctx: dict) -> list[int]:
+    # POST /categories/ does not return the id; the created categories are looked up by name once
+    if ctx["bench_category_ids"] is None:
+        ctx["bench_category_ids"] = ctx["find_categories"]("Bench category %")
+    return ctx["bench_category_ids"]
+
+
+# (name, request builder, share of --requests, key collecting the created ids). A builder gets
+# the random generator and the context, and returns httpx request arguments or None to skip.
+SCENARIOS = [
+    ("GET /", lambda rng, ctx: {"url": "/"}, 1, None),
+    ("GET /list/locations", lambda rng, ctx: {"url": "/list/locations", "params": {
+        "limit": 100, "cursor": ctx["encode_cursor"](rng.randint(0, ctx["max_location_id"]))}}, 1, None),
+    ("GET /list/locations?fields", lambda rng, ctx: {"url": "/list/locations", "params": {
+        "limit": 1000, "fields": "id,latitude,longitude"}}, 1, None),
+    ("GET /export/locations.ndjson", lambda rng, ctx: {"url": "/export/locations.ndjson"}, 0.01, None),
+    ("GET /locations?category_ids&match=all", lambda rng, ctx: {"url": "/locations", "params": {
+        "category_ids": ",".join(map(str, rng.sample(ctx["category_ids"], 2))), "match": "all", "limit": 100}}, 1, None),
+    ("GET /categories/{id}/locations", lambda rng, ctx: {
+        "url": f"/categories/{rng.choice(ctx['category_ids'])}/locations", "params": {"limit": 100}}, 1, None),
+    ("GET /locations/within", lambda rng, ctx: {"url": "/locations/within", "params": {"bbox": _random_box(rng)}}, 1, None),
+    ("GET /locations/near", lambda rng, ctx: {"url": "/locations/near", "params": dict(
+        zip(("lat", "lon"), _random_point(rng)), radius_m=500)}, 1, None),
+    ("GET /locations/nearest", lambda rng, ctx: {"url": "/locations/nearest", "params": dict(
+        zip(("lat", "lon"), _random_point(rng)), k=10)}, 1, None),
+    ("GET /locations/search", lambda rng, ctx: {"url": "/locations/search", "params": {
+        "q": rng.choice(WORDS), "bbox": _random_box(rng, 0.1)}}, 1, None),
+    ("GET /locations/autocomplete", lambda rng, ctx: {"url": "/locations/autocomplete", "params": {
+        "q": rng.choice(WORDS)[:3]}}, 1, None),
+    ("GET /locations/changes", lambda rng, ctx: {"url": "/locations/changes", "params": {"limit": 100}}, 1, None),
+    ("GET /locations/{id}", lambda rng, ctx: {"url": f"/locations/{rng.randint(1, ctx['max_location_id'])}"}, 1, None),
+    ("POST /locations/", lambda rng, ctx: {"method": "POST", "url": "/locations/", "json": _new_location(rng, ctx)},
+     1, "location_ids"),
+    ("POST /locations/bulk", lambda rng, ctx: {"method": "POST", "url": "/locations/bulk", "json": [
+        _new_location(rng, ctx) for _ in range(100)]}, 0.1, None),
+    ("PUT /locations/{id}", lambda rng, ctx: {"method": "PUT", "url": f"/locations/{rng.randint(1, ctx['max_location_id'])}",
+                                              "json": {"name": f"Bench {rng.choice(WORDS)}", "rate": round(rng.uniform(0, 5), 1)}},
+     1, None),
+    ("DELETE /locations/{id}", lambda rng, ctx: (lambda location_id: location_id and {
+        "method": "DELETE", "url": f"/locations/{location_id}"})(_pop(ctx, "location_ids")), 1, None),
+    ("POST /categories/", lambda rng, ctx: {"method": "POST", "url": "/categories/", "json": {
+        "name": f"Bench category {rng.random()}"}}, 1, None),
+    ("GET /list/categories/", lambda rng, ctx: {"url": "/list/categories/"}, 1, None),
+    ("GET /categories/{id}", lambda rng, ctx: {"url": f"/categories/{rng.choice(ctx['category_ids'])}"}, 1, None),
+    ("PUT /categories/{id}", lambda rng, ctx: _bench_categories(ctx) and {
+        "method": "PUT", "url": f"/categories/{rng.choice(_bench_categories(ctx))}",
+        "json": {"name": f"Bench category {rng.random()}"}}, 1, None),
+    ("DELETE /categories/{id}", lambda rng, ctx: (lambda category_id: category_id and {
+        "method": "DELETE", "url": f"/categories/{category_id}"})(_bench_categories(ctx) and _pop(ctx, "bench_category_ids")),
+     1, None),
+    ("POST /mark/reviews/", lambda rng, ctx: {"method": "POST", "url": "/mark/reviews/", "json": dict(
+        zip(("location_id", "category_id"), rng.choice(ctx["pairs"])))}, 1, None),
+    ("POST /mark/reviews/bulk", lambda rng, ctx: {"method": "POST", "url": "/mark/reviews/bulk", "json": [
+        dict(zip(("location_id", "category_id"), pair)) for pair in rng.sample(ctx["pairs"], 20)]}, 0.25, None),
+    ("GET /reviews/pending", lambda rng, ctx: {"url": "/reviews/pending"}, 1, None),
+    ("POST /reviews/lease", lambda rng, ctx: {"method": "POST", "url": "/reviews/lease", "params": {
+        "n": 10, "ttl": 1, "worker": f"bench-{rng.randint(1, 8)}"}}, 1, None),
+    ("GET /recommendations/reviews", lambda rng, ctx: {"url": "/recommendations/reviews"}, 1, None),
+    ("GET /clusters", lambda rng, ctx: {"url": "/clusters", "params": {
+        "bbox": ",".join(map(str, BBOX)), "zoom": rng.randint(10, 14)}}, 1, None),
+    ("GET /tiles/{z}/{x}/{y}", lambda rng, ctx: {"url": "/tiles/14/{}/{}".format(*_tile(rng, 14))}, 1, None),
+    ("GET /stats/locations", lambda rng, ctx: {"url": "/stats/locations", "params": {"cell_deg": 0.1}}, 0.05, None),
+    ("GET /stats/categories", lambda rng, ctx: {"url": "/stats/categories"}, 0.05, None),
+]
+
+
+def summarize(latencies: list[float], wall: float, errors: int = 0) -> dict:
+    """Latency percentiles (nearest rank) in milliseconds and throughput of a series of calls."""
+    ordered = sorted(latencies)
+    if not ordered:
+        return {"requests": 0, "errors": errors}
+
+    def percentile(p: float) -> float:
+        return round(ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)] * 1000, 3)
+
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "p50_ms": percentile(50),
+        "p95_ms": percentile(95),
+        "p99_ms": percentile(99),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "throughput_rps": round(len(ordered) / wall, 1) if wall else None,
+    }
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2 ** 20, 1)
+
+
+async def _measure_route(client, rng: random.Random, ctx: dict, build, collect: str | None, count: int,
+                         concurrency: int) -> dict:
+    latencies, errors = [], 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call():
+        nonlocal errors
+        request = build(rng, ctx)
+        if not request:
+            return
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request(request.pop("method", "GET"), **request)
+            latencies.append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            errors += 1
+        elif collect:
+            ctx[collect].append(response.json()["id"])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(count)))
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+
+def _measure_calls(function, count: int) -> dict:
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(count):
+        call_start = time.perf_counter()
+        function()
+        latencies.append(time.perf_counter() - call_start)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+async def run_worker(requests: int, concurrency: int, only: list[str] | None) -> dict:
+    """Benchmark every route and the review queries against the database in DB_PATH."""
+    import httpx
+    import main
+    from db.database import SessionLocal
+    from models.models import Category, Location, LocationCategoryReviewed
+    from routes.general_routes import get_pending_reviews
+    from sqlalchemy import func
+    from utils.fresh_recommendations import get_fresh_recommendations
+    from utils.pagination import encode_cursor
+    from utils.review_policy import REVIEW_PAGE_SIZE
+
+    rng = random.Random(0)
+    with SessionLocal() as db:
+        ctx = {
+            "max_location_id": db.query(func.max(Location.id)).scalar(),
+            "category_ids": [category_id for category_id, in db.query(Category.id).order_by(Category.id)],
+            "pairs": [tuple(pair) for pair in db.query(LocationCategoryReviewed.location_id,
+                                                       LocationCategoryReviewed.category_id).limit(10_000)],
+            "encode_cursor": encode_cursor,
+            "location_ids": [],
+            "bench_category_ids": None,
+        }
+
+    def find_categories(pattern: str) -> list[int]:
+        with SessionLocal() as db:
+            return [category_id for category_id, in db.query(Category.id).filter(Category.name.like(pattern))]
+
+    ctx["find_categories"] = find_categories
+
+    routes = {}
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for name, build, share, collect in SCENARIOS:
+                if only and not any(pattern in name for pattern in only):
+                    continue
+                count = max(2, int(requests * share))
+                await _measure_route(client, rng, ctx, build, None, min(3, count), 1)  # warm up
+                routes[name] = await _measure_route(client, rng, ctx, build, collect, count, concurrency)
+                print(f"  {name:<40} p50 {routes[name].get('p50_ms', '-'):>9} ms   "
+                      f"p95 {routes[name].get('p95_ms', '-'):>9} ms", file=sys.stderr)
+
+    with SessionLocal() as db:
+        micro = {
+            "get_fresh_recommendations": _measure_calls(lambda: get_fresh_recommendations(db), requests),
+            "get_pending_reviews": _measure_calls(lambda: get_pending_reviews(limit=REVIEW_PAGE_SIZE, db=db), requests),
+        }
+
+    return {
+        "startup_ms": getattr(main.app.state, "startup_timings", {}),
+        "routes": routes,
+        "micro": micro,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def prepare_database(size: int, data_dir: str) -> tuple[str, float]:
+    """Copy of a database seeded with size locations; the seeded original is kept for later runs."""
+    seeded = os.path.join(data_dir, f"locations_{size}.db")
+    seed_seconds = 0.0
+    if not os.path.exists(seeded):
+        start = time.perf_counter()
+        env = dict(os.environ, DEV="", DB_PATH=f"sqlite:///{seeded}")
+        subprocess.run([sys.executable, "-m", "seed", "--count", str(size), "--now", SEED_NOW, "--seed", "0"],
+                       env=env, check=True, stdout=subprocess.DEVNULL)
+        seed_seconds = round(time.perf_counter() - start, 1)
+        with sqlite3.connect(seeded) as conn:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    working = os.path.join(data_dir, f"locations_{size}.run.db")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(working + suffix):
+            os.remove(working + suffix)
+    shutil.copyfile(seeded, working)
+    return working, seed_seconds
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Lines describing every metric slower than the baseline by more than tolerance."""
+    regressions = []
+    for size, result in current["results"].items():
+        previous = baseline.get("results", {}).get(size)
+        if not previous:
+            continue
+        for group in ("routes", "micro"):
+            for name, stats in result[group].items():
+                old = previous.get(group, {}).get(name)
+                if not old:
+                    continue
+                for metric in COMPARED_METRICS:
+                    if metric in stats and metric in old and stats[metric] > old[metric] * (1 + tolerance) \
+                            and stats[metric] - old[metric] > NOISE_FLOOR_MS:
+                        regressions.append(f"{size:>8} {name:<40} {metric} {old[metric]:.2f} -> {stats[metric]:.2f} ms "
+                                           f"(+{(stats[metric] / old[metric] - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run",
+                                     description="Latency, throughput and memory of every route on seeded SQLite databases.")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma separated location counts")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per route (heavy routes run a fraction)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Requests in flight per route")
+    parser.add_argument("--only", help="Comma separated substrings; only the matching routes run")
+    parser.add_argument("--cache", action="store_true", help="Keep the response cache on (off by default, "
+                                                              "so the database path is measured)")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "map_my_world_benchmarks"),
+                        help="Where seeded databases are kept between runs")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file for the results")
+    parser.add_argument("--baseline", help="Results of a previous run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before reporting, 0.2 = 20%%")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 if anything regressed")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    only = [pattern.strip() for pattern in args.only.split(",")] if args.only else None
+
+    if args.worker:
+        result = asyncio.run(run_worker(args.requests, args.concurrency, only))
+        print(json.dumps(result))
+        return
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    report = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "cache": args.cache,
+        },
+        "results": {},
+    }
+    for size in (int(value) for value in args.sizes.split(",")):
+        print(f"{size:,} locations", file=sys.stderr)
+        path, seed_seconds = prepare_database(size, args.data_dir)
+        env = dict(os.environ, DEV="", DB_PATH=f"sqlite:///{path}", RESPONSE_CACHE_ENABLED="1" if args.cache else "0")
+        command = [sys.executable, "-m", "benchmarks.run", "--worker", "--requests", str(args.requests),
+                   "--concurrency", str(args.concurrency)] + (["--only", args.only] if args.only else [])
+        # One process per size: a fresh engine and in-memory indexes, and a peak RSS of its own
+        output = subprocess.run(command, env=env, check=True, stdout=subprocess.PIPE, text=True).stdout
+        report["results"][str(size)] = dict(json.loads(output.strip().splitlines()[-1]), seed_seconds=seed_seconds)
+
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(report, json.load(file), args.tolerance)
+        print("\n".join(["Regressions against the baseline:", *regressions]) if regressions
+              else "No regressions against the baseline", file=sys.stderr)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
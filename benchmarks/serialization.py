@@ -0,0 +1,87 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+# A throwaway database, configured before the app modules create their engine
+os.environ["DEV"] = ""
+os.environ["DB_PATH"] = f"sqlite:///{tempfile.mkdtemp()}/serialization.db"
+
+from sqlalchemy import insert
+from sqlalchemy.orm import selectinload
+from db.database import Base, SessionLocal, engine
+from models.models import Category, Location, LocationCategoryReviewed
+from routes.locations_routes import LOCATION_FIELDS, _location_columns, _location_dicts
+from schemas.schemas import LocationOut
+from utils.pagination import projected_response
+from utils.serialization import model_json_response
+
+
+def seed(db, rows: int):
+    random.seed(0)
+    db.execute(insert(Category), [{"name": f"Category {i}"} for i in range(20)])
+    db.execute(insert(Location), [{
+        "name": f"Location {i}",
+        "description": f"Description of location {i}",
+        "latitude": random.uniform(-60, 60),
+        "longitude": random.uniform(-180, 180),
+        "rate": round(random.uniform(0, 5), 1),
+    } for i in range(rows)])
+    db.execute(insert(LocationCategoryReviewed), [
+        {"location_id": location_id, "category_id": category_id}
+        for location_id in range(1, rows + 1) for category_id in random.sample(range(1, 21), 2)
+    ])
+    db.commit()
+
+
+def validated(db) -> bytes:
+    """Previous list path: ORM objects validated into LocationOut, then dumped by pydantic."""
+    locations = db.query(Location).options(selectinload(Location.categories)).order_by(Location.id).all()
+    return model_json_response(list[LocationOut], locations).body
+
+
+def projected(db) -> bytes:
+    """Current list path: column tuples projected to dicts and dumped by orjson."""
+    rows = db.query(*_location_columns(LOCATION_FIELDS)).order_by(Location.id).all()
+    return projected_response(_location_dicts(db, rows, LOCATION_FIELDS), None).body
+
+
+def measure(db, serializer, repeat: int) -> tuple[float, bytes]:
+    """Best wall time of repeat runs, each starting from an empty identity map."""
+    best, body = float("inf"), b""
+    for _ in range(repeat):
+        db.expunge_all()
+        start = time.perf_counter()
+        body = serializer(db)
+        best = min(best, time.perf_counter() - start)
+    return best, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rows per second of the location list serializers.")
+    parser.add_argument("--rows", type=int, default=10_000, help="Locations to seed and serialize")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per serializer, the best one is reported")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if not db.query(Location.id).first():
+            seed(db, args.rows)
+
+        results = {}
+        for name, serializer in (("validated", validated), ("projected", projected)):
+            results[name] = measure(db, serializer, args.repeat)
+            seconds, body = results[name]
+            print(f"{name:>10}: {args.rows / seconds:>12,.0f} rows/s  ({seconds * 1000:.1f} ms, {len(body):,} bytes)")
+
+        same = json.loads(results["validated"][1]) == json.loads(results["projected"][1])
+        print(f"   speedup: {results['validated'][0] / results['projected'][0]:.2f}x, same output: {same}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,14 @@
+import itertools
 import os
+import threading
+import time
+from contextvars import ContextVar
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 
 load_dotenv()
@@ -14,24 +20,252 @@ if DEV:
 else:
     SQLALCHEMY_DATABASE_URL = os.getenv("DB_PATH", "sqlite:///./map.db")
 
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """Read a boolean environment variable."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes")
+
+
+# Read replicas: comma separated URLs, reads are spread across them round-robin
+DB_REPLICA_URLS = [url.strip() for url in os.getenv("DB_REPLICA_PATHS", "").split(",") if url.strip()]
+# After a client writes, its reads go to the primary for this long so it sees its own changes
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+# Opt-in async stack (DB_ASYNC=true): serves the CRUD and review routes with async def handlers
+DB_ASYNC = env_flag("DB_ASYNC")
+
+# Connection pool
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = env_flag("DB_POOL_PRE_PING", True)
+
+# Applied to every new SQLite connection. WAL lets readers run alongside the writer and
+# busy_timeout makes writers wait for the lock instead of failing with "database is locked".
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"),
+    "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-65536"),  # negative means KiB: 64 MiB
+    "mmap_size": os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),
+    "temp_store": "MEMORY",
+}
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def async_database_url(url: str) -> str:
+    """Swap the sync driver of a database URL for its async counterpart."""
+    scheme, _, rest = url.partition("://")
+    backend = scheme.split("+")[0]
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}'")
+    return f"{ASYNC_DRIVERS[backend]}://{rest}"
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url.split("?")[0].rstrip("/") in ("sqlite:", "sqlite+aiosqlite:") or ":memory:" in url
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {pragma}={value}")
+    cursor.close()
+
+
+# [statements, seconds] of SQL run by the current request; the metrics middleware sets it
+request_sql_stats: ContextVar[list | None] = ContextVar("request_sql_stats", default=None)
+# Called as listener(conn, statement, parameters, seconds) after every statement
+statement_listeners = []
+# Called as listener(engine, seconds) with the time taken to open a new database connection
+connect_listeners = []
+# Called as listener(engine, seconds) with how long a connection stayed checked out of the pool
+checkin_listeners = []
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # On the execution context, so a statement that fails leaves nothing behind
+    if context is not None:
+        context.query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is None:
+        return
+    seconds = time.perf_counter() - context.query_started
+    stats = request_sql_stats.get()
+    if stats is not None:
+        stats[0] += 1
+        stats[1] += seconds
+    for listener in statement_listeners:
+        listener(conn, statement, parameters, seconds)
+
+
+def instrument_engine(new_engine):
+    """Time every statement, every new connection and how long each checkout holds its connection.
+
+    Pool timings use the pool events and keep their start times in the connection record's
+    info, so every checkout is seen whichever API asked for the connection.
+    """
+    event.listen(new_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(new_engine, "after_cursor_execute", _after_cursor_execute)
+
+    @event.listens_for(new_engine, "do_connect")
+    def _connect_started(dialect, connection_record, cargs, cparams):
+        connection_record.info["connect_started"] = time.perf_counter()
+
+    @event.listens_for(new_engine, "connect")
+    def _connected(dbapi_connection, connection_record):
+        started = connection_record.info.pop("connect_started", None)
+        if started is not None:
+            for listener in connect_listeners:
+                listener(new_engine, time.perf_counter() - started)
+
+    @event.listens_for(new_engine, "checkout")
+    def _checked_out(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(new_engine, "checkin")
+    def _checked_in(dbapi_connection, connection_record):
+        started = connection_record.info.pop("checked_out_at", None)
+        if started is not None:
+            for listener in checkin_listeners:
+                listener(new_engine, time.perf_counter() - started)
+
+
+def engine_options(url: str) -> dict:
+    """Pool settings for create_engine/create_async_engine."""
+    options = {"pool_pre_ping": DB_POOL_PRE_PING, "pool_recycle": DB_POOL_RECYCLE}
+    # In-memory SQLite uses a single shared connection, pool sizing does not apply
+    if not _is_memory_sqlite(url):
+        options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+    if url.startswith("sqlite"):
+        options["connect_args"] = {"check_same_thread": False}
+    return options
+
+
+def build_engine(url: str):
+    """Create a sync engine with the configured pool and, for SQLite, the tuning pragmas."""
+    new_engine = create_engine(url, **engine_options(url))
+    if url.startswith("sqlite"):
+        event.listen(new_engine, "connect", _set_sqlite_pragmas)
+    instrument_engine(new_engine)
+    return new_engine
+
+
+def build_async_engine(url: str):
+    """Async counterpart of build_engine."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    new_engine = create_async_engine(url, **engine_options(url))
+    if url.startswith("sqlite"):
+        event.listen(new_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    instrument_engine(new_engine.sync_engine)
+    return new_engine
+
+
 # Db engine
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+engine = build_engine(SQLALCHEMY_DATABASE_URL)
 
 # Session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+replica_engines = [build_engine(url) for url in DB_REPLICA_URLS]
+_replica_sessions = itertools.cycle([sessionmaker(autocommit=False, autoflush=False, bind=replica)
+                                     for replica in replica_engines])
+
+if DB_ASYNC:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    async_engine = build_async_engine(os.getenv("ASYNC_DB_PATH") or async_database_url(SQLALCHEMY_DATABASE_URL))
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False)
+else:
+    async_engine = None
+    AsyncSessionLocal = None
+
 # Base for models
 Base = declarative_base()
 
 
-def create_tables():
-    Base.metadata.create_all(bind=engine)
+def insert_ignore(db: Session | Connection, model):
+    """INSERT that silently skips rows violating a unique constraint (ON CONFLICT DO NOTHING)."""
+    dialect = (db.get_bind() if isinstance(db, Session) else db).dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return insert(model).prefix_with("IGNORE")
+    return dialect_insert(model).on_conflict_do_nothing()
+
+
+_recent_writers = {}  # client key -> monotonic time of its last commit
+_recent_writers_lock = threading.Lock()
+
+
+def client_key(request: Request | None) -> str | None:
+    """Identify the client for read-your-writes: X-Client-Id header, else its address."""
+    if request is None:
+        return None
+    return request.headers.get("X-Client-Id") or (request.client.host if request.client else None)
+
 
+@event.listens_for(Session, "after_commit")
+def _remember_writer(session):
+    key = session.info.get("client_key")
+    if key is None or not replica_engines:
+        return
+    now = time.monotonic()
+    with _recent_writers_lock:
+        _recent_writers[key] = now
+        if len(_recent_writers) > 10000:
+            for stale in [k for k, at in _recent_writers.items() if now - at > READ_YOUR_WRITES_SECONDS]:
+                del _recent_writers[stale]
 
-def get_db():
-    """Yields a database session for use in FastAPI routes."""
+
+def wrote_recently(key: str | None) -> bool:
+    at = _recent_writers.get(key) if key is not None else None
+    return at is not None and time.monotonic() - at < READ_YOUR_WRITES_SECONDS
+
+
+def read_session(key: str | None = None) -> Session:
+    """New session for read-only work: a replica, or the primary when there are no replicas
+    or the client wrote within the read-your-writes window."""
+    if not replica_engines or wrote_recently(key):
+        return SessionLocal()
+    return next(_replica_sessions)()
+
+
+def get_db(request: Request = None):
+    """Yields a database session on the primary for use in FastAPI routes."""
     db = SessionLocal()
+    db.info["client_key"] = client_key(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(request: Request = None):
+    """Yields a session for read-only FastAPI routes (see read_session)."""
+    db = read_session(client_key(request))
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db(request: Request = None):
+    """Yields an AsyncSession for use in the async FastAPI routes."""
+    async with AsyncSessionLocal() as db:
+        db.sync_session.info["client_key"] = client_key(request)
+        yield db
@@ -0,0 +1,142 @@
+from sqlalchemy import Column, Integer, MetaData, Table, inspect, select, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateColumn, CreateTable
+from db.database import Base, engine as default_engine, insert_ignore
+from models.models import Category, Location, LocationCategoryReviewed
+from utils.review_policy import reschedule
+from utils.search import ensure_search_index
+from utils.spatial import ensure_spatial_index
+
+
+# Single row holding the number of the last migration applied. Own MetaData so
+# create_all in the first migration does not stamp it as a regular model table.
+migrations_metadata = MetaData()
+schema_version = Table(
+    "schema_version", migrations_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("version", Integer, nullable=False),
+)
+
+
+class SchemaChanges:
+    """Adds the model columns and indexes missing from existing tables.
+
+    Reflects each table once per run, so a migration costs one inspection of the tables it
+    touches, and keeps the reflected names up to date as it alters them.
+    """
+
+    def __init__(self, conn: Connection):
+        self.conn = conn
+        self._inspector = inspect(conn)
+        self._columns = {}
+        self._indexes = {}
+
+    def _reflected(self, table_name: str) -> tuple[set, set]:
+        if table_name not in self._columns:
+            self._columns[table_name] = {column["name"] for column in self._inspector.get_columns(table_name)}
+            self._indexes[table_name] = {index["name"] for index in self._inspector.get_indexes(table_name)}
+        return self._columns[table_name], self._indexes[table_name]
+
+    def add_columns(self, model, *names: str) -> list[str]:
+        """ALTER TABLE ... ADD COLUMN for the columns not there yet; returns the ones added."""
+        table = model.__table__
+        columns, _ = self._reflected(table.name)
+        added = []
+        for name in names:
+            if name not in columns:
+                ddl = CreateColumn(table.c[name]).compile(dialect=self.conn.dialect)
+                self.conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+                columns.add(name)
+                added.append(name)
+        return added
+
+    def add_indexes(self, model, *names: str):
+        """Create the named indexes of a model that do not exist yet."""
+        table = model.__table__
+        _, indexes = self._reflected(table.name)
+        for index in table.indexes:
+            if index.name in names and index.name not in indexes:
+                index.create(self.conn)
+                indexes.add(index.name)
+
+
+def _create_missing_tables(schema: SchemaChanges):
+    # A new database gets the whole current schema here and every later step finds nothing to do
+    Base.metadata.create_all(schema.conn)
+
+
+def _change_sequence(schema: SchemaChanges):
+    schema.add_columns(Location, "change_seq")
+    schema.add_indexes(Location, "ix_locations_change_seq")
+    schema.add_columns(Category, "change_seq")
+    schema.add_indexes(Category, "ix_categories_change_seq")
+
+
+def _review_scheduling(schema: SchemaChanges):
+    schema.add_columns(Category, "review_interval_days")
+    added = schema.add_columns(LocationCategoryReviewed, "due_at", "leased_by", "lease_expires_at")
+    schema.add_indexes(LocationCategoryReviewed, "ix_lcr_due_at")
+    if "due_at" in added:
+        # The column default marks every pair as never reviewed; schedule the reviewed ones
+        with Session(bind=schema.conn) as db:
+            reschedule(db)
+
+
+def _lookup_indexes(schema: SchemaChanges):
+    schema.add_indexes(Location, "ix_locations_lat_lon")
+    schema.add_indexes(LocationCategoryReviewed, "ix_lcr_category_location")
+
+
+def _sqlite_indexes(schema: SchemaChanges):
+    ensure_spatial_index(schema.conn)
+    ensure_search_index(schema.conn)
+
+
+# Applied in order and never edited once released; changes to the schema go in a new entry
+MIGRATIONS = [
+    (1, "Create missing tables", _create_missing_tables),
+    (2, "Change sequence columns for incremental sync", _change_sequence),
+    (3, "Review due dates, intervals and leases", _review_scheduling),
+    (4, "Bounding box and category lookup indexes", _lookup_indexes),
+    (5, "SQLite R*Tree and FTS5 indexes", _sqlite_indexes),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def _read_version(conn: Connection) -> int:
+    return conn.execute(select(schema_version.c.version).where(schema_version.c.id == 1)).scalar() or 0
+
+
+def run_migrations(engine: Engine = default_engine) -> list[int]:
+    """Bring the database schema up to date; returns the migrations applied.
+
+    An up-to-date database costs a CREATE TABLE IF NOT EXISTS and a primary key lookup. Otherwise
+    the migrations run in a single transaction holding the schema_version row lock, so when
+    several workers boot together one migrates and the others wait, then find nothing to do.
+    """
+    with engine.connect() as conn:
+        conn.execute(CreateTable(schema_version, if_not_exists=True))
+        conn.commit()
+        if _read_version(conn) >= LATEST_VERSION:
+            return []
+
+    with engine.begin() as conn:
+        conn.execute(insert_ignore(conn, schema_version).values(id=1, version=0))
+        # Write lock (SQLite) / row lock (PostgreSQL) held until commit
+        conn.execute(update(schema_version).where(schema_version.c.id == 1).values(version=schema_version.c.version))
+        current = _read_version(conn)
+        pending = [migration for migration in MIGRATIONS if migration[0] > current]
+
+        schema = SchemaChanges(conn)
+        for version, _, migrate in pending:
+            migrate(schema)
+        if pending:
+            conn.execute(update(schema_version).where(schema_version.c.id == 1).values(version=pending[-1][0]))
+        return [version for version, _, _ in pending]
+
+
+if __name__ == "__main__":
+    applied = run_migrations()
+    print(f"Applied migrations: {applied}" if applied else f"Schema already at version {LATEST_VERSION}")
@@ -1,19 +1,30 @@
-from fastapi import FastAPI, Request
+from fastapi import APIRouter, FastAPI, Request
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
+from fastapi.routing import APIRoute
 from sqlalchemy.exc import SAWarning
 
-from db.database import engine, Base, get_db
+from db.database import engine, SessionLocal, DB_ASYNC
+from db.migrations import run_migrations
 from routes.general_routes import router as crud_router
 from routes.locations_routes import router as locations_router
 from routes.categories_routes import router as categories_router
+from routes.stats_routes import router as stats_router
+from routes.metrics_routes import router as metrics_router
 from utils.default_categories import create_default_categories
 from fastapi.middleware.cors import CORSMiddleware
-from db.database import create_tables
+from utils.index_sync import location_indexes
+from utils.category_cache import category_cache
+from utils.metrics import METRICS_ENABLED, MetricsMiddleware
+from utils.query_guard import QUERY_GUARD_ENABLED, QueryGuardMiddleware
+import logging
+import time
 import warnings
 
 warnings.filterwarnings("ignore", category=SAWarning)
 
+logger = logging.getLogger("uvicorn.error")
+
 app = FastAPI(title="Map My World Rest API",
               description="A simple FastAPI Rest API with CRUD operations and default categories. includes"
                           " graphical map interface for testing.",
@@ -42,18 +53,63 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if QUERY_GUARD_ENABLED:
+    app.add_middleware(QueryGuardMiddleware)
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+
+def include_router_with_overrides(app: FastAPI, router: APIRouter, overrides: APIRouter | None = None):
+    """Include a router, swapping in the override route for each path/method both define.
+
+    Routes keep their original position, so static paths like /locations/nearest still
+    match before /locations/{location_id}.
+    """
+    replacements = {(route.path, frozenset(route.methods)): route for route in overrides.routes} if overrides else {}
+    merged = APIRouter()
+    merged.routes = [
+        replacements.get((route.path, frozenset(route.methods)), route) if isinstance(route, APIRoute) else route
+        for route in router.routes
+    ]
+    app.include_router(merged)
 
-Base.metadata.create_all(bind=engine)
+
+# Async handlers replace their sync counterparts; sync-only endpoints (search, export, bulk...) stay
+async_router = None
+if DB_ASYNC:
+    from routes.async_routes import router as async_router
 
 # adding routers
-app.include_router(crud_router)
-app.include_router(locations_router)
-app.include_router(categories_router)
+include_router_with_overrides(app, crud_router, async_router)
+include_router_with_overrides(app, locations_router, async_router)
+include_router_with_overrides(app, categories_router, async_router)
+app.include_router(stats_router)
+if METRICS_ENABLED:
+    app.include_router(metrics_router)
 
 
 @app.on_event("startup")
 def startup_event():
-    """Create default categories on startup."""
-    db = next(get_db())
-    create_default_categories(db)
-    create_tables()
+    """Migrate the schema, create default categories and load the in-memory indexes.
+    The time taken by each step is logged and kept in app.state.startup_timings."""
+    timings = {}
+
+    def timed(step, function, *args):
+        start = time.perf_counter()
+        result = function(*args)
+        timings[step] = round((time.perf_counter() - start) * 1000, 1)
+        return result
+
+    applied = timed("migrations", run_migrations, engine)
+    db = SessionLocal()
+    try:
+        timed("default_categories", create_default_categories, db)
+        location_indexes.load(db, timed)
+        timed("category_cache", category_cache.load, db)
+    finally:
+        db.close()
+
+    app.state.startup_timings = timings
+    logger.info("Startup finished in %.1f ms (migrations applied: %s): %s",
+                sum(timings.values()), applied or "none",
+                ", ".join(f"{step} {ms} ms" for step, ms in timings.items()))
@@ -1,7 +1,11 @@
 from db.database import Base
 from datetime import datetime
 from sqlalchemy.orm import relationship
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, UniqueConstraint, Boolean, sql
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, UniqueConstraint, Boolean, Index, sql
+
+
+# due_at of associations never reviewed, so they sort ahead of every overdue one
+NEVER_REVIEWED_DUE_AT = datetime(1970, 1, 1)
 
 
 class Location(Base):
@@ -15,17 +19,26 @@ class Location(Base):
     description = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    change_seq = Column(Integer, nullable=False, default=0, server_default="0", index=True)
 
     reviews = relationship("LocationCategoryReviewed", back_populates="location", cascade="all, delete-orphan")
     location_categories = relationship("LocationCategoryReviewed", back_populates="location")
     categories = relationship("Category", secondary="location_category_reviewed", back_populates="locations", overlaps="location_categories,category_locations")
 
+    __table_args__ = (
+        # Fallback for bbox/radius searches on backends without the SQLite R*Tree
+        Index("ix_locations_lat_lon", "latitude", "longitude"),
+    )
+
 
 class Category(Base):
     """Represents a category that can be associated with locations."""
     __tablename__ = "categories"
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, nullable=False)
+    # Overrides REVIEW_INTERVAL_DAYS for the locations of this category
+    review_interval_days = Column(Float, nullable=True)
+    change_seq = Column(Integer, nullable=False, default=0, server_default="0", index=True)
 
     category_locations = relationship("LocationCategoryReviewed", back_populates="category")
     locations = relationship("Location", secondary="location_category_reviewed", back_populates="categories", overlaps="location_categories,category_locations")
@@ -39,9 +52,37 @@ class LocationCategoryReviewed(Base):
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
     was_reviewed = Column(Boolean, nullable=False, default=False, server_default=sql.expression.false())
     last_reviewed = Column(DateTime, nullable=True)
+    # When the pair needs its next review, maintained on every review
+    due_at = Column(DateTime, nullable=False, default=NEVER_REVIEWED_DUE_AT,
+                    server_default=NEVER_REVIEWED_DUE_AT.isoformat(sep=" "))
+    # Reviewer currently holding the pair, until lease_expires_at
+    leased_by = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
 
     location = relationship("Location", back_populates="reviews", overlaps="categories,locations")
     category = relationship("Category", back_populates="category_locations", overlaps="locations,categories")
     __table_args__ = (
         UniqueConstraint("location_id", "category_id", name="unique_location_category_pair"),
+        # The review queue: "due_at <= now ORDER BY due_at LIMIT n" is a range scan of this index
+        Index("ix_lcr_due_at", "due_at", "id"),
+        # Reverse lookups (locations of a category) without touching the table
+        Index("ix_lcr_category_location", "category_id", "location_id"),
     )
+
+
+class TableVersion(Base):
+    """Change counter per table, bumped in the same transaction as each write to it.
+    Lets every worker detect that its in-process caches are stale with a single PK lookup."""
+    __tablename__ = "table_versions"
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class DeletedRecord(Base):
+    """Tombstone left by a delete, so incremental sync clients learn about removed rows."""
+    __tablename__ = "deleted_records"
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)
+    record_id = Column(Integer, nullable=False)
+    change_seq = Column(Integer, nullable=False, index=True)
+    deleted_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,141 @@
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.database import get_async_db
+from routes import categories_routes, general_routes, locations_routes
+from schemas.schemas import LocationSchema, LocationCreate, LocationOut, LocationUpdate, CategoryCreate, \
+    CategoryOut, CategoryUpdate, ReviewInput, ReviewBulkOut, ReviewLeaseOut, AsociationOut, RecommendationOut
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+from utils.review_policy import REVIEW_PAGE_SIZE
+from utils.reviews import MAX_REVIEW_LEASE_SIZE, MAX_REVIEW_LEASE_TTL, REVIEW_LEASE_TTL
+from utils.serialization import json_adapter
+
+
+router = APIRouter()
+
+
+async def _run(db: AsyncSession, handler, *args, response_model=None, **kwargs):
+    """Run a sync route handler through AsyncSession.run_sync.
+
+    The route logic is shared with the sync routers, but every statement goes through the
+    async driver (aiosqlite/asyncpg), so waiting on the database does not hold a threadpool
+    worker. The result is validated inside run_sync, where lazy loads are still allowed.
+    """
+    adapter = json_adapter(response_model) if response_model is not None else None
+
+    def call(session):
+        result = handler(*args, db=session, **kwargs)
+        if adapter is None or isinstance(result, Response):
+            return result
+        return adapter.validate_python(result, from_attributes=True)
+
+    return await db.run_sync(call)
+
+
+@router.post("/locations/", response_model=LocationSchema, tags=["Locations"])
+async def create_new_location(location: LocationCreate, db: AsyncSession = Depends(get_async_db)):
+    """Create a new location."""
+    return await _run(db, locations_routes.create_new_location, location, response_model=LocationSchema)
+
+
+@router.get("/list/locations", response_model=list[LocationOut], tags=["Locations"])
+async def list_all_locations(request: Request,
+                             limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                             cursor: str | None = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
+                             fields: str | None = Query(None, description="Comma separated fields, e.g. id,latitude,longitude"),
+                             stream: bool = Query(False, description="Stream every location after the cursor as NDJSON"),
+                             db: AsyncSession = Depends(get_async_db)):
+    """List locations with their associated categories, one page at a time.
+    The cursor for the next page is returned in the X-Next-Cursor header."""
+    return await _run(db, locations_routes.list_all_locations, request, limit, cursor, fields, stream,
+                      response_model=list[LocationOut])
+
+
+@router.get("/locations/{location_id}", response_model=LocationOut, tags=["Locations"])
+async def get_location_by_id(location_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Get a specific location by ID."""
+    return await _run(db, locations_routes.get_location_by_id, location_id, request, response_model=LocationOut)
+
+
+@router.put("/locations/{location_id}", response_model=LocationOut, tags=["Locations"])
+async def update_location_by_id(location_id: int, location: LocationUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Update a specific location by ID."""
+    return await _run(db, locations_routes.update_location_by_id, location_id, location, response_model=LocationOut)
+
+
+@router.delete("/locations/{location_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["Locations"])
+async def delete_location(location_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Delete a specific location by ID."""
+    return await _run(db, locations_routes.delete_location, location_id)
+
+
+@router.post("/categories/", response_model=CategoryCreate, tags=["Categories"])
+async def create_new_category(category: CategoryCreate, db: AsyncSession = Depends(get_async_db)):
+    """Add a new category."""
+    return await _run(db, categories_routes.create_new_category, category, response_model=CategoryCreate)
+
+
+@router.get("/list/categories/", response_model=list[CategoryOut], tags=["Categories"])
+async def list_all_categories(request: Request,
+                              limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                              cursor: str | None = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
+                              fields: str | None = Query(None, description="Comma separated fields, e.g. id"),
+                              db: AsyncSession = Depends(get_async_db)):
+    """List categories, one page at a time.
+    The cursor for the next page is returned in the X-Next-Cursor header."""
+    return await _run(db, categories_routes.list_all_categories, request, limit, cursor, fields,
+                      response_model=list[CategoryOut])
+
+
+@router.get("/categories/{category_id}", response_model=CategoryOut, tags=["Categories"])
+async def get_category_by_id(category_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Get a specific category by ID."""
+    return await _run(db, categories_routes.get_category_by_id, category_id, response_model=CategoryOut)
+
+
+@router.put("/categories/{category_id}", response_model=CategoryOut, tags=["Categories"])
+async def update_category_by_id(category_id: int, updated: CategoryUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Update a specific category by ID."""
+    return await _run(db, categories_routes.update_category_by_id, category_id, updated, response_model=CategoryOut)
+
+
+@router.delete("/categories/{category_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["Categories"])
+async def delete_category(category_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Delete a specific category by ID."""
+    return await _run(db, categories_routes.delete_category, category_id)
+
+
+@router.post("/mark/reviews/", tags=["Generals"])
+async def mark_location_as_reviewed(data: ReviewInput, db: AsyncSession = Depends(get_async_db)):
+    """Mark a specific location-category combination as reviewed."""
+    return await _run(db, general_routes.mark_location_as_reviewed, data)
+
+
+@router.post("/mark/reviews/bulk", response_model=ReviewBulkOut, tags=["Generals"])
+async def mark_locations_as_reviewed_bulk(data: list[ReviewInput], db: AsyncSession = Depends(get_async_db)):
+    """Mark many location-category combinations as reviewed in one set-based update."""
+    return await _run(db, general_routes.mark_locations_as_reviewed_bulk, data)
+
+
+@router.get("/reviews/pending", response_model=list[AsociationOut], tags=["Generals"])
+async def get_pending_reviews(limit: int = Query(REVIEW_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                              db: AsyncSession = Depends(get_async_db)):
+    """Get up to limit (10 by default) location-category combinations pending review."""
+    return await _run(db, general_routes.get_pending_reviews, limit, response_model=list[AsociationOut])
+
+
+@router.post("/reviews/lease", response_model=list[ReviewLeaseOut], tags=["Generals"])
+async def lease_reviews(request: Request,
+                        n: int = Query(REVIEW_PAGE_SIZE, ge=1, le=MAX_REVIEW_LEASE_SIZE, description="How many pairs to claim"),
+                        ttl: int = Query(REVIEW_LEASE_TTL, ge=1, le=MAX_REVIEW_LEASE_TTL, description="Lease duration in seconds"),
+                        worker: str | None = Query(None, description="Reviewer id, by default the X-Client-Id header or the client address"),
+                        db: AsyncSession = Depends(get_async_db)):
+    """Claim up to n location-category combinations due for review.
+    Nobody else receives them until they are marked as reviewed or the lease expires."""
+    return await _run(db, general_routes.lease_reviews, request, n, ttl, worker)
+
+
+@router.get("/recommendations/reviews", response_model=list[RecommendationOut], tags=["Generals"])
+async def get_recommendations_needs_review(limit: int = Query(REVIEW_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                                           db: AsyncSession = Depends(get_async_db)):
+    """Get up to limit (10 by default) location-category combinations that need review."""
+    return await _run(db, general_routes.get_recommendations_needs_review, limit)
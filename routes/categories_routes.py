@@ -1,9 +1,18 @@
-from db.database import get_db
-from models.models import Category
+from db.database import get_db, get_read_db
+from models.models import Category, LocationCategoryReviewed
 from sqlalchemy.orm import Session
 from schemas.schemas import CategoryCreate, CategoryOut, CategoryUpdate
+from utils.location_index import location_index
+from utils.category_cache import category_cache
+from utils.changes import next_change_seq, record_deletion, touch_locations_of_category
+from utils.response_cache import response_cache
+from utils.serialization import model_json_response
+from utils.table_versions import bump_table_version
+from utils.review_policy import reschedule
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, decode_cursor, next_cursor, \
+    parse_fields, projected_response
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, Query, Request, status, HTTPException
 
 
 router = APIRouter(tags=["Categories"])
@@ -12,10 +21,11 @@ router = APIRouter(tags=["Categories"])
 @router.post("/categories/", response_model=CategoryCreate)
 def create_new_category(category: CategoryCreate, db: Session = Depends(get_db)):
     """Add a new category."""
-    new_category = Category(name=category.name)
-
     try:
+        new_category = Category(name=category.name, review_interval_days=category.review_interval_days,
+                                change_seq=next_change_seq(db))
         db.add(new_category)
+        bump_table_version(db, "categories")
         db.commit()
         db.refresh(new_category)
         return new_category
@@ -30,23 +40,43 @@ def create_new_category(category: CategoryCreate, db: Session = Depends(get_db))
 
 
 @router.get("/list/categories/", response_model=list[CategoryOut])
-def list_all_categories(db: Session = Depends(get_db)):
-    """List all categories."""
-    try:
-        categories = db.query(Category).all()
-        if not categories:
+def list_all_categories(request: Request,
+                        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                        cursor: str | None = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
+                        fields: str | None = Query(None, description="Comma separated fields, e.g. id"),
+                        db: Session = Depends(get_read_db)):
+    """List categories, one page at a time.
+    The cursor for the next page is returned in the X-Next-Cursor header."""
+    after = decode_cursor(cursor)
+    selected = parse_fields(fields, CategoryOut.model_fields)
+
+    def build():
+        categories = category_cache.all(db)
+        if after is not None:
+            categories = [category for category in categories if category.id > after]
+        categories = categories[:limit + 1]
+        if not categories and after is None:
             raise HTTPException(status_code=404, detail="No categories found")
-        return categories
+
+        cursor = next_cursor(categories, limit)
+        categories = categories[:limit]
+        if selected is None:
+            return model_json_response(list[CategoryOut], categories, {NEXT_CURSOR_HEADER: cursor} if cursor else None)
+
+        return projected_response([{field: getattr(row, field) for field in selected} for row in categories], cursor)
+
+    try:
+        return response_cache.respond(request, db, ("categories",), build)
 
     except SQLAlchemyError:
         raise HTTPException(status_code=500, detail="Database error occurred while retrieving categories")
 
 
 @router.get("/categories/{category_id}", response_model=CategoryOut)
-def get_category_by_id(category_id: int, db: Session = Depends(get_db)):
+def get_category_by_id(category_id: int, db: Session = Depends(get_read_db)):
     """Get a specific category by ID."""
     try:
-        category = db.query(Category).filter(Category.id == category_id).first()
+        category = category_cache.get(db, category_id)
         if not category:
             raise HTTPException(status_code=404, detail="Category not found")
         return category
@@ -64,6 +94,13 @@ def update_category_by_id(category_id: int, updated: CategoryUpdate, db: Session
             raise HTTPException(status_code=404, detail="Category not found")
 
         category.name = updated.name
+        category.change_seq = next_change_seq(db)
+        touch_locations_of_category(db, category_id)
+        if "review_interval_days" in updated.model_fields_set \
+                and updated.review_interval_days != category.review_interval_days:
+            category.review_interval_days = updated.review_interval_days
+            reschedule(db, LocationCategoryReviewed.category_id == category_id)
+        bump_table_version(db, "categories")
         db.commit()
         db.refresh(category)
         return category
@@ -85,8 +122,15 @@ def delete_category(category_id: int, db: Session = Depends(get_db)):
         if not category:
             raise HTTPException(status_code=404, detail="Category not found")
 
+        # Associations go first; the ORM would otherwise try to null their category_id
+        touch_locations_of_category(db, category_id)
+        db.query(LocationCategoryReviewed).filter(LocationCategoryReviewed.category_id == category_id) \
+            .delete(synchronize_session=False)
         db.delete(category)
+        record_deletion(db, "category", category_id)
+        bump_table_version(db, "categories")
         db.commit()
+        location_index.drop_category(category_id)
         return  # 204 No Content → no body
 
     except SQLAlchemyError:
@@ -1,29 +1,39 @@
-from datetime import datetime, timedelta
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session, selectinload
-from db.database import get_db
-from fastapi import HTTPException, Request, APIRouter, Depends, status
+from db.database import client_key, get_db, get_read_db
+from fastapi import HTTPException, Request, APIRouter, Depends, Path, Query, status
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from utils.fresh_recommendations import get_fresh_recommendations
+from utils.review_policy import REVIEW_PAGE_SIZE
+from utils.reviews import MAX_REVIEW_LEASE_SIZE, MAX_REVIEW_LEASE_TTL, REVIEW_LEASE_TTL, due_reviews, \
+    lease_due_reviews, mark_pairs_reviewed
+from utils.pagination import MAX_BULK_ITEMS, MAX_PAGE_SIZE
+from utils.category_cache import category_cache
+from utils.clusters import CLUSTER_POINT_LIMIT, cluster_index, from_mercator, mercator_boxes, to_mercator
+from utils.index_sync import location_indexes
+from utils.response_cache import response_cache
+from utils.serialization import model_json_response
+from utils.spatial import bbox_condition, parse_bbox
 from models.models import Location, Category, LocationCategoryReviewed
 from schemas.schemas import LocationSchema, CategoryCreate, LocationCreate, CategoryOut, RecommendationOut, \
     AsociationOut
-from schemas.schemas import ReviewInput
+from schemas.schemas import ReviewInput, ReviewBulkOut, ReviewLeaseOut, ClusterOut
 
 
 router = APIRouter(tags=["Generals"])
 
 templates = Jinja2Templates(directory="templates")
 
+MAX_MAP_ZOOM = 22
+
 
 @router.get("/", response_class=HTMLResponse)
-def serve_map(request: Request, db: Session = Depends(get_db)):
+def serve_map(request: Request, db: Session = Depends(get_read_db)):
     """Serve the main map page with categories(Render the sandbox)"""
     try:
-        categories = db.query(Category).all()
-        return templates.TemplateResponse("map.html", {
-            "request": request,
+        categories = category_cache.all(db)
+        return templates.TemplateResponse(request, "map.html", {
             "categories": categories
         })
 
@@ -31,19 +41,79 @@ def serve_map(request: Request, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail="Database error while loading map page")
 
 
+def _in_box(x: float, y: float, x0: float, y0: float, x1: float, y1: float) -> bool:
+    """Half-open box test, closed on the edges of the world, so adjacent tiles never share a point."""
+    return (x0 <= x < x1 or x == x1 == 1.0) and (y0 <= y < y1 or y == y1 == 1.0)
+
+
+def _clusters_in_boxes(db: Session, zoom: int, boxes) -> list[dict]:
+    """Clusters inside Mercator boxes; past the deepest cluster level, the locations themselves if few enough."""
+    if zoom > cluster_index.max_zoom:
+        points = []
+        for box in boxes:
+            max_lat, min_lon = from_mercator(box[0], box[1])
+            min_lat, max_lon = from_mercator(box[2], box[3])
+            rows = db.query(Location.id, Location.latitude, Location.longitude).filter(
+                bbox_condition(db.get_bind(), min_lon, min_lat, max_lon, max_lat)
+            ).limit(CLUSTER_POINT_LIMIT + 1).all()
+            points += [{"latitude": row.latitude, "longitude": row.longitude, "count": 1, "location_id": row.id}
+                       for row in rows if _in_box(*to_mercator(row.latitude, row.longitude), *box)]
+            if len(points) > CLUSTER_POINT_LIMIT:
+                break
+        else:
+            return points
+
+    # Refreshed after the cache key was taken, so the clusters are never older than its versions
+    location_indexes.refresh(db)
+    return [cluster for box in boxes for cluster in cluster_index.clusters(zoom, *box)]
+
+
+@router.get("/clusters", response_model=list[ClusterOut])
+def get_clusters(request: Request,
+                 bbox: str = Query(..., description="min_lon,min_lat,max_lon,max_lat"),
+                 zoom: int = Query(..., ge=0, le=MAX_MAP_ZOOM),
+                 db: Session = Depends(get_read_db)):
+    """Clustered locations inside a bounding box, for a map at the given zoom level."""
+    try:
+        boxes = mercator_boxes(*parse_bbox(bbox))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        return response_cache.respond(request, db, ("locations",), lambda: model_json_response(
+            list[ClusterOut], _clusters_in_boxes(db, zoom, boxes)))
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Database error while retrieving clusters")
+
+
+@router.get("/tiles/{z}/{x}/{y}", response_model=list[ClusterOut])
+def get_tile_clusters(request: Request,
+                      z: int = Path(..., ge=0, le=MAX_MAP_ZOOM),
+                      x: int = Path(..., ge=0),
+                      y: int = Path(..., ge=0),
+                      db: Session = Depends(get_read_db)):
+    """Clustered locations of one slippy-map tile (same z/x/y scheme as OpenStreetMap)."""
+    n = 1 << z
+    if x >= n or y >= n:
+        raise HTTPException(status_code=404, detail="Tile not found")
+
+    box = (x / n, y / n, (x + 1) / n, (y + 1) / n)
+    try:
+        return response_cache.respond(request, db, ("locations",), lambda: model_json_response(
+            list[ClusterOut], _clusters_in_boxes(db, z, [box])))
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Database error while retrieving clusters")
+
+
 @router.post("/mark/reviews/")
 def mark_location_as_reviewed(data: ReviewInput, db: Session = Depends(get_db)):
     """Mark a specific location-category combination as reviewed."""
     try:
-        association = db.query(LocationCategoryReviewed).filter(
-            LocationCategoryReviewed.location_id == data.location_id,
-            LocationCategoryReviewed.category_id == data.category_id).first()
-
-        if not association:
+        # Single UPDATE ... RETURNING round-trip, no ORM load
+        if not mark_pairs_reviewed(db, [(data.location_id, data.category_id)]):
+            db.rollback()
             raise HTTPException(status_code=400, detail="Location-Category association not found")
 
-        association.last_reviewed = datetime.utcnow()
-        association.was_reviewed = True
         db.commit()
 
         return {"message": "Location-category combination marked as reviewed successfully",
@@ -55,29 +125,84 @@ def mark_location_as_reviewed(data: ReviewInput, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail="Database error while marking as reviewed")
 
 
+@router.post("/mark/reviews/bulk", response_model=ReviewBulkOut)
+def mark_locations_as_reviewed_bulk(data: list[ReviewInput], db: Session = Depends(get_db)):
+    """Mark many location-category combinations as reviewed in one set-based update."""
+    if len(data) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_ITEMS} items per request")
+
+    try:
+        pairs = [(item.location_id, item.category_id) for item in data]
+        matched = mark_pairs_reviewed(db, pairs)
+        db.commit()
+
+    except SQLAlchemyError:
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Database error while marking as reviewed")
+
+    return ReviewBulkOut(
+        matched=[ReviewInput(location_id=l_id, category_id=c_id) for l_id, c_id in dict.fromkeys(pairs) if (l_id, c_id) in matched],
+        missing=[ReviewInput(location_id=l_id, category_id=c_id) for l_id, c_id in dict.fromkeys(pairs) if (l_id, c_id) not in matched],
+    )
+
+
 @router.get("/reviews/pending", response_model=list[AsociationOut])
-def get_pending_reviews(db: Session = Depends(get_db)):
-    """Get up to 10 location-category combinations pending review.
+def get_pending_reviews(limit: int = Query(REVIEW_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                        db: Session = Depends(get_read_db)):
+    """Get up to limit (10 by default) location-category combinations pending review.
     (less strictly, and client info friendly that /recommendations/reviews")"""
-    threshold = datetime.utcnow() - timedelta(days=30)
+    try:
+        # Never reviewed first (due_at at the epoch), then the most overdue
+        return due_reviews(db).limit(limit).all()
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Database error while retrieving pending reviews")
+
 
-    subquery = db.query(LocationCategoryReviewed).filter(
-        (LocationCategoryReviewed.was_reviewed == False) |
-        (LocationCategoryReviewed.last_reviewed < threshold)
-    ).order_by(
-        LocationCategoryReviewed.was_reviewed.asc(),  # priority never reviewed
-        LocationCategoryReviewed.last_reviewed.asc()  # then by last reviewed date
-    ).limit(10).all()
+@router.post("/reviews/lease", response_model=list[ReviewLeaseOut])
+def lease_reviews(request: Request,
+                  n: int = Query(REVIEW_PAGE_SIZE, ge=1, le=MAX_REVIEW_LEASE_SIZE, description="How many pairs to claim"),
+                  ttl: int = Query(REVIEW_LEASE_TTL, ge=1, le=MAX_REVIEW_LEASE_TTL, description="Lease duration in seconds"),
+                  worker: str | None = Query(None, description="Reviewer id, by default the X-Client-Id header or the client address"),
+                  db: Session = Depends(get_db)):
+    """Claim up to n location-category combinations due for review.
+    Nobody else receives them until they are marked as reviewed or the lease expires."""
+    worker = worker or client_key(request)
+    if not worker:
+        raise HTTPException(status_code=400, detail="A worker id is required")
 
-    return subquery
+    try:
+        leased_ids = lease_due_reviews(db, worker, n, ttl)
+        db.commit()
+        if not leased_ids:
+            return []
+
+        results = db.query(
+            LocationCategoryReviewed.id,
+            LocationCategoryReviewed.location_id,
+            LocationCategoryReviewed.category_id,
+            Location.name.label('location_name'),
+            Category.name.label('category_name'),
+            LocationCategoryReviewed.last_reviewed,
+            LocationCategoryReviewed.leased_by,
+            LocationCategoryReviewed.lease_expires_at
+        ).join(Location, LocationCategoryReviewed.location_id == Location.id) \
+         .join(Category, LocationCategoryReviewed.category_id == Category.id) \
+         .filter(LocationCategoryReviewed.id.in_(leased_ids)) \
+         .order_by(LocationCategoryReviewed.due_at, LocationCategoryReviewed.id).all()
+        return [ReviewLeaseOut(**r._mapping) for r in results]
+
+    except SQLAlchemyError:
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Database error while leasing reviews")
 
 
 @router.get("/recommendations/reviews", response_model=list[RecommendationOut])
-def get_recommendations_needs_review(db: Session = Depends(get_db)):
-    """Get 10 location-category combinations that need review.
+def get_recommendations_needs_review(limit: int = Query(REVIEW_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                                     db: Session = Depends(get_read_db)):
+    """Get up to limit (10 by default) location-category combinations that need review.
     (more strictly, and client info friendly that /reviews/pending)"""
     try:
-        return get_fresh_recommendations(db)
+        return get_fresh_recommendations(db, limit)
     except SQLAlchemyError:
         raise HTTPException(status_code=500, detail="Database error while retrieving recommendations")
     except Exception as e:
@@ -1,8 +1,30 @@
-from db.database import get_db
+import os
+import orjson
+from typing import Literal
+from db.database import get_db, get_read_db, read_session
 from fastapi import APIRouter
 from models.models import Location, Category, LocationCategoryReviewed
-from schemas.schemas import LocationSchema, LocationCreate, LocationOut, LocationUpdate
-from fastapi import HTTPException, status
+from schemas.schemas import LocationSchema, LocationCreate, LocationOut, LocationUpdate, LocationNearOut, \
+    BulkLocationResult, ChangesOut, LocationSuggestionOut
+from pydantic import ValidationError
+from utils.categories import location_ids_in_categories
+from utils.category_cache import category_cache
+from utils.changes import changes_since, decode_change_cursor, encode_change_cursor, next_change_seq, record_deletion
+from utils.spatial import bbox_condition, haversine_m, parse_bbox, radius_bbox
+from utils.clusters import cluster_index
+from utils.index_sync import location_indexes
+from utils.location_index import location_index
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_BULK_ITEMS, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, decode_cursor, \
+    encode_cursor, next_cursor, parse_fields, projected_response
+from utils.response_cache import response_cache
+from utils.review_policy import reschedule
+from utils.search import apply_text_search, name_index, search_terms
+from utils.serialization import NDJSON_MEDIA_TYPE, model_json_response, to_json_line
+from utils.table_versions import bump_table_version
+from fastapi import HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, insert, select
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session, selectinload
 from fastapi import Depends
@@ -10,6 +32,104 @@ from fastapi import Depends
 
 router = APIRouter(tags=["Locations"])
 
+MAX_SPATIAL_RESULTS = 1000
+MAX_SEARCH_RADIUS_M = 500_000
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+MAX_SUGGESTIONS = 50
+MAX_FILTER_CATEGORIES = 20
+
+# Every field of LocationOut, in order: what a list returns when no fields are selected
+LOCATION_FIELDS = list(LocationOut.model_fields)
+
+# Tables whose versions key the cached location responses (categories are embedded by name)
+LOCATION_TABLES = ("locations", "categories")
+
+
+def _index_location(location: Location):
+    """Reflect a created/updated location in the in-memory nearest-neighbour, cluster and name indexes."""
+    location_index.upsert(location.id, location.latitude, location.longitude,
+                          [category.id for category in location.categories])
+    cluster_index.upsert(location.id, location.latitude, location.longitude)
+    name_index.upsert(location.id, location.name)
+
+
+def _categories_by_location(db: Session, location_ids: list[int]) -> dict[int, list[dict]]:
+    """Fetch the categories of many locations in a single query."""
+    categories = {}
+    if not location_ids:
+        return categories
+
+    rows = db.query(LocationCategoryReviewed.location_id, Category.id, Category.name) \
+        .join(Category, LocationCategoryReviewed.category_id == Category.id) \
+        .filter(LocationCategoryReviewed.location_id.in_(location_ids)) \
+        .order_by(Category.id).all()
+    for location_id, category_id, category_name in rows:
+        categories.setdefault(location_id, []).append({"id": category_id, "name": category_name})
+    return categories
+
+
+def _location_columns(fields: list[str]) -> list:
+    """Columns to select for the given fields; categories come from _location_dicts."""
+    return [Location.id, *(getattr(Location, field) for field in fields if field not in ("id", "categories"))]
+
+
+def _location_dicts(db: Session, rows, fields: list[str]) -> list[dict]:
+    """Plain dicts of the selected fields built from column rows, ready for orjson.
+
+    Skips the ORM objects and the per-row LocationOut validation, which dominate the cost of
+    large lists; the rows come from the database, so they already match the schema.
+    """
+    categories = _categories_by_location(db, [row.id for row in rows]) if "categories" in fields else {}
+    return [
+        {field: categories.get(row.id, []) if field == "categories" else getattr(row, field) for field in fields}
+        for row in rows
+    ]
+
+
+def _iter_locations_ndjson(fields: list[str] | None = None, after: int | None = None):
+    """Yield locations as NDJSON, one server-side batch at a time.
+
+    Uses its own session so it stays open for as long as the response is streaming.
+    """
+    fields = fields or LOCATION_FIELDS
+    statement = select(*_location_columns(fields)).order_by(Location.id)
+    if after is not None:
+        statement = statement.where(Location.id > after)
+
+    db = read_session()
+    try:
+        result = db.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for rows in result.partitions():
+            yield b"".join(to_json_line(item) for item in _location_dicts(db, rows, fields))
+    finally:
+        db.close()
+
+
+def _locations_with_distance(db: Session, distances: dict[int, float], ordered_ids: list[int]):
+    """Load the given locations and return them in order, annotated with their distance."""
+    if not ordered_ids:
+        return []
+
+    locations = db.query(Location).filter(Location.id.in_(ordered_ids)) \
+        .options(selectinload(Location.categories)).all()
+    by_id = {location.id: location for location in locations}
+
+    return [
+        LocationNearOut(**LocationOut.model_validate(by_id[location_id], from_attributes=True).model_dump(),
+                        distance_m=distances[location_id])
+        for location_id in ordered_ids if location_id in by_id
+    ]
+
+
+def _associate_categories(db: Session, location_id: int, category_ids):
+    """Link a location to categories with one INSERT.
+
+    Added one by one, the ORM flushes an INSERT ... RETURNING per pair on SQLite.
+    """
+    rows = [{"location_id": location_id, "category_id": category_id} for category_id in dict.fromkeys(category_ids)]
+    if rows:
+        db.execute(insert(LocationCategoryReviewed), rows)
+
 
 @router.post("/locations/", response_model=LocationSchema)
 def create_new_location(location: LocationCreate, db: Session = Depends(get_db)):
@@ -20,36 +140,21 @@ def create_new_location(location: LocationCreate, db: Session = Depends(get_db))
             longitude=location.longitude,
             name=location.name,
             rate=location.rate,
-            description=location.description
+            description=location.description,
+            change_seq=next_change_seq(db)
         )
         db.add(new_location)
-        db.commit()
-        db.refresh(new_location)
-
-        # Asociar categorías existentes
-        for category_id in location.category_ids:
-            association = LocationCategoryReviewed(
-                location_id=new_location.id,
-                category_id=category_id
-            )
-            db.add(association)
-
-        # Crear nuevas categorías si vienen en la solicitud
-        for category_name in location.new_categories:
-            existing = db.query(Category).filter(Category.name == category_name).first()
-            if not existing:
-                new_category = Category(name=category_name)
-                db.add(new_category)
-                db.commit()
-                db.refresh(new_category)
-
-                association = LocationCategoryReviewed(
-                    location_id=new_location.id,
-                    category_id=new_category.category_id
-                )
-                db.add(association)
 
+        # Nombres de categorías resueltos desde la caché; solo las nuevas tocan la base de datos
+        name_to_id = category_cache.resolve_names(db, location.new_categories)
+        db.flush()
+
+        # Asociar categorías existentes y nuevas, en un solo executemany
+        _associate_categories(db, new_location.id, [*location.category_ids, *name_to_id.values()])
+
+        bump_table_version(db, "locations")
         db.commit()
+        _index_location(new_location)
         return new_location
 
     except IntegrityError:
@@ -60,25 +165,361 @@ def create_new_location(location: LocationCreate, db: Session = Depends(get_db))
         raise HTTPException(status_code=500, detail="Database error while creating location")
 
 
+def _parse_bulk_body(body: bytes, content_type: str) -> list:
+    """Split a bulk body (JSON array or NDJSON) into raw items; unparsable NDJSON lines become None."""
+    if content_type.startswith(NDJSON_MEDIA_TYPE):
+        items = []
+        for line in body.splitlines():
+            if line.strip():
+                try:
+                    items.append(orjson.loads(line))
+                except ValueError:
+                    items.append(None)
+        return items
+
+    try:
+        items = orjson.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    return items
+
+
+def _validation_detail(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in error.errors())
+
+
+def _bulk_create_locations(db: Session, raw_items: list) -> BulkLocationResult:
+    """Validate and insert many locations in one transaction, rolling back on database errors.
+
+    Blocking from start to end, rollback included, so the async route runs it in a thread.
+    """
+    try:
+        return _insert_bulk_locations(db, raw_items)
+
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Duplicate entry or constraint violation")
+    except SQLAlchemyError:
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Database error while creating locations")
+
+
+def _insert_bulk_locations(db: Session, raw_items: list) -> BulkLocationResult:
+    errors = []
+    items = []  # (index, LocationCreate)
+    for index, raw in enumerate(raw_items):
+        if raw is None:
+            errors.append({"index": index, "detail": "Invalid JSON"})
+            continue
+        try:
+            items.append((index, LocationCreate.model_validate(raw)))
+        except ValidationError as e:
+            errors.append({"index": index, "detail": _validation_detail(e)})
+
+    # Existing category ids are checked against the category cache
+    requested_ids = {category_id for _, item in items for category_id in item.category_ids}
+    known_ids = {category_id for category_id in requested_ids if category_cache.get(db, category_id)}
+    valid = []
+    for index, item in items:
+        unknown = sorted(set(item.category_ids) - known_ids)
+        if unknown:
+            errors.append({"index": index, "detail": f"Unknown category_ids: {', '.join(map(str, unknown))}"})
+        else:
+            valid.append(item)
+
+    location_ids = []
+    if valid:
+        name_to_id = category_cache.resolve_names(db, {name for item in valid for name in item.new_categories})
+        seq = next_change_seq(db)
+        rows = [{
+            "name": item.name,
+            "latitude": item.latitude,
+            "longitude": item.longitude,
+            "rate": item.rate,
+            "description": item.description,
+            "created_at": item.created_at,
+            "updated_at": item.updated_at or item.created_at,
+            "change_seq": seq,
+        } for item in valid]
+        if db.get_bind().dialect.name == "sqlite":
+            # SQLite cannot return ids in parameter order from one multi-row INSERT, so RETURNING
+            # would mean an INSERT per row. next_change_seq already holds the write lock, so the
+            # ids are assigned here, the same way SQLite would.
+            first_id = (db.query(func.max(Location.id)).scalar() or 0) + 1
+            location_ids = list(range(first_id, first_id + len(rows)))
+            db.execute(insert(Location), [dict(row, id=location_id) for row, location_id in zip(rows, location_ids)])
+        else:
+            location_ids = db.execute(
+                insert(Location).returning(Location.id, sort_by_parameter_order=True), rows
+            ).scalars().all()
+
+        associations = [
+            {"location_id": location_id, "category_id": category_id}
+            for location_id, item in zip(location_ids, valid)
+            for category_id in dict.fromkeys([*item.category_ids, *(name_to_id[name] for name in item.new_categories)])
+        ]
+        if associations:
+            db.execute(insert(LocationCategoryReviewed), associations)
+        bump_table_version(db, "locations")
+        db.commit()
+
+        for location_id, item in zip(location_ids, valid):
+            location_index.upsert(location_id, item.latitude, item.longitude,
+                                  [*item.category_ids, *(name_to_id[name] for name in item.new_categories)])
+            cluster_index.upsert(location_id, item.latitude, item.longitude)
+            name_index.upsert(location_id, item.name)
+
+    return BulkLocationResult(created=len(location_ids), location_ids=location_ids,
+                              errors=sorted(errors, key=lambda error: error["index"]))
+
+
+@router.post("/locations/bulk", response_model=BulkLocationResult, openapi_extra={
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": {"type": "array", "items": {"$ref": "#/components/schemas/LocationCreate"}}},
+            NDJSON_MEDIA_TYPE: {"schema": {"$ref": "#/components/schemas/LocationCreate"}},
+        },
+    }
+})
+async def bulk_create_locations(request: Request, db: Session = Depends(get_db)):
+    """Create many locations at once from a JSON array or an NDJSON body.
+    Invalid items are reported in errors; the valid ones are inserted in a single transaction."""
+    raw_items = _parse_bulk_body(await request.body(), request.headers.get("content-type", ""))
+    if len(raw_items) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_ITEMS} items per request")
+
+    return await run_in_threadpool(_bulk_create_locations, db, raw_items)
+
+
 @router.get("/list/locations", response_model=list[LocationOut])
-def list_all_locations(db: Session = Depends(get_db)):
-    """List all locations with their associated categories."""
+def list_all_locations(request: Request,
+                       limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                       cursor: str | None = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
+                       fields: str | None = Query(None, description="Comma separated fields, e.g. id,latitude,longitude"),
+                       stream: bool = Query(False, description="Stream every location after the cursor as NDJSON"),
+                       db: Session = Depends(get_read_db)):
+    """List locations with their associated categories, one page at a time.
+    The cursor for the next page is returned in the X-Next-Cursor header."""
+    after = decode_cursor(cursor)
+    selected = parse_fields(fields, LocationOut.model_fields)
+    if stream:
+        return StreamingResponse(_iter_locations_ndjson(selected, after), media_type=NDJSON_MEDIA_TYPE)
+
+    def build():
+        fields = selected or LOCATION_FIELDS
+        query = db.query(*_location_columns(fields))
+        if after is not None:
+            query = query.filter(Location.id > after)
+        rows = query.order_by(Location.id).limit(limit + 1).all()
+        return projected_response(_location_dicts(db, rows[:limit], fields), next_cursor(rows, limit))
+
     try:
-        locations = db.query(Location).options(selectinload(Location.categories)).all()
-        return locations
+        return response_cache.respond(request, db, LOCATION_TABLES, build)
 
     except SQLAlchemyError:
         raise HTTPException(status_code=500, detail="Database error while retrieving locations")
 
 
+def _parse_category_ids(category_ids: str) -> list[int]:
+    try:
+        ids = list(dict.fromkeys(int(value) for value in category_ids.split(",") if value.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="category_ids must be comma separated integers")
+    if not ids or len(ids) > MAX_FILTER_CATEGORIES:
+        raise HTTPException(status_code=400, detail=f"category_ids must list between 1 and {MAX_FILTER_CATEGORIES} ids")
+    return ids
+
+
+def _locations_in_categories_response(db: Session, category_ids: list[int], match: str, after: int | None, limit: int):
+    """A page of the locations having any/all of the categories, with the next cursor header."""
+    ids = location_ids_in_categories(db, category_ids, match, after, limit + 1)
+    cursor = encode_cursor(ids[limit - 1]) if len(ids) > limit else None
+    ids = ids[:limit]
+    rows = db.query(*_location_columns(LOCATION_FIELDS)).filter(Location.id.in_(ids)).order_by(Location.id).all() if ids else []
+    return projected_response(_location_dicts(db, rows, LOCATION_FIELDS), cursor)
+
+
+@router.get("/locations", response_model=list[LocationOut])
+def list_locations_by_category(request: Request,
+                               category_ids: str = Query(..., description="Comma separated category ids, e.g. 1,4"),
+                               match: Literal["any", "all"] = Query("any", description="Locations with any or with all of the categories"),
+                               limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                               cursor: str | None = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
+                               db: Session = Depends(get_read_db)):
+    """List the locations filtered by category, one page at a time.
+    The cursor for the next page is returned in the X-Next-Cursor header."""
+    ids = _parse_category_ids(category_ids)
+    after = decode_cursor(cursor)
+    try:
+        return response_cache.respond(request, db, LOCATION_TABLES,
+                                      lambda: _locations_in_categories_response(db, ids, match, after, limit))
+
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Database error while retrieving locations")
+
+
+@router.get("/categories/{category_id}/locations", response_model=list[LocationOut], tags=["Categories"])
+def list_locations_of_category(category_id: int, request: Request,
+                               limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                               cursor: str | None = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
+                               db: Session = Depends(get_read_db)):
+    """List the locations of a category, one page at a time.
+    The cursor for the next page is returned in the X-Next-Cursor header."""
+    after = decode_cursor(cursor)
+    try:
+        if not category_cache.get(db, category_id):
+            raise HTTPException(status_code=404, detail="Category not found")
+        return response_cache.respond(request, db, LOCATION_TABLES,
+                                      lambda: _locations_in_categories_response(db, [category_id], "any", after, limit))
+
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Database error while retrieving locations")
+
+
+@router.get("/locations/within", response_model=list[LocationOut])
+def list_locations_within(bbox: str = Query(..., description="min_lon,min_lat,max_lon,max_lat"),
+                          limit: int = Query(100, ge=1, le=MAX_SPATIAL_RESULTS),
+                          db: Session = Depends(get_read_db)):
+    """List the locations inside a bounding box."""
+    try:
+        min_lon, min_lat, max_lon, max_lat = parse_bbox(bbox)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        return db.query(Location).filter(
+            bbox_condition(db.get_bind(), min_lon, min_lat, max_lon, max_lat)
+        ).options(selectinload(Location.categories)).order_by(Location.id).limit(limit).all()
+
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Database error while retrieving locations")
+
+
+@router.get("/locations/near", response_model=list[LocationNearOut])
+def list_locations_near(lat: float = Query(..., ge=-90, le=90),
+                        lon: float = Query(..., ge=-180, le=180),
+                        radius_m: float = Query(..., gt=0, le=MAX_SEARCH_RADIUS_M),
+                        limit: int = Query(100, ge=1, le=MAX_SPATIAL_RESULTS),
+                        db: Session = Depends(get_read_db)):
+    """List the locations within radius_m meters of a point, closest first."""
+    try:
+        # Index lookup on the enclosing box, then exact haversine filter on the candidates
+        candidates = db.query(Location.id, Location.latitude, Location.longitude).filter(
+            bbox_condition(db.get_bind(), *radius_bbox(lat, lon, radius_m))
+        ).all()
+
+        distances = {}
+        for row in candidates:
+            distance = haversine_m(lat, lon, row.latitude, row.longitude)
+            if distance <= radius_m:
+                distances[row.id] = distance
+
+        nearest_ids = sorted(distances, key=distances.get)[:limit]
+        return _locations_with_distance(db, distances, nearest_ids)
+
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Database error while retrieving locations")
+
+
+@router.get("/locations/nearest", response_model=list[LocationNearOut])
+def list_nearest_locations(lat: float = Query(..., ge=-90, le=90),
+                           lon: float = Query(..., ge=-180, le=180),
+                           k: int = Query(10, ge=1, le=MAX_SPATIAL_RESULTS),
+                           category_id: int | None = Query(None, description="Only locations with this category"),
+                           db: Session = Depends(get_read_db)):
+    """List the k locations closest to a point, served from the in-memory index."""
+    try:
+        location_indexes.refresh(db)
+        nearest = location_index.nearest(lat, lon, k, category_id)
+        return _locations_with_distance(db, dict(nearest), [location_id for location_id, _ in nearest])
+
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Database error while retrieving locations")
+
+
+@router.get("/locations/search", response_model=list[LocationOut])
+def search_locations(q: str = Query(..., min_length=1, description="Words to find in the name or description"),
+                     category_id: int | None = Query(None, description="Only locations with this category"),
+                     bbox: str | None = Query(None, description="min_lon,min_lat,max_lon,max_lat"),
+                     limit: int = Query(20, ge=1, le=MAX_SPATIAL_RESULTS),
+                     db: Session = Depends(get_read_db)):
+    """Full-text search on name and description, best matches first.
+    Accents and case are ignored and the last word also matches as a prefix."""
+    terms = search_terms(q)
+    if not terms:
+        raise HTTPException(status_code=400, detail="Search query must contain at least one word")
+
+    bounds = None
+    if bbox is not None:
+        try:
+            bounds = parse_bbox(bbox)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        query = apply_text_search(db.query(Location), db.get_bind(), terms)
+        if category_id is not None:
+            query = query.filter(Location.id.in_(
+                select(LocationCategoryReviewed.location_id).where(LocationCategoryReviewed.category_id == category_id)
+            ))
+        if bounds is not None:
+            query = query.filter(bbox_condition(db.get_bind(), *bounds))
+        return query.options(selectinload(Location.categories)).limit(limit).all()
+
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Database error while searching locations")
+
+
+@router.get("/locations/autocomplete", response_model=list[LocationSuggestionOut])
+def autocomplete_locations(q: str = Query(..., min_length=1, description="Beginning of any word of the name"),
+                           limit: int = Query(10, ge=1, le=MAX_SUGGESTIONS),
+                           db: Session = Depends(get_read_db)):
+    """Location names with a word starting with q, served from the in-memory index."""
+    try:
+        location_indexes.refresh(db)
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Database error while retrieving suggestions")
+    return name_index.complete(q, limit)
+
+
+@router.get("/locations/changes", response_model=ChangesOut)
+def list_location_changes(since: str | None = Query(None, description="Cursor from the previous call; omit for a full sync"),
+                          limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                          db: Session = Depends(get_read_db)):
+    """Locations and categories created, updated or deleted after a cursor, in change order.
+    Send the returned cursor as since= on the next call to receive only newer changes."""
+    position = decode_change_cursor(since)
+    try:
+        changes, position, has_more = changes_since(db, position, limit)
+        return {"changes": changes, "cursor": encode_change_cursor(position), "has_more": has_more}
+
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Database error while retrieving changes")
+
+
+@router.get("/export/locations.ndjson", response_class=StreamingResponse,
+            responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}})
+def export_locations_ndjson(fields: str | None = Query(None, description="Comma separated fields to export")):
+    """Stream every location, one JSON object per line."""
+    selected = parse_fields(fields, LocationOut.model_fields)
+    return StreamingResponse(_iter_locations_ndjson(selected), media_type=NDJSON_MEDIA_TYPE,
+                             headers={"Content-Disposition": 'attachment; filename="locations.ndjson"'})
+
+
 @router.get("/locations/{location_id}", response_model=LocationOut)
-def get_location_by_id(location_id: int, db: Session = Depends(get_db)):
+def get_location_by_id(location_id: int, request: Request, db: Session = Depends(get_read_db)):
     """Get a specific location by ID."""
-    try:
+    def build():
         location = db.query(Location).filter(Location.id == location_id).options(selectinload(Location.categories)).first()
         if not location:
             raise HTTPException(status_code=404, detail="Location not found")
-        return location
+        return model_json_response(LocationOut, location)
+
+    try:
+        return response_cache.respond(request, db, LOCATION_TABLES, build)
 
     except SQLAlchemyError:
         raise HTTPException(status_code=500, detail="Database error while retrieving location")
@@ -98,6 +539,7 @@ def update_location_by_id(location_id: int, location: LocationUpdate, db: Sessio
             existing_location.latitude = location.latitude
         if location.longitude is not None:
             existing_location.longitude = location.longitude
+        rate_changed = location.rate is not None and location.rate != existing_location.rate
         if location.rate is not None:
             existing_location.rate = location.rate
         if location.description is not None:
@@ -106,6 +548,7 @@ def update_location_by_id(location_id: int, location: LocationUpdate, db: Sessio
             existing_location.created_at = location.created_at
         if location.updated_at is not None:
             existing_location.updated_at = location.updated_at
+        existing_location.change_seq = next_change_seq(db)
 
         # Clear previous relationships only if there are changes
         if location.category_ids or location.new_categories:
@@ -113,31 +556,20 @@ def update_location_by_id(location_id: int, location: LocationUpdate, db: Sessio
                 LocationCategoryReviewed.location_id == location_id
             ).delete()
 
-        # Asociate existing categories
-        for category_id in location.category_ids:
-            association = LocationCategoryReviewed(
-                location_id=existing_location.id,
-                category_id=category_id
-            )
-            db.add(association)
-
-        # Make sure to create new categories if they are provided
-        for category_name in location.new_categories:
-            existing = db.query(Category).filter(Category.name == category_name).first()
-            if not existing:
-                new_category = Category(name=category_name)
-                db.add(new_category)
-                db.commit()
-                db.refresh(new_category)
-
-                association = LocationCategoryReviewed(
-                    location_id=existing_location.id,
-                    category_id=new_category.id
-                )
-                db.add(association)
+        # Resolve category names from the cache, creating only the unknown ones
+        name_to_id = category_cache.resolve_names(db, location.new_categories)
+
+        # Asociate existing and new categories
+        _associate_categories(db, existing_location.id, [*location.category_ids, *name_to_id.values()])
+
+        # The rate weighs into when this location's pairs are due again
+        if rate_changed:
+            reschedule(db, LocationCategoryReviewed.location_id == location_id)
 
+        bump_table_version(db, "locations")
         db.commit()
         db.refresh(existing_location)
+        _index_location(existing_location)
         return existing_location
 
     except IntegrityError:
@@ -157,7 +589,12 @@ def delete_location(location_id: int, db: Session = Depends(get_db)):
             raise HTTPException(status_code=404, detail="Location not found")
 
         db.delete(location)
+        record_deletion(db, "location", location_id)
+        bump_table_version(db, "locations")
         db.commit()
+        location_index.remove(location_id)
+        cluster_index.remove(location_id)
+        name_index.remove(location_id)
         return {"detail": "Location deleted successfully"}
     except SQLAlchemyError:
         db.rollback()
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Response
+from utils.metrics import CONTENT_TYPE, registry
+
+
+router = APIRouter(tags=["Monitoring"])
+
+
+@router.get("/metrics", response_class=Response)
+def get_metrics():
+    """Request, SQL, connection pool and cache metrics of this process, in Prometheus text format."""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
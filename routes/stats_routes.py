@@ -0,0 +1,119 @@
+import os
+import time
+from datetime import datetime
+from db.database import get_read_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from models.models import Location, Category, LocationCategoryReviewed
+from schemas.schemas import LocationStatsOut, CategoryStatsOut
+from sqlalchemy import Integer, and_, case, cast, func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from utils.response_cache import response_cache
+from utils.serialization import model_json_response
+
+
+router = APIRouter(tags=["Stats"])
+
+# Overdue counts depend on the clock, so cached stats are also recomputed this often
+STATS_CACHE_SECONDS = int(os.getenv("STATS_CACHE_SECONDS", "60"))
+
+STATS_TABLES = ("locations", "categories", "location_category_reviewed")
+
+
+def _clock_bucket() -> str:
+    return str(int(time.time() // STATS_CACHE_SECONDS))
+
+
+def _percentage(part: int, total: int) -> float:
+    return round(100 * part / total, 2) if total else 0.0
+
+
+def _review_counts(now: datetime):
+    """SUM(CASE ...) columns counting reviewed, overdue and up-to-date combinations."""
+    reviewed = LocationCategoryReviewed.was_reviewed.is_(True)
+    return (
+        func.coalesce(func.sum(case((reviewed, 1), else_=0)), 0).label("reviewed"),
+        func.coalesce(func.sum(case((and_(reviewed, LocationCategoryReviewed.due_at <= now), 1), else_=0)), 0).label("overdue"),
+        func.coalesce(func.sum(case((LocationCategoryReviewed.due_at > now, 1), else_=0)), 0).label("up_to_date"),
+    )
+
+
+def _location_stats(db: Session, cell_deg: float) -> dict:
+    now = datetime.utcnow()
+    totals = db.query(func.count(Location.id).label("total"), func.avg(Location.rate).label("average_rate")).one()
+
+    # floor() buckets negative values down as well; a bare CAST truncates on SQLite and
+    # rounds on PostgreSQL. The CAST only turns the whole numbers floor() returns into integers
+    bucket = cast(func.floor(Location.rate), Integer)
+    histogram = db.query(bucket.label("rate"), func.count().label("count")) \
+        .filter(Location.rate.isnot(None)).group_by(bucket).order_by(bucket).all()
+
+    cell_lat = cast(func.floor((Location.latitude + 90) / cell_deg), Integer)
+    cell_lon = cast(func.floor((Location.longitude + 180) / cell_deg), Integer)
+    density = db.query(cell_lat.label("iy"), cell_lon.label("ix"), func.count().label("count")) \
+        .group_by(cell_lat, cell_lon).order_by(cell_lat, cell_lon).all()
+
+    reviews = db.query(func.count(LocationCategoryReviewed.id).label("pairs"), *_review_counts(now)).one()
+
+    return {
+        "total_locations": totals.total,
+        "average_rate": totals.average_rate,
+        "rate_histogram": [{"rate": row.rate, "count": row.count} for row in histogram],
+        "density_cell_deg": cell_deg,
+        "density": [{"min_latitude": row.iy * cell_deg - 90, "min_longitude": row.ix * cell_deg - 180,
+                     "count": row.count} for row in density],
+        "reviews": {
+            "pairs": reviews.pairs,
+            "reviewed": reviews.reviewed,
+            "never_reviewed": reviews.pairs - reviews.reviewed,
+            "overdue": reviews.overdue,
+            "coverage_pct": _percentage(reviews.up_to_date, reviews.pairs),
+        },
+    }
+
+
+def _category_stats(db: Session) -> list[dict]:
+    now = datetime.utcnow()
+    rows = db.query(
+        Category.id,
+        Category.name,
+        func.count(LocationCategoryReviewed.id).label("locations"),
+        func.avg(Location.rate).label("average_rate"),
+        *_review_counts(now)
+    ).outerjoin(LocationCategoryReviewed, LocationCategoryReviewed.category_id == Category.id) \
+     .outerjoin(Location, LocationCategoryReviewed.location_id == Location.id) \
+     .group_by(Category.id, Category.name).order_by(Category.id).all()
+
+    return [{
+        "id": row.id,
+        "name": row.name,
+        "locations": row.locations,
+        "average_rate": row.average_rate,
+        "reviewed": row.reviewed,
+        "overdue": row.overdue,
+        "coverage_pct": _percentage(row.up_to_date, row.locations),
+    } for row in rows]
+
+
+@router.get("/stats/locations", response_model=LocationStatsOut)
+def get_location_stats(request: Request,
+                       cell_deg: float = Query(10.0, ge=0.1, le=180, description="Side of the density grid cells, in degrees"),
+                       db: Session = Depends(get_read_db)):
+    """Location count, rate histogram, density grid and review coverage."""
+    try:
+        return response_cache.respond(request, db, STATS_TABLES,
+                                      lambda: model_json_response(LocationStatsOut, _location_stats(db, cell_deg)),
+                                      vary=_clock_bucket())
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Database error while computing location stats")
+
+
+@router.get("/stats/categories", response_model=list[CategoryStatsOut])
+def get_category_stats(request: Request, db: Session = Depends(get_read_db)):
+    """Locations, average rate and review coverage of every category."""
+    try:
+        return response_cache.respond(request, db, STATS_TABLES,
+                                      lambda: model_json_response(list[CategoryStatsOut], _category_stats(db)),
+                                      vary=_clock_bucket())
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Database error while computing category stats")
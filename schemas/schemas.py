@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Literal, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 
@@ -103,6 +103,97 @@ class LocationOut(BaseModel):
         }
 
 
+class LocationNearOut(LocationOut):
+    """Location returned by a radius search, with its distance to the query point."""
+    distance_m: float = Field(..., description="Great-circle distance in meters to the query point")
+
+
+class ClusterOut(BaseModel):
+    """A group of nearby locations on the map, or a single location."""
+    latitude:    float = Field(..., description="Latitude of the centroid")
+    longitude:   float = Field(..., description="Longitude of the centroid")
+    count:       int = Field(..., description="Number of locations in the cluster")
+    location_id: int | None = Field(None, description="ID of the location when the cluster holds only one")
+
+
+class LocationSuggestionOut(BaseModel):
+    """A location name offered while the user types."""
+    id:   int = Field(..., description="Location ID")
+    name: str = Field(..., description="Location name")
+
+
+class RateBucketOut(BaseModel):
+    """Number of locations whose rate falls in [rate, rate + 1)."""
+    rate:  int = Field(..., description="Lower bound of the bucket")
+    count: int = Field(..., description="Locations in the bucket")
+
+
+class DensityCellOut(BaseModel):
+    """Number of locations in one cell of the density grid."""
+    min_latitude:  float = Field(..., description="Southern edge of the cell")
+    min_longitude: float = Field(..., description="Western edge of the cell")
+    count:         int = Field(..., description="Locations in the cell")
+
+
+class ReviewCoverageOut(BaseModel):
+    """Review state of location-category combinations."""
+    pairs:          int = Field(..., description="Location-category combinations")
+    reviewed:       int = Field(..., description="Combinations reviewed at least once")
+    never_reviewed: int = Field(..., description="Combinations never reviewed")
+    overdue:        int = Field(..., description="Reviewed combinations due for a new review")
+    coverage_pct:   float = Field(..., description="Percentage of combinations whose review is up to date")
+
+
+class LocationStatsOut(BaseModel):
+    """Aggregate figures over every location."""
+    total_locations:  int = Field(..., description="Number of locations")
+    average_rate:     float | None = Field(None, description="Mean rate of the locations")
+    rate_histogram:   list[RateBucketOut] = Field(..., description="Locations per unit of rate")
+    density_cell_deg: float = Field(..., description="Side of the density grid cells, in degrees")
+    density:          list[DensityCellOut] = Field(..., description="Non-empty cells of the density grid")
+    reviews:          ReviewCoverageOut = Field(..., description="Review coverage of all combinations")
+
+
+class CategoryStatsOut(BaseModel):
+    """Aggregate figures for one category."""
+    id:           int = Field(..., description="ID of the category")
+    name:         str = Field(..., description="Name of the category")
+    locations:    int = Field(..., description="Locations in the category")
+    average_rate: float | None = Field(None, description="Mean rate of its locations")
+    reviewed:     int = Field(..., description="Locations reviewed at least once for this category")
+    overdue:      int = Field(..., description="Reviewed locations due for a new review in this category")
+    coverage_pct: float = Field(..., description="Percentage of its locations whose review is up to date")
+
+
+class ChangeOut(BaseModel):
+    """A single upsert or tombstone of the incremental sync feed."""
+    kind: Literal["location", "category"] = Field(..., description="Kind of record that changed")
+    op:   Literal["upsert", "delete"] = Field(..., description="Whether the record was written or deleted")
+    id:   int = Field(..., description="ID of the record")
+    seq:  int = Field(..., description="Change sequence number; changes are returned in this order")
+    data: LocationOut | CategoryOut | None = Field(None, description="Current state of the record, for upserts")
+
+
+class ChangesOut(BaseModel):
+    """A page of the incremental sync feed."""
+    changes:  list[ChangeOut] = Field(..., description="Changes after the requested cursor, in order")
+    cursor:   str = Field(..., description="Send as ?since= to get the changes after this page")
+    has_more: bool = Field(..., description="Whether more changes are already available")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "changes": [
+                    {"kind": "category", "op": "upsert", "id": 11, "seq": 41, "data": {"id": 11, "name": "Mirador"}},
+                    {"kind": "location", "op": "delete", "id": 7, "seq": 42, "data": None}
+                ],
+                "cursor": "eyJzZXEiOjQyLCJraW5kIjoiZGVsZXRlZCIsImlkIjozfQ",
+                "has_more": False
+            }
+        }
+    }
+
+
 class LocationCreateResponse(BaseModel):
     """Response returned after successfully creating a location."""
     location:    LocationSchema = Field(..., description="Created location details")
@@ -126,6 +217,29 @@ class LocationCreateResponse(BaseModel):
     }
 
 
+class BulkItemError(BaseModel):
+    """Error for a single item of a bulk request."""
+    index:  int = Field(..., description="Position of the item in the request body")
+    detail: str = Field(..., description="Why the item was rejected")
+
+
+class BulkLocationResult(BaseModel):
+    """Result of a bulk location ingest."""
+    created:      int = Field(..., description="Number of locations created")
+    location_ids: list[int] = Field(..., description="IDs of the created locations, in request order")
+    errors:       list[BulkItemError] = Field(default_factory=list, description="Items that were not created")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "created": 2,
+                "location_ids": [21, 22],
+                "errors": [{"index": 1, "detail": "Unknown category_ids: 99"}]
+            }
+        }
+    }
+
+
 class LocationUpdate(BaseModel):
     """Represents the data required to update an existing location."""
     name:        Optional[str] = Field(None, description="Name of the location")
@@ -159,11 +273,13 @@ class LocationUpdate(BaseModel):
 class CategoryCreate(BaseModel):
     """ Represents the data required to create a new category."""
     name: str = Field(..., description="name for the category")
+    review_interval_days: float | None = Field(None, gt=0, description="Days between reviews; the global default if empty")
 
     model_config = {
         "json_schema_extra": {
             "example": {
-                "name": "Restaurante actualizado"
+                "name": "Restaurante actualizado",
+                "review_interval_days": 15
             }
         }
     }
@@ -172,6 +288,7 @@ class CategoryCreate(BaseModel):
 class CategoryUpdate(BaseModel):
     """Data required to update a category."""
     name: str = Field(..., description="New name for the category")
+    review_interval_days: float | None = Field(None, gt=0, description="Days between reviews; null restores the global default")
 
 
 class ReviewOut(BaseModel):
@@ -213,12 +330,24 @@ class RecommendationOut(BaseModel):
     last_reviewed: datetime | None
 
 
+class ReviewLeaseOut(RecommendationOut):
+    """A location-category combination claimed by a reviewer."""
+    leased_by: str = Field(..., description="Reviewer holding the lease")
+    lease_expires_at: datetime = Field(..., description="When the pair returns to the queue if not reviewed")
+
+
 class ReviewInput(BaseModel):
     """Input schema to submit a review of a location-category pair."""
     location_id: int
     category_id: int
 
 
+class ReviewBulkOut(BaseModel):
+    """Result of marking many location-category pairs as reviewed."""
+    matched: list[ReviewInput] = Field(..., description="Pairs that were marked as reviewed")
+    missing: list[ReviewInput] = Field(..., description="Pairs without a location-category association")
+
+
 class AsociationOut(BaseModel):
     """Represents the output format for an association between a location and a category."""
     id: int = Field(..., description="Unique identifier for the association")
@@ -0,0 +1,54 @@
+import argparse
+from datetime import datetime
+from sqlalchemy.orm import Session
+from db.database import engine
+from db.migrations import run_migrations
+from models.models import Location
+from seed.generator import DEFAULT_BBOX, parse_range, parse_weights, seed_locations
+from utils.spatial import parse_bbox
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m seed",
+                                     description="Fill the database (DB_PATH) with synthetic locations.")
+    parser.add_argument("--count", type=int, default=1000, help="Locations to create")
+    parser.add_argument("--bbox", default=",".join(map(str, DEFAULT_BBOX)),
+                        help="min_lon,min_lat,max_lon,max_lat where locations are placed (default: Medellín)")
+    parser.add_argument("--categories", help="Category weights, e.g. 'Restaurante=5,Museo=1' "
+                                             "(default: the default categories, Zipf distributed)")
+    parser.add_argument("--fanout", default="1-3", help="Categories per location, as min-max")
+    parser.add_argument("--reviewed", type=float, default=0.5, help="Fraction of associations already reviewed")
+    parser.add_argument("--review-age-days", type=float, default=45,
+                        help="Mean age in days of the last review (exponentially distributed)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed; same seed and --now, same data")
+    parser.add_argument("--now", type=datetime.fromisoformat, help="Reference time for the dates (default: now, UTC)")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="Locations per transaction")
+    parser.add_argument("--if-empty", action="store_true", help="Do nothing if there are locations already")
+    args = parser.parse_args()
+
+    try:
+        bbox = parse_bbox(args.bbox)
+        categories = parse_weights(args.categories) if args.categories else None
+        fanout = parse_range(args.fanout)
+    except ValueError as e:
+        parser.error(str(e))
+    if not 0 <= args.reviewed <= 1 or args.review_age_days <= 0 or args.batch_size <= 0:
+        parser.error("--reviewed must be within [0, 1]; --review-age-days and --batch-size must be positive")
+
+    run_migrations(engine)
+    with engine.connect() as conn, Session(bind=conn) as db:
+        if args.if_empty and db.query(Location.id).first():
+            print("Locations already present, nothing to do")
+            return
+
+        def progress(locations, associations, seconds):
+            print(f"  {locations:,} locations, {associations:,} associations ({(locations + associations) / seconds:,.0f} rows/s)")
+
+        result = seed_locations(db, args.count, bbox, categories, fanout, args.reviewed, args.review_age_days,
+                                args.seed, args.batch_size, args.now, progress)
+        print(f"Seeded {result['locations']:,} locations and {result['associations']:,} associations "
+              f"in {result['seconds']:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert, text
+from sqlalchemy.orm import Session
+from db.database import SQLITE_PRAGMAS
+from models.models import Category, Location, LocationCategoryReviewed, NEVER_REVIEWED_DUE_AT
+from utils.categories import resolve_category_names
+from utils.changes import CHANGE_SEQUENCE
+from utils.default_categories import DEFAULT_CATEGORIES
+from utils.review_policy import next_due_at
+from utils.search import ensure_search_index
+from utils.spatial import ensure_spatial_index, uses_rtree
+from utils.table_versions import bump_table_version
+
+
+# Área metropolitana de Medellín, min_lon,min_lat,max_lon,max_lat
+DEFAULT_BBOX = (-75.70, 6.10, -75.45, 6.40)
+
+NAME_WORDS = [
+    "Central", "del Parque", "La Esperanza", "El Poblado", "Laureles", "Belén", "Envigado",
+    "San Antonio", "La Candelaria", "Los Colores", "Boston", "Prado", "La América", "Robledo",
+    "Buenos Aires", "Manrique", "Castilla", "Aranjuez", "Itagüí", "Sabaneta",
+]
+DESCRIPTION_WORDS = [
+    "amplio", "tranquilo", "familiar", "moderno", "tradicional", "económico", "céntrico",
+    "accesible", "concurrido", "renovado", "histórico", "iluminado", "seguro", "acogedor",
+    "parqueadero", "terraza", "jardín", "wifi", "mascotas", "vista", "música", "abierto",
+]
+
+# Applied while loading: durability is pointless for data that can be regenerated from the seed
+LOAD_PRAGMAS = {"synchronous": "OFF", "cache_size": "-262144", "temp_store": "MEMORY"}
+
+# On SQLite the R*Tree and FTS5 insert triggers are dropped while a batch is inserted, and
+# replaced by one INSERT ... SELECT per index. Row-by-row trigger execution is most of the
+# cost of a bulk insert. Each batch first bumps the table versions: that UPDATE opens the
+# write transaction (pysqlite runs DDL outside one otherwise), so the drop, the inserts, the
+# index fills and the re-created triggers commit or roll back together, and no other writer
+# can insert while the triggers are missing.
+INDEX_TRIGGERS = ("locations_rtree_ai", "locations_fts_ai")
+INDEX_FILLS = [
+    "INSERT INTO locations_rtree SELECT id, latitude, latitude, longitude, longitude FROM locations "
+    "WHERE id BETWEEN :first AND :last",
+    "INSERT INTO locations_fts(rowid, name, description) SELECT id, name, description FROM locations "
+    "WHERE id BETWEEN :first AND :last",
+]
+
+
+def parse_weights(text: str) -> dict[str, float]:
+    """'Restaurante=5,Museo=1' -> {'Restaurante': 5.0, 'Museo': 1.0}."""
+    weights = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip():
+            weights[name.strip()] = float(weight) if weight else 1.0
+    if not weights or min(weights.values()) <= 0:
+        raise ValueError("category weights must be positive, e.g. 'Restaurante=5,Museo=1'")
+    return weights
+
+
+def zipf_weights(names: list[str]) -> dict[str, float]:
+    """Default distribution: the n-th category is n times less common than the first."""
+    return {name: 1 / rank for rank, name in enumerate(names, start=1)}
+
+
+def parse_range(text: str) -> tuple[int, int]:
+    """'1-3' -> (1, 3); '2' -> (2, 2)."""
+    low, _, high = text.partition("-")
+    low, high = int(low), int(high or low)
+    if not 0 <= low <= high:
+        raise ValueError("range must be 'min-max' with 0 <= min <= max")
+    return low, high
+
+
+@contextmanager
+def relaxed_pragmas(db: Session):
+    """Trade durability for speed on SQLite during the load, then restore the app settings."""
+    sqlite = db.get_bind().dialect.name == "sqlite"
+    if sqlite:
+        for pragma, value in LOAD_PRAGMAS.items():
+            db.connection().exec_driver_sql(f"PRAGMA {pragma}={value}")
+    try:
+        yield
+    finally:
+        if sqlite:
+            db.rollback()
+            for pragma in LOAD_PRAGMAS:
+                db.connection().exec_driver_sql(f"PRAGMA {pragma}={SQLITE_PRAGMAS[pragma]}")
+
+
+class LocationGenerator:
+    """Deterministic stream of synthetic locations and their category associations."""
+
+    def __init__(self, rng: random.Random, bbox, categories: dict[str, float], category_ids: dict[str, int],
+                 intervals: dict[int, float | None], fanout: tuple[int, int], reviewed: float,
+                 review_age_days: float, now: datetime):
+        self.rng = rng
+        self.bbox = bbox
+        self.names = list(categories)
+        self.cum_weights = []
+        total = 0.0
+        for name in self.names:
+            total += categories[name]
+            self.cum_weights.append(total)
+        self.category_ids = category_ids
+        self.intervals = intervals
+        self.fanout = (fanout[0], min(fanout[1], len(self.names)))
+        self.reviewed = reviewed
+        self.review_age_days = review_age_days
+        self.now = now
+
+    def _point(self) -> tuple[float, float]:
+        min_lon, min_lat, max_lon, max_lat = self.bbox
+        if min_lon > max_lon:  # crosses the antimeridian
+            max_lon += 360
+        lon = self.rng.uniform(min_lon, max_lon)
+        return self.rng.uniform(min_lat, max_lat), lon - 360 if lon > 180 else lon
+
+    def _categories(self) -> list[str]:
+        count = self.rng.randint(min(self.fanout[0], self.fanout[1]), self.fanout[1])
+        chosen = {}
+        while len(chosen) < count:
+            chosen.setdefault(self.rng.choices(self.names, cum_weights=self.cum_weights)[0])
+        return list(chosen)
+
+    def batch(self, first_id: int, size: int, change_seq: int) -> tuple[list[dict], list[dict]]:
+        """size locations with ids from first_id, and their associations."""
+        rng = self.rng
+        locations, associations = [], []
+        for location_id in range(first_id, first_id + size):
+            categories = self._categories()
+            latitude, longitude = self._point()
+            rate = round(rng.triangular(0, 5, 4), 1)
+            created_at = self.now - timedelta(days=rng.uniform(0, 365))
+            label = categories[0] if categories else "Lugar"
+            locations.append({
+                "id": location_id,
+                "name": f"{label} {rng.choice(NAME_WORDS)} {location_id}",
+                "description": " ".join(rng.sample(DESCRIPTION_WORDS, 5)),
+                "latitude": latitude,
+                "longitude": longitude,
+                "rate": rate,
+                "created_at": created_at,
+                "updated_at": created_at,
+                "change_seq": change_seq,
+            })
+            for name in categories:
+                category_id = self.category_ids[name]
+                association = {"location_id": location_id, "category_id": category_id, "was_reviewed": False,
+                               "last_reviewed": None, "due_at": NEVER_REVIEWED_DUE_AT}
+                if rng.random() < self.reviewed:
+                    last_reviewed = self.now - timedelta(days=rng.expovariate(1 / self.review_age_days))
+                    association.update(was_reviewed=True, last_reviewed=last_reviewed,
+                                       due_at=next_due_at(last_reviewed, self.intervals[category_id], rate))
+                associations.append(association)
+        return locations, associations
+
+
+def seed_locations(db: Session, count: int, bbox=DEFAULT_BBOX, categories: dict[str, float] | None = None,
+                   fanout: tuple[int, int] = (1, 3), reviewed: float = 0.5, review_age_days: float = 45,
+                   seed: int = 0, batch_size: int = 50_000, now: datetime | None = None, progress=None) -> dict:
+    """Bulk-load count synthetic locations with their category associations.
+
+    Rows are built in memory and written with executemany, one transaction per batch. The same
+    seed, options, now and starting database produce the same rows.
+    """
+    rng = random.Random(seed)
+    categories = categories or zipf_weights(DEFAULT_CATEGORIES)
+    now = now or datetime.utcnow()
+    start = time.perf_counter()
+
+    with relaxed_pragmas(db):
+        category_ids = resolve_category_names(db, categories)
+        intervals = dict(db.query(Category.id, Category.review_interval_days)
+                         .filter(Category.id.in_(category_ids.values())).all())
+        generator = LocationGenerator(rng, bbox, categories, category_ids, intervals, fanout, reviewed,
+                                      review_age_days, now)
+
+        # One change sequence number for the whole load
+        change_seq = bump_table_version(db, CHANGE_SEQUENCE)
+        db.commit()
+        rtree = uses_rtree(db.get_bind())
+        created = associated = 0
+        while created < count:
+            size = min(batch_size, count - created)
+            # Takes the write lock before max(id) is read and the triggers are dropped
+            bump_table_version(db, "locations")
+            bump_table_version(db, "location_category_reviewed")
+            first_id = (db.query(func.max(Location.id)).scalar() or 0) + 1
+            locations, associations = generator.batch(first_id, size, change_seq)
+            if rtree:
+                for trigger in INDEX_TRIGGERS:
+                    db.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+            db.execute(insert(Location.__table__), locations)
+            if associations:
+                db.execute(insert(LocationCategoryReviewed.__table__), associations)
+            if rtree:
+                for statement in INDEX_FILLS:
+                    db.execute(text(statement), {"first": first_id, "last": first_id + size - 1})
+                ensure_spatial_index(db.connection())
+                ensure_search_index(db.connection())
+            db.commit()
+            created += size
+            associated += len(associations)
+            if progress:
+                progress(created, associated, time.perf_counter() - start)
+
+    return {"locations": created, "associations": associated, "seconds": time.perf_counter() - start}
@@ -0,0 +1,17 @@
+import os
+import tempfile
+
+import pytest
+
+# A throwaway database, configured before the app modules create their engine
+os.environ["DEV"] = ""
+os.environ["DB_PATH"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+
+from fastapi.testclient import TestClient  # noqa: E402
+import main  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(main.app) as test_client:
+        yield test_client
@@ -0,0 +1,64 @@
+import time
+
+from sqlalchemy import delete, update
+
+from db.database import SessionLocal
+from models.models import Location, LocationCategoryReviewed, NEVER_REVIEWED_DUE_AT
+from utils.changes import next_change_seq, record_deletion
+from utils.table_versions import bump_table_version
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the part of the redis client RedisBackend uses."""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.data = {}  # key -> (value, expires_at)
+
+    def get(self, key):
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= self.clock():
+            del self.data[key]
+            return None
+        return value
+
+    def set(self, key, value, px=None):
+        self.data[key] = (value, self.clock() + px / 1000 if px is not None else None)
+        return True
+
+
+class OtherWorker:
+    """Writes locations straight to the database, as another process would.
+
+    Goes around the route handlers, so the in-memory indexes of this process only learn
+    about the writes through the change sequence.
+    """
+
+    def create(self, name: str, lat: float, lon: float, category_ids=()) -> int:
+        with SessionLocal() as db:
+            location = Location(name=name, latitude=lat, longitude=lon, rate=3, change_seq=next_change_seq(db))
+            db.add(location)
+            db.flush()
+            db.add_all(LocationCategoryReviewed(location_id=location.id, category_id=category_id,
+                                                due_at=NEVER_REVIEWED_DUE_AT) for category_id in category_ids)
+            bump_table_version(db, "locations")
+            db.commit()
+            return location.id
+
+    def update(self, location_id: int, **values):
+        with SessionLocal() as db:
+            db.execute(update(Location).where(Location.id == location_id)
+                       .values(change_seq=next_change_seq(db), **values))
+            bump_table_version(db, "locations")
+            db.commit()
+
+    def delete(self, location_id: int):
+        with SessionLocal() as db:
+            db.execute(delete(LocationCategoryReviewed).where(LocationCategoryReviewed.location_id == location_id))
+            db.execute(delete(Location).where(Location.id == location_id))
+            record_deletion(db, "location", location_id)
+            bump_table_version(db, "locations")
+            db.commit()
@@ -0,0 +1,88 @@
+from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
+
+from db.database import SessionLocal
+from models.models import Location, LocationCategoryReviewed
+from routes import locations_routes
+from utils.serialization import NDJSON_MEDIA_TYPE
+
+
+def item(name, **overrides):
+    return {"name": name, "latitude": 20.5, "longitude": -100.25, "rate": 3.5, "category_ids": [],
+            **overrides}
+
+
+def max_location_id():
+    with SessionLocal() as db:
+        return db.query(func.max(Location.id)).scalar() or 0
+
+
+def test_ids_follow_the_largest_existing_id(client):
+    before = max_location_id()
+    response = client.post("/locations/bulk", json=[item("Bulk one", new_categories=["Bulk new"]),
+                                                    item("Bulk two"), item("Bulk three", description="3")])
+    assert response.status_code == 200
+    result = response.json()
+    assert result == {"created": 3, "location_ids": [before + 1, before + 2, before + 3], "errors": []}
+
+    with SessionLocal() as db:
+        rows = db.query(Location.id, Location.name, Location.description).filter(Location.id.in_(result["location_ids"]))
+        assert sorted(rows) == [(before + 1, "Bulk one", None), (before + 2, "Bulk two", None),
+                                (before + 3, "Bulk three", "3")]
+        assert db.query(LocationCategoryReviewed).filter(LocationCategoryReviewed.location_id == before + 1).count() == 1
+
+    # The next location, bulk or not, gets the following id
+    single = client.post("/locations/", json=item("After bulk")).json()
+    assert single["id"] == before + 4
+    assert client.get(f"/locations/{before + 2}").json()["name"] == "Bulk two"
+
+
+def test_invalid_items_are_reported_and_the_rest_inserted(client):
+    category_id = client.get("/list/categories/").json()[0]["id"]
+    body = [
+        item("Bulk valid", category_ids=[category_id]),
+        {"name": "No coordinates", "rate": 1, "category_ids": []},
+        item("Unknown category", category_ids=[category_id, 987654]),
+        item("Bulk valid too"),
+    ]
+    result = client.post("/locations/bulk", json=body).json()
+    assert result["created"] == 2
+    assert [error["index"] for error in result["errors"]] == [1, 2]
+    assert "latitude" in result["errors"][0]["detail"]
+    assert result["errors"][1]["detail"] == "Unknown category_ids: 987654"
+    names = {client.get(f"/locations/{location_id}").json()["name"] for location_id in result["location_ids"]}
+    assert names == {"Bulk valid", "Bulk valid too"}
+
+
+def test_ndjson_body_with_a_broken_line(client):
+    lines = [b'{"name": "Ndjson one", "latitude": 1, "longitude": 2, "rate": 0, "category_ids": []}',
+             b"{not json",
+             b"",
+             b'{"name": "Ndjson two", "latitude": 3, "longitude": 4, "rate": 0, "category_ids": []}']
+    response = client.post("/locations/bulk", content=b"\n".join(lines), headers={"Content-Type": NDJSON_MEDIA_TYPE})
+    result = response.json()
+    assert result["created"] == 2
+    assert result["errors"] == [{"index": 1, "detail": "Invalid JSON"}]
+
+
+def test_rejected_bodies(client, monkeypatch):
+    assert client.post("/locations/bulk", content=b"{not json", headers={"Content-Type": "application/json"}).status_code == 400
+    assert client.post("/locations/bulk", json={"name": "not a list"}).status_code == 400
+
+    monkeypatch.setattr(locations_routes, "MAX_BULK_ITEMS", 2)
+    assert client.post("/locations/bulk", json=[item("a"), item("b"), item("c")]).status_code == 413
+
+
+def test_database_error_rolls_back_every_item(client, monkeypatch):
+    before = max_location_id()
+
+    def failing_bump(db, table_name):
+        raise SQLAlchemyError("lost the connection")
+
+    monkeypatch.setattr(locations_routes, "bump_table_version", failing_bump)
+    response = client.post("/locations/bulk", json=[item("Rolled back one"), item("Rolled back two")])
+    assert response.status_code == 500
+    assert max_location_id() == before
+
+    monkeypatch.undo()
+    assert client.post("/locations/bulk", json=[item("After rollback")]).json()["location_ids"] == [before + 1]
@@ -0,0 +1,43 @@
+from sqlalchemy import insert, select
+from sqlalchemy.orm import sessionmaker
+
+from db.database import Base, SessionLocal, build_engine
+from models.models import Category, TableVersion
+from utils import table_versions
+from utils.category_cache import category_cache
+
+
+def lagging_replica(path):
+    """A replica frozen at the current state of the primary's categories."""
+    replica = build_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(replica, tables=[Category.__table__, TableVersion.__table__])
+    with SessionLocal() as db:
+        categories = [{"id": row.id, "name": row.name} for row in db.query(Category.id, Category.name)]
+        versions = [{"table_name": row.table_name, "version": row.version}
+                    for row in db.query(TableVersion.table_name, TableVersion.version)]
+    with replica.begin() as conn:
+        conn.execute(insert(Category), categories)
+        conn.execute(insert(TableVersion), versions)
+    return replica
+
+
+def names(categories):
+    return {category.name for category in categories}
+
+
+def test_lagging_replica_rows_are_not_cached_under_the_primary_version(client, monkeypatch, tmp_path):
+    replica = lagging_replica(tmp_path / "replica.db")
+    monkeypatch.setitem(table_versions._replica_versions, replica,
+                        table_versions.TableVersionTracker("replica1", [replica]))
+
+    created = client.post("/categories/", json={"name": "Written after the snapshot"})
+    assert created.status_code == 200
+
+    with sessionmaker(bind=replica)() as replica_db:
+        assert "Written after the snapshot" not in names(category_cache.all(replica_db))
+
+    with SessionLocal() as db:
+        assert "Written after the snapshot" in names(category_cache.all(db))
+        category_id = db.execute(select(Category.id).where(Category.name == "Written after the snapshot")).scalar()
+        assert category_cache.get(db, category_id).name == "Written after the snapshot"
+    replica.dispose()
@@ -0,0 +1,80 @@
+def feed(client, since=None, limit=100):
+    """Every change after since, following the cursor page by page, and the final cursor."""
+    changes = []
+    while True:
+        params = {"limit": limit} if since is None else {"since": since, "limit": limit}
+        response = client.get("/locations/changes", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        changes += page["changes"]
+        since = page["cursor"]
+        if not page["has_more"]:
+            return changes, since
+
+
+def create_location(client, name, category_ids=(), new_categories=()):
+    response = client.post("/locations/", json={"name": name, "latitude": 1.5, "longitude": 2.5, "rate": 3,
+                                                "category_ids": list(category_ids),
+                                                "new_categories": list(new_categories)})
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def category_named(client, name):
+    return next(category for category in client.get("/list/categories/").json() if category["name"] == name)
+
+
+def test_cursor_returns_only_newer_changes_in_order(client):
+    _, cursor = feed(client)
+    assert feed(client, cursor) == ([], cursor)
+
+    first = create_location(client, "Feed first")
+    second = create_location(client, "Feed second")
+    changes, next_cursor = feed(client, cursor)
+    assert [(change["kind"], change["op"], change["id"]) for change in changes] == [
+        ("location", "upsert", first), ("location", "upsert", second)]
+    assert changes[0]["data"]["name"] == "Feed first"
+    assert changes[0]["seq"] < changes[1]["seq"]
+    assert feed(client, next_cursor) == ([], next_cursor)
+
+
+def test_pages_neither_skip_nor_repeat_changes(client):
+    create_location(client, "Paged", new_categories=["Paged category"])
+    everything, cursor = feed(client, limit=1000)
+    paged, paged_cursor = feed(client, limit=1)
+    assert paged == everything
+    assert paged_cursor == cursor
+    positions = [(change["seq"], change["kind"] == "location", change["id"]) for change in everything
+                 if change["op"] == "upsert"]
+    assert positions == sorted(positions)
+
+
+def test_deleted_location_leaves_a_tombstone(client):
+    location_id = create_location(client, "Feed deleted")
+    _, cursor = feed(client)
+
+    assert client.delete(f"/locations/{location_id}").status_code == 204
+    changes, _ = feed(client, cursor)
+    assert changes == [{"kind": "location", "op": "delete", "id": location_id, "seq": changes[0]["seq"], "data": None}]
+
+    full, _ = feed(client)
+    assert all(change["id"] != location_id or change["op"] == "delete"
+               for change in full if change["kind"] == "location")
+
+
+def test_renaming_a_category_resends_its_locations(client):
+    location_id = create_location(client, "Feed renamed", new_categories=["Feed old name"])
+    category_id = category_named(client, "Feed old name")["id"]
+    untouched = create_location(client, "Feed untouched")
+    _, cursor = feed(client)
+
+    assert client.put(f"/categories/{category_id}", json={"name": "Feed new name"}).status_code == 200
+    changes, _ = feed(client, cursor)
+    by_kind = {(change["kind"], change["id"]): change for change in changes}
+    assert by_kind[("category", category_id)]["data"]["name"] == "Feed new name"
+    assert [category["name"] for category in by_kind[("location", location_id)]["data"]["categories"]] == ["Feed new name"]
+    assert ("location", untouched) not in by_kind
+
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get("/locations/changes", params={"since": "not-a-cursor"}).status_code == 400
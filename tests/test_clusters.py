@@ -0,0 +1,113 @@
+import random
+from collections import defaultdict
+
+import pytest
+
+from tests.fakes import OtherWorker
+from utils.clusters import ClusterIndex, from_mercator, to_mercator
+
+
+def random_points(rng, n):
+    points = [(location_id, rng.uniform(-85, 85), rng.uniform(-180, 180)) for location_id in range(1, n + 1)]
+    # On tile edges: the equator, the prime meridian, the antimeridian and the Mercator limits
+    points += [(n + 1, 0.0, 0.0), (n + 2, 0.0, 180.0), (n + 3, 0.0, -180.0), (n + 4, 89.0, 45.0), (n + 5, -89.0, 45.0)]
+    return points
+
+
+def expected_cells(points, zoom, cells_per_tile):
+    n = cells_per_tile << zoom
+    cells = defaultdict(list)
+    for location_id, lat, lon in points:
+        x, y = to_mercator(lat, lon)
+        cells[min(int(x * n), n - 1), min(int(y * n), n - 1)].append((location_id, x, y))
+    return cells
+
+
+@pytest.mark.parametrize("zoom", [0, 1, 3, 6])
+def test_counts_and_centroids_per_cell(zoom):
+    rng = random.Random(zoom)
+    points = random_points(rng, 400)
+    index = ClusterIndex(max_zoom=6, cells_per_tile=4)
+    index.rebuild(points)
+
+    clusters = index.clusters(zoom, 0, 0, 1, 1)
+    expected = expected_cells(points, zoom, 4)
+    assert len(clusters) == len(expected)
+    assert sum(cluster["count"] for cluster in clusters) == len(points)
+
+    by_centroid = {}
+    for members in expected.values():
+        x = sum(member[1] for member in members) / len(members)
+        y = sum(member[2] for member in members) / len(members)
+        by_centroid[tuple(round(value, 6) for value in from_mercator(x, y))] = members
+    for cluster in clusters:
+        members = by_centroid[round(cluster["latitude"], 6), round(cluster["longitude"], 6)]
+        assert cluster["count"] == len(members)
+        assert cluster["location_id"] == (members[0][0] if len(members) == 1 else None)
+
+
+@pytest.mark.parametrize("zoom", [1, 2, 4])
+def test_every_point_lands_in_exactly_one_tile(zoom):
+    points = random_points(random.Random(10 + zoom), 200)
+    index = ClusterIndex(max_zoom=4, cells_per_tile=4)
+    index.rebuild(points)
+
+    n = 1 << zoom
+    tiles = [index.clusters(zoom, x / n, y / n, (x + 1) / n, (y + 1) / n) for x in range(n) for y in range(n)]
+    assert sum(cluster["count"] for tile in tiles for cluster in tile) == len(points)
+
+    # The point at (0, 0) sits on the corner of four tiles and belongs to the one east and south of it
+    single = ClusterIndex(max_zoom=4, cells_per_tile=4)
+    single.rebuild([(1, 0.0, 0.0)])
+    owners = [(x, y) for x in range(n) for y in range(n)
+              if single.clusters(zoom, x / n, y / n, (x + 1) / n, (y + 1) / n)]
+    assert owners == [(n // 2, n // 2)]
+
+
+def test_upsert_and_remove_update_the_cells():
+    index = ClusterIndex(max_zoom=3, cells_per_tile=4)
+    index.rebuild([(1, 10.0, 10.0), (2, 10.001, 10.001)])
+    assert [cluster["count"] for cluster in index.clusters(3, 0, 0, 1, 1)] == [2]
+
+    index.upsert(2, -40.0, -60.0)
+    assert sorted(cluster["location_id"] for cluster in index.clusters(3, 0, 0, 1, 1)) == [1, 2]
+    index.remove(1)
+    index.remove(1)
+    assert [(cluster["count"], cluster["location_id"]) for cluster in index.clusters(0, 0, 0, 1, 1)] == [(1, 2)]
+    assert len(index) == 1
+
+
+def ids_near(client, lat, lon, zoom=12):
+    bbox = f"{lon - 0.01},{lat - 0.01},{lon + 0.01},{lat + 0.01}"
+    response = client.get("/clusters", params={"bbox": bbox, "zoom": zoom})
+    assert response.status_code == 200
+    return [(cluster["count"], cluster["location_id"]) for cluster in response.json()]
+
+
+def test_cached_clusters_follow_writes_of_other_workers(client):
+    assert ids_near(client, -49.35, 70.22) == []
+    assert ids_near(client, -49.35, 70.22) == []  # now cached under the current versions
+
+    other = OtherWorker()
+    location_id = other.create("Cluster replay", -49.35, 70.22)
+    assert ids_near(client, -49.35, 70.22) == [(1, location_id)]
+
+    other.update(location_id, latitude=-54.43, longitude=3.38)
+    assert ids_near(client, -49.35, 70.22) == []
+    assert ids_near(client, -54.43, 3.38) == [(1, location_id)]
+
+    other.delete(location_id)
+    assert ids_near(client, -54.43, 3.38) == []
+
+
+def test_tiles_past_the_cluster_zoom_do_not_share_edge_points(client):
+    location_id = client.post("/locations/", json={"name": "On the tile corner", "latitude": 0.0, "longitude": 0.0,
+                                                   "rate": 1, "category_ids": []}).json()["id"]
+    z = 13
+    n = 1 << z
+    found = []
+    for x in (n // 2 - 1, n // 2):
+        for y in (n // 2 - 1, n // 2):
+            tile = client.get(f"/tiles/{z}/{x}/{y}").json()
+            found += [(x, y) for cluster in tile if cluster["location_id"] == location_id]
+    assert found == [(n // 2, n // 2)]
@@ -0,0 +1,99 @@
+import random
+
+import pytest
+
+from db.database import SessionLocal
+from tests.fakes import OtherWorker
+from utils.index_sync import location_indexes
+from utils.location_index import LocationGridIndex, location_index
+from utils.spatial import haversine_m
+
+
+def random_points(rng, n):
+    points = []
+    for location_id in range(1, n + 1):
+        kind = rng.random()
+        if kind < 0.15:
+            lat, lon = rng.choice((-1, 1)) * rng.uniform(88, 90), rng.uniform(-180, 180)  # near a pole
+        elif kind < 0.3:
+            lat, lon = rng.uniform(-60, 60), rng.choice((-1, 1)) * rng.uniform(178, 180)  # antimeridian
+        elif kind < 0.6:
+            lat, lon = rng.gauss(40.4, 0.05), rng.gauss(-3.7, 0.05)  # a dense city
+        else:
+            lat, lon = rng.uniform(-90, 90), rng.uniform(-180, 180)
+        points.append((location_id, lat, lon, rng.sample(range(1, 6), rng.randint(0, 2))))
+    return points
+
+
+def brute_force(points, lat, lon, k, category_id=None):
+    distances = sorted(haversine_m(lat, lon, p_lat, p_lon) for _, p_lat, p_lon, categories in points
+                       if category_id is None or category_id in categories)
+    return distances[:k]
+
+
+@pytest.mark.parametrize("cell_deg", [0.01, 0.5, 7.0])
+def test_nearest_matches_brute_force(cell_deg):
+    rng = random.Random(cell_deg)
+    points = random_points(rng, 600)
+    index = LocationGridIndex(cell_deg=cell_deg)
+    index.rebuild(points)
+
+    queries = [(90, 0), (-90, 45), (89.99, 179.99), (0, 180), (0, -180), (-45, 179.5), (40.4, -3.7)]
+    queries += [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(40)]
+    for lat, lon in queries:
+        for k in (1, 7, 50):
+            for category_id in (None, 1, 4, 99):
+                found = index.nearest(lat, lon, k, category_id)
+                expected = brute_force(points, lat, lon, k, category_id)
+                assert [distance for _, distance in found] == pytest.approx(expected)
+                for location_id, distance in found:
+                    _, p_lat, p_lon, categories = points[location_id - 1]
+                    assert distance == pytest.approx(haversine_m(lat, lon, p_lat, p_lon))
+                    assert category_id is None or category_id in categories
+
+
+def test_upsert_remove_and_drop_category():
+    index = LocationGridIndex(cell_deg=1.0)
+    index.rebuild([(1, 10.0, 10.0, [1]), (2, 10.5, 10.5, [1, 2])])
+
+    index.upsert(1, -10.0, -10.0, [2])
+    assert index.nearest(10.0, 10.0, 1) == [(2, pytest.approx(haversine_m(10.0, 10.0, 10.5, 10.5)))]
+    assert [location_id for location_id, _ in index.nearest(-10.0, -10.0, 2, category_id=2)] == [1, 2]
+    assert index.nearest(0, 0, 5, category_id=1) == [(2, pytest.approx(haversine_m(0, 0, 10.5, 10.5)))]
+
+    index.drop_category(2)
+    assert index.nearest(0, 0, 5, category_id=2) == []
+    index.remove(2)
+    index.remove(2)
+    assert len(index) == 1
+
+
+def nearest_ids(lat, lon, k=1, category_id=None):
+    with SessionLocal() as db:
+        location_indexes.refresh(db)
+    return [location_id for location_id, _ in location_index.nearest(lat, lon, k, category_id)]
+
+
+def test_replays_writes_of_other_workers(client):
+    client.post("/categories/", json={"name": "Index replay"})
+    category_id = next(category["id"] for category in client.get("/list/categories/").json()
+                       if category["name"] == "Index replay")
+    other = OtherWorker()
+
+    location_id = other.create("Replayed", -33.5, 151.25, [category_id])
+    assert nearest_ids(-33.5, 151.25) == [location_id]
+    assert nearest_ids(0, 0, category_id=category_id) == [location_id]
+
+    other.update(location_id, latitude=-12.25, longitude=130.75)
+    assert nearest_ids(-12.25, 130.75) == [location_id]
+    assert location_index.nearest(-12.25, 130.75, 1)[0][1] == pytest.approx(0)
+
+    other.delete(location_id)
+    assert location_id not in nearest_ids(-12.25, 130.75, k=5)
+    assert nearest_ids(0, 0, category_id=category_id) == []
+
+
+def test_nearest_route_sees_writes_of_other_workers(client):
+    location_id = OtherWorker().create("Seen by the route", 64.125, -21.875)
+    response = client.get("/locations/nearest", params={"lat": 64.125, "lon": -21.875, "k": 1})
+    assert [location["id"] for location in response.json()] == [location_id]
@@ -0,0 +1,34 @@
+import time
+
+from sqlalchemy import text
+
+from db.database import build_engine, checkin_listeners, connect_listeners
+
+
+def test_pool_events_time_connects_and_checkouts(tmp_path):
+    connects, checkins = [], []
+    engine = build_engine(f"sqlite:///{tmp_path}/pool.db")
+    connect_listeners.append(lambda target, seconds: connects.append((target, seconds)))
+    checkin_listeners.append(lambda target, seconds: checkins.append((target, seconds)))
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            time.sleep(0.02)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    finally:
+        connect_listeners.pop()
+        checkin_listeners.pop()
+        engine.dispose()
+
+    # One new connection, reused by the second checkout
+    assert [target for target, _ in connects] == [engine]
+    assert [target for target, _ in checkins] == [engine, engine]
+    assert checkins[0][1] >= 0.02
+
+
+def test_metrics_expose_the_pool_histograms(client):
+    client.get("/list/categories/")
+    body = client.get("/metrics").text
+    assert 'db_pool_checkout_duration_seconds_count{engine="primary"}' in body
+    assert "# TYPE db_pool_connect_seconds histogram" in body
@@ -0,0 +1,96 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import inspect, text
+
+from db.database import build_engine
+from db.migrations import LATEST_VERSION, MIGRATIONS, run_migrations
+from models.models import NEVER_REVIEWED_DUE_AT
+from utils.review_policy import next_due_at
+
+# The tables as the first release created them, before any migration existed
+BASELINE_SCHEMA = [
+    """CREATE TABLE locations (
+        id INTEGER NOT NULL, name VARCHAR, latitude FLOAT NOT NULL, longitude FLOAT NOT NULL, rate FLOAT,
+        description VARCHAR, created_at DATETIME, updated_at DATETIME, PRIMARY KEY (id)
+    )""",
+    "CREATE INDEX ix_locations_id ON locations (id)",
+    "CREATE TABLE categories (id INTEGER NOT NULL, name VARCHAR NOT NULL, PRIMARY KEY (id), UNIQUE (name))",
+    "CREATE INDEX ix_categories_id ON categories (id)",
+    """CREATE TABLE location_category_reviewed (
+        id INTEGER NOT NULL, location_id INTEGER NOT NULL, category_id INTEGER NOT NULL,
+        was_reviewed BOOLEAN DEFAULT 0 NOT NULL, last_reviewed DATETIME, PRIMARY KEY (id),
+        CONSTRAINT unique_location_category_pair UNIQUE (location_id, category_id),
+        FOREIGN KEY(location_id) REFERENCES locations (id), FOREIGN KEY(category_id) REFERENCES categories (id)
+    )""",
+    "CREATE INDEX ix_location_category_reviewed_id ON location_category_reviewed (id)",
+]
+
+REVIEWED_AT = datetime(2024, 5, 6, 7, 8, 9, 123456)
+
+
+@pytest.fixture
+def baseline_engine(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path}/baseline.db")
+    with engine.begin() as conn:
+        for statement in BASELINE_SCHEMA:
+            conn.exec_driver_sql(statement)
+        conn.exec_driver_sql("INSERT INTO locations (id, name, latitude, longitude, rate, description) VALUES "
+                             "(1, 'Café del Puerto', 36.5, -6.3, 4.5, 'Frente al muelle'), "
+                             "(2, 'Mirador', 37.1, -3.6, 2.0, NULL)")
+        conn.exec_driver_sql("INSERT INTO categories (id, name) VALUES (1, 'Cafés'), (2, 'Miradores')")
+        conn.exec_driver_sql("INSERT INTO location_category_reviewed (location_id, category_id, was_reviewed, last_reviewed) "
+                             "VALUES (1, 1, 1, ?), (2, 2, 0, NULL)", (REVIEWED_AT.isoformat(sep=" "),))
+    yield engine
+    engine.dispose()
+
+
+def test_baseline_database_is_migrated_to_the_latest_schema(baseline_engine):
+    assert run_migrations(baseline_engine) == [version for version, _, _ in MIGRATIONS]
+
+    inspector = inspect(baseline_engine)
+    assert {"table_versions", "deleted_records", "schema_version", "locations_rtree", "locations_fts"} \
+        <= set(inspector.get_table_names())
+    assert {"change_seq"} <= {column["name"] for column in inspector.get_columns("locations")}
+    assert {"change_seq", "review_interval_days"} <= {column["name"] for column in inspector.get_columns("categories")}
+    assert {"due_at", "leased_by", "lease_expires_at"} \
+        <= {column["name"] for column in inspector.get_columns("location_category_reviewed")}
+    assert {"ix_locations_change_seq", "ix_locations_lat_lon"} \
+        <= {index["name"] for index in inspector.get_indexes("locations")}
+    assert {"ix_categories_change_seq"} <= {index["name"] for index in inspector.get_indexes("categories")}
+    assert {"ix_lcr_due_at", "ix_lcr_category_location"} \
+        <= {index["name"] for index in inspector.get_indexes("location_category_reviewed")}
+
+    with baseline_engine.connect() as conn:
+        assert conn.execute(text("SELECT version FROM schema_version WHERE id = 1")).scalar() == LATEST_VERSION
+        triggers = set(conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'trigger'")).scalars())
+        assert {"locations_rtree_ai", "locations_rtree_au", "locations_rtree_ad",
+                "locations_fts_ai", "locations_fts_au", "locations_fts_ad"} <= triggers
+
+        # Existing rows are carried over into the new columns and indexes
+        due = dict(conn.execute(text("SELECT location_id, due_at FROM location_category_reviewed")).all())
+        assert due[1] == str(next_due_at(REVIEWED_AT, None, 4.5))
+        assert due[2] == str(NEVER_REVIEWED_DUE_AT)
+        assert conn.execute(text("SELECT count(*) FROM locations_rtree")).scalar() == 2
+        assert conn.execute(text("SELECT rowid FROM locations_fts WHERE locations_fts MATCH 'muelle'")).scalars().all() == [1]
+        assert conn.execute(text("SELECT count(*) FROM locations WHERE change_seq = 0")).scalar() == 2
+
+
+def test_migrations_run_once(baseline_engine):
+    run_migrations(baseline_engine)
+    assert run_migrations(baseline_engine) == []
+    with baseline_engine.connect() as conn:
+        assert conn.execute(text("SELECT version FROM schema_version")).scalars().all() == [LATEST_VERSION]
+
+
+def test_migrations_resume_after_the_last_applied_one(baseline_engine):
+    with baseline_engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE schema_version (id INTEGER NOT NULL, version INTEGER NOT NULL, PRIMARY KEY (id))")
+        conn.exec_driver_sql("INSERT INTO schema_version VALUES (1, 1)")
+        conn.exec_driver_sql("CREATE TABLE table_versions (table_name VARCHAR NOT NULL, version INTEGER NOT NULL, "
+                             "PRIMARY KEY (table_name))")
+        conn.exec_driver_sql("CREATE TABLE deleted_records (id INTEGER NOT NULL, kind VARCHAR NOT NULL, "
+                             "record_id INTEGER NOT NULL, change_seq INTEGER NOT NULL, deleted_at DATETIME, PRIMARY KEY (id))")
+
+    assert run_migrations(baseline_engine) == [version for version, _, _ in MIGRATIONS if version > 1]
+    assert "due_at" in {column["name"] for column in inspect(baseline_engine).get_columns("location_category_reviewed")}
@@ -0,0 +1,63 @@
+import pytest
+
+from tests.fakes import FakeRedis
+from utils.response_cache import RedisBackend, response_cache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def redis_cache(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(response_cache, "backend", RedisBackend(fake))
+    monkeypatch.setattr(response_cache, "enabled", True)
+    return fake
+
+
+def test_redis_backend_get_set_and_ttl():
+    clock = Clock()
+    fake = FakeRedis(clock)
+    backend = RedisBackend(fake, prefix="test:")
+
+    assert backend.get("key") is None
+    backend.set("key", b"value", ttl=2)
+    assert backend.get("key") == b"value"
+    assert list(fake.data) == ["test:key"]
+
+    clock.now += 1.9
+    assert backend.get("key") == b"value"
+    clock.now += 0.2
+    assert backend.get("key") is None
+
+
+def test_version_bump_changes_the_key(client, redis_cache):
+    first = client.get("/list/categories/")
+    assert first.headers["X-Cache"] == "MISS"
+    assert client.get("/list/categories/").headers["X-Cache"] == "HIT"
+    assert len(redis_cache.data) == 1
+
+    assert client.post("/categories/", json={"name": "Cache test category"}).status_code == 200
+
+    after_write = client.get("/list/categories/")
+    assert after_write.headers["X-Cache"] == "MISS"
+    assert after_write.headers["ETag"] != first.headers["ETag"]
+    assert "Cache test category" in [category["name"] for category in after_write.json()]
+    assert len(redis_cache.data) == 2
+
+
+def test_matching_etag_gets_304(client, redis_cache):
+    response = client.get("/list/categories/")
+    etag = response.headers["ETag"]
+
+    not_modified = client.get("/list/categories/", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+
+    assert client.get("/list/categories/", headers={"If-None-Match": '"other"'}).status_code == 200
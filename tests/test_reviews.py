@@ -0,0 +1,146 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import DateTime, create_mock_engine, literal, select, type_coerce
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from db.database import SessionLocal
+from models.models import Category, Location, LocationCategoryReviewed
+from utils import review_policy
+from utils.review_policy import due_at_sql, next_due_at
+from utils.reviews import MAX_REVIEW_LEASE_SIZE, lease_due_reviews
+
+
+def create_pairs(client, name, categories):
+    """A location with one new category per name; returns [(location_id, category_id)]."""
+    response = client.post("/locations/", json={"name": name, "latitude": 5.5, "longitude": 6.5, "rate": 4,
+                                                "category_ids": [], "new_categories": categories})
+    assert response.status_code == 200
+    location_id = response.json()["id"]
+    with SessionLocal() as db:
+        return db.query(LocationCategoryReviewed.location_id, LocationCategoryReviewed.category_id) \
+            .filter(LocationCategoryReviewed.location_id == location_id).all()
+
+
+def pair_row(db, location_id, category_id):
+    return db.query(LocationCategoryReviewed, Category.review_interval_days, Location.rate) \
+        .join(Category, Category.id == LocationCategoryReviewed.category_id) \
+        .join(Location, Location.id == LocationCategoryReviewed.location_id) \
+        .filter(LocationCategoryReviewed.location_id == location_id,
+                LocationCategoryReviewed.category_id == category_id).one()
+
+
+def lease_all(client, worker):
+    """Every pair a worker can claim through the route, page after page."""
+    leases = []
+    while page := client.post("/reviews/lease", params={"n": MAX_REVIEW_LEASE_SIZE, "worker": worker}).json():
+        leases += page
+    return leases
+
+
+def test_concurrent_leases_never_share_a_pair(client):
+    create_pairs(client, "Lease race", [f"Lease race {n}" for n in range(12)])
+    with SessionLocal() as db:
+        due = {row.id for row in db.query(LocationCategoryReviewed.id)
+               .filter(LocationCategoryReviewed.due_at <= datetime.utcnow(),
+                       LocationCategoryReviewed.lease_expires_at.is_(None))}
+
+    leased = {}
+    barrier = threading.Barrier(4)
+
+    def reviewer(worker):
+        barrier.wait()
+        claimed = []
+        with SessionLocal() as db:
+            while True:
+                ids = lease_due_reviews(db, worker, 2, ttl=300)
+                db.commit()
+                if not ids:
+                    break
+                claimed += ids
+        leased[worker] = claimed
+
+    threads = [threading.Thread(target=reviewer, args=(f"worker-{n}",)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    claimed = [pair_id for ids in leased.values() for pair_id in ids]
+    assert len(claimed) == len(set(claimed))
+    assert due <= set(claimed)
+    with SessionLocal() as db:
+        holders = dict(db.query(LocationCategoryReviewed.id, LocationCategoryReviewed.leased_by)
+                       .filter(LocationCategoryReviewed.id.in_(claimed)))
+    assert all(holders[pair_id] == worker for worker, ids in leased.items() for pair_id in ids)
+
+
+def test_expired_lease_goes_back_to_the_queue(client):
+    create_pairs(client, "Lease expiry", ["Lease expiry"])
+    with SessionLocal() as db:
+        first = lease_due_reviews(db, "first", 1000, ttl=60)
+        db.commit()
+        assert first
+        assert lease_due_reviews(db, "second", 1000, ttl=60) == []
+        later = datetime.utcnow() + timedelta(seconds=61)
+        assert set(lease_due_reviews(db, "second", 1000, ttl=60, now=later)) == set(first)
+        db.rollback()
+
+
+def test_lease_route_then_mark_releases_the_lease_and_schedules_the_next_review(client):
+    [(location_id, category_id)] = create_pairs(client, "Lease and mark", ["Lease and mark"])
+    leases = lease_all(client, "route-worker")
+    assert (location_id, category_id) in {(lease["location_id"], lease["category_id"]) for lease in leases}
+    assert all(lease["leased_by"] == "route-worker" for lease in leases)
+    assert lease_all(client, "other") == []
+
+    before = datetime.utcnow()
+    response = client.post("/mark/reviews/", json={"location_id": location_id, "category_id": category_id})
+    assert response.status_code == 200
+
+    with SessionLocal() as db:
+        pair, interval, rate = pair_row(db, location_id, category_id)
+    assert pair.was_reviewed
+    assert pair.leased_by is None and pair.lease_expires_at is None
+    assert before <= pair.last_reviewed <= datetime.utcnow()
+    assert pair.due_at == next_due_at(pair.last_reviewed, interval, rate)
+
+    assert client.post("/mark/reviews/", json={"location_id": location_id, "category_id": -1}).status_code == 400
+
+
+def test_bulk_mark_releases_leases_and_reports_missing_pairs(client):
+    pairs = create_pairs(client, "Bulk mark", ["Bulk mark a", "Bulk mark b"])
+    lease_all(client, "bulk-worker")
+
+    body = [{"location_id": l_id, "category_id": c_id} for l_id, c_id in pairs]
+    body += [body[0], {"location_id": pairs[0][0], "category_id": -1}]
+    result = client.post("/mark/reviews/bulk", json=body).json()
+    assert {(item["location_id"], item["category_id"]) for item in result["matched"]} == set(pairs)
+    assert result["missing"] == [{"location_id": pairs[0][0], "category_id": -1}]
+
+    with SessionLocal() as db:
+        for location_id, category_id in pairs:
+            pair, interval, rate = pair_row(db, location_id, category_id)
+            assert pair.leased_by is None and pair.lease_expires_at is None
+            assert pair.due_at == next_due_at(pair.last_reviewed, interval, rate)
+
+
+@pytest.mark.parametrize("interval_days, rate", [(None, None), (7, 0), (0.5, 2.5), (12.345, 4.9)])
+def test_due_at_sql_matches_next_due_at_on_sqlite(monkeypatch, interval_days, rate):
+    monkeypatch.setattr(review_policy, "REVIEW_RATE_WEIGHT_HOURS", 3.5)
+    reviewed_at = datetime(2025, 12, 31, 23, 59, 59, 999999)
+    with SessionLocal() as db:
+        expression = due_at_sql(db, literal(reviewed_at, DateTime), literal(interval_days), literal(rate))
+        assert db.execute(select(type_coerce(expression, DateTime))).scalar() == \
+            next_due_at(reviewed_at, interval_days, rate)
+
+
+def test_due_at_sql_on_postgresql_uses_interval_arithmetic():
+    db = Session(bind=create_mock_engine("postgresql://", executor=None))
+    expression = due_at_sql(db, LocationCategoryReviewed.last_reviewed, Category.review_interval_days, Location.rate)
+    sql = str(expression.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("location_category_reviewed.last_reviewed + make_interval(")
+    assert "coalesce(categories.review_interval_days" in sql
+    assert "coalesce(locations.rate" in sql
@@ -0,0 +1,14 @@
+def test_rate_histogram_and_density_buckets_round_down(client):
+    for name, rate, lat, lon in (("Stats negative", -0.5, -89.95, -179.95), ("Stats fraction", 2.7, 0.05, 0.05)):
+        response = client.post("/locations/", json={"name": name, "latitude": lat, "longitude": lon, "rate": rate,
+                                                    "category_ids": []})
+        assert response.status_code == 200
+
+    stats = client.get("/stats/locations", params={"cell_deg": 0.1}).json()
+    histogram = {bucket["rate"]: bucket["count"] for bucket in stats["rate_histogram"]}
+    assert histogram[-1] >= 1 and histogram[2] >= 1
+    assert all(isinstance(rate, int) for rate in histogram)
+
+    cells = {(round(cell["min_latitude"], 6), round(cell["min_longitude"], 6)) for cell in stats["density"]}
+    assert (-90, -180) in cells
+    assert (0, 0) in cells
@@ -0,0 +1,48 @@
+from sqlalchemy import intersect, select
+from sqlalchemy.orm import Session
+from db.database import insert_ignore
+from models.models import Category, LocationCategoryReviewed
+from utils.changes import next_change_seq
+from utils.table_versions import bump_table_version
+
+
+def resolve_category_names(db: Session, names) -> dict[str, int]:
+    """Map category names to ids, creating the missing ones.
+
+    One SELECT ... IN for the lookup and a single INSERT ... ON CONFLICT DO NOTHING for the
+    missing names, so concurrent writers creating the same category do not fail. Does not commit.
+    """
+    names = list(dict.fromkeys(names))
+    if not names:
+        return {}
+
+    found = dict(db.query(Category.name, Category.id).filter(Category.name.in_(names)).all())
+    missing = [name for name in names if name not in found]
+    if missing:
+        seq = next_change_seq(db)
+        db.execute(insert_ignore(db, Category).values([{"name": name, "change_seq": seq} for name in missing]))
+        bump_table_version(db, "categories")
+        found.update(db.query(Category.name, Category.id).filter(Category.name.in_(missing)).all())
+    return found
+
+
+def location_ids_in_categories(db: Session, category_ids: list[int], match: str = "any",
+                               after: int | None = None, limit: int = 100) -> list[int]:
+    """Ids of the locations with any (or all) of the categories, in id order, one page at a time.
+
+    Read from the (category_id, location_id) index alone: each category is a range scan
+    already sorted by location_id, and match=all intersects them in the database.
+    """
+    def ids_of(*criteria):
+        query = select(LocationCategoryReviewed.location_id).where(*criteria)
+        if after is not None:
+            query = query.where(LocationCategoryReviewed.location_id > after)
+        return query
+
+    if match == "all" and len(category_ids) > 1:
+        ids = intersect(*(ids_of(LocationCategoryReviewed.category_id == category_id)
+                          for category_id in category_ids)).subquery()
+    else:
+        ids = ids_of(LocationCategoryReviewed.category_id.in_(category_ids)).distinct().subquery()
+
+    return db.execute(select(ids.c.location_id).order_by(ids.c.location_id).limit(limit)).scalars().all()
@@ -0,0 +1,69 @@
+import threading
+from sqlalchemy.orm import Session
+from models.models import Category
+from schemas.schemas import CategoryOut
+from utils.categories import resolve_category_names
+from utils.metrics import record_cache
+from utils.table_versions import table_versions, versions_for
+
+
+class CategoryCache:
+    """Process-local id -> name and name -> id maps of the categories table.
+
+    Commits in this process that bump the categories version drop it right away; writes
+    from other workers are noticed through the table_versions tracker. The rows are tagged
+    with the version of the database they were read from, so rows of a lagging replica
+    are reloaded as soon as a session of the primary sees a newer version.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_id = {}
+        self._by_name = {}
+        self._sorted = []
+        self.version = None
+        table_versions.on_change(self._on_change)
+
+    def _on_change(self, tables):
+        if "categories" in tables:
+            self.version = None
+
+    def load(self, db: Session):
+        """Reload every category from the database."""
+        (version,) = versions_for(db).current(db, ("categories",))
+        categories = [CategoryOut(id=row.id, name=row.name)
+                      for row in db.query(Category.id, Category.name).order_by(Category.id)]
+        with self._lock:
+            self._sorted = categories
+            self._by_id = {category.id: category for category in categories}
+            self._by_name = {category.name: category.id for category in categories}
+            self.version = version
+
+    def ensure_fresh(self, db: Session):
+        """Reload if the categories version moved since the last load."""
+        if self.version is None or versions_for(db).current(db, ("categories",)) != (self.version,):
+            record_cache("category", "miss")
+            self.load(db)
+        else:
+            record_cache("category", "hit")
+
+    def all(self, db: Session) -> list[CategoryOut]:
+        """Every category, ordered by id."""
+        self.ensure_fresh(db)
+        return self._sorted
+
+    def get(self, db: Session, category_id: int) -> CategoryOut | None:
+        self.ensure_fresh(db)
+        return self._by_id.get(category_id)
+
+    def resolve_names(self, db: Session, names) -> dict[str, int]:
+        """Map names to ids, creating the unknown ones (see resolve_category_names)."""
+        names = set(names)
+        self.ensure_fresh(db)
+        by_name = self._by_name
+        if all(name in by_name for name in names):
+            return {name: by_name[name] for name in names}
+        return resolve_category_names(db, names)
+
+
+category_cache = CategoryCache()
@@ -0,0 +1,147 @@
+from typing import NamedTuple
+from fastapi import HTTPException
+from sqlalchemy import and_, event, or_, select, update
+from sqlalchemy.orm import Session, selectinload
+from models.models import Category, DeletedRecord, Location, LocationCategoryReviewed
+from schemas.schemas import CategoryOut, LocationOut
+from utils.pagination import decode_token, encode_token
+from utils.table_versions import bump_table_version
+
+
+# table_versions row used as the global change sequence of locations and categories
+CHANGE_SEQUENCE = "changes"
+
+# Order of the feed entries that share a sequence number
+KIND_RANK = {"category": 0, "location": 1, "deleted": 2}
+
+class LocationChange(NamedTuple):
+    """A location written or deleted, as replayed into the in-memory indexes."""
+    id: int
+    deleted: bool
+    latitude: float | None = None
+    longitude: float | None = None
+    name: str | None = None
+    category_ids: tuple[int, ...] = ()
+
+
+# Position before every change, including rows written before the sequence existed (seq 0)
+START_POSITION = (0, "category", 0)
+
+
+def next_change_seq(db: Session) -> int:
+    """Sequence number of the rows written by the current transaction. Does not commit.
+
+    Taken once per transaction; the counter row stays locked until commit, so a client that
+    has seen sequence N can never miss a change committed later with a lower number.
+    """
+    seq = db.info.get("change_seq")
+    if seq is None:
+        seq = db.info["change_seq"] = bump_table_version(db, CHANGE_SEQUENCE)
+    return seq
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _forget_change_seq(session):
+    session.info.pop("change_seq", None)
+
+
+def record_deletion(db: Session, kind: str, record_id: int):
+    """Leave a tombstone for a deleted location or category. Does not commit."""
+    db.add(DeletedRecord(kind=kind, record_id=record_id, change_seq=next_change_seq(db)))
+
+
+def touch_locations_of_category(db: Session, category_id: int):
+    """Re-emit the locations of a category, whose embedded categories are about to change."""
+    db.execute(
+        update(Location)
+        .where(Location.id.in_(select(LocationCategoryReviewed.location_id)
+                               .where(LocationCategoryReviewed.category_id == category_id)))
+        .values(change_seq=next_change_seq(db))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def encode_change_cursor(position: tuple[int, str, int]) -> str:
+    seq, kind, record_id = position
+    return encode_token({"seq": seq, "kind": kind, "id": record_id})
+
+
+def decode_change_cursor(since: str | None) -> tuple[int, str, int]:
+    """(seq, kind, id) of the last change a client has seen; no cursor means a full sync."""
+    if not since:
+        return START_POSITION
+    payload = decode_token(since)
+    position = (payload.get("seq"), payload.get("kind"), payload.get("id"))
+    if not isinstance(position[0], int) or position[1] not in KIND_RANK or not isinstance(position[2], int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return position
+
+
+def _after(kind: str, seq_column, id_column, position):
+    """Keyset condition selecting the rows of one stream that sort after position."""
+    seq, last_kind, last_id = position
+    if KIND_RANK[kind] > KIND_RANK[last_kind]:
+        return seq_column >= seq
+    if KIND_RANK[kind] < KIND_RANK[last_kind]:
+        return seq_column > seq
+    return or_(seq_column > seq, and_(seq_column == seq, id_column > last_id))
+
+
+def changes_since(db: Session, position, limit: int) -> tuple[list[dict], tuple, bool]:
+    """Merge category upserts, location upserts and tombstones after position, in order.
+
+    Each stream is an index range scan on change_seq of at most limit + 1 rows, which is
+    enough to fill a page of the merged feed.
+    """
+    categories = db.query(Category) \
+        .filter(_after("category", Category.change_seq, Category.id, position)) \
+        .order_by(Category.change_seq, Category.id).limit(limit + 1).all()
+    locations = db.query(Location).options(selectinload(Location.categories)) \
+        .filter(_after("location", Location.change_seq, Location.id, position)) \
+        .order_by(Location.change_seq, Location.id).limit(limit + 1).all()
+    deleted = db.query(DeletedRecord) \
+        .filter(_after("deleted", DeletedRecord.change_seq, DeletedRecord.id, position)) \
+        .order_by(DeletedRecord.change_seq, DeletedRecord.id).limit(limit + 1).all()
+
+    entries = [
+        *(((row.change_seq, "category", row.id),
+           {"kind": "category", "op": "upsert", "id": row.id, "seq": row.change_seq,
+            "data": CategoryOut.model_validate(row, from_attributes=True)}) for row in categories),
+        *(((row.change_seq, "location", row.id),
+           {"kind": "location", "op": "upsert", "id": row.id, "seq": row.change_seq,
+            "data": LocationOut.model_validate(row, from_attributes=True)}) for row in locations),
+        *(((row.change_seq, "deleted", row.id),
+           {"kind": row.kind, "op": "delete", "id": row.record_id, "seq": row.change_seq, "data": None})
+          for row in deleted),
+    ]
+    entries.sort(key=lambda entry: (entry[0][0], KIND_RANK[entry[0][1]], entry[0][2]))
+
+    page = entries[:limit]
+    last = page[-1][0] if page else position
+    return [change for _, change in page], last, len(entries) > limit
+
+
+def location_changes(db: Session, after: int, upto: int) -> list[LocationChange]:
+    """Locations written or deleted with a sequence number in (after, upto], in sequence order.
+
+    A location changed twice in the range shows up once, with its current row; one deleted and
+    re-created under the same id is removed first. Range scans on the change_seq indexes.
+    """
+    in_range = Location.change_seq > after, Location.change_seq <= upto
+    category_ids = {}
+    for location_id, category_id in db.query(LocationCategoryReviewed.location_id, LocationCategoryReviewed.category_id) \
+            .join(Location, Location.id == LocationCategoryReviewed.location_id).filter(*in_range):
+        category_ids.setdefault(location_id, []).append(category_id)
+
+    written = db.query(Location.id, Location.latitude, Location.longitude, Location.name, Location.change_seq).filter(*in_range)
+    deleted = db.query(DeletedRecord.record_id, DeletedRecord.change_seq) \
+        .filter(DeletedRecord.kind == "location", DeletedRecord.change_seq > after, DeletedRecord.change_seq <= upto)
+
+    changes = [
+        *((row.change_seq, KIND_RANK["location"], LocationChange(
+            row.id, False, row.latitude, row.longitude, row.name, tuple(category_ids.get(row.id, ())))) for row in written),
+        *((row.change_seq, KIND_RANK["deleted"], LocationChange(row.record_id, True)) for row in deleted),
+    ]
+    changes.sort(key=lambda change: change[:2])
+    return [change for _, _, change in changes]
@@ -0,0 +1,138 @@
+import math
+import os
+import threading
+from sqlalchemy.orm import Session
+from models.models import Location
+
+
+# Deepest zoom with precomputed clusters; deeper views list the locations themselves
+CLUSTER_MAX_ZOOM = int(os.getenv("CLUSTER_MAX_ZOOM", "12"))
+# Grid cells per tile side: 256 px tiles split into 64 px cells
+CLUSTER_CELLS_PER_TILE = int(os.getenv("CLUSTER_CELLS_PER_TILE", "4"))
+# Past CLUSTER_MAX_ZOOM, a view with more locations than this still gets clusters
+CLUSTER_POINT_LIMIT = int(os.getenv("CLUSTER_POINT_LIMIT", "500"))
+
+MAX_MERCATOR_LAT = 85.05112878
+
+
+def to_mercator(lat: float, lon: float) -> tuple[float, float]:
+    """Web Mercator coordinates normalized to [0, 1], y growing southwards like tile rows."""
+    lat = max(-MAX_MERCATOR_LAT, min(MAX_MERCATOR_LAT, lat))
+    x = (lon + 180) / 360
+    y = 0.5 - math.log(math.tan(math.pi / 4 + math.radians(lat) / 2)) / (2 * math.pi)
+    return x, y
+
+
+def from_mercator(x: float, y: float) -> tuple[float, float]:
+    lat = math.degrees(2 * math.atan(math.exp((0.5 - y) * 2 * math.pi)) - math.pi / 2)
+    return lat, x * 360 - 180
+
+
+def mercator_boxes(min_lon: float, min_lat: float, max_lon: float, max_lat: float) -> list[tuple[float, float, float, float]]:
+    """(x0, y0, x1, y1) boxes covering a bbox, split in two when it crosses the antimeridian."""
+    x_ranges = [(min_lon, max_lon)] if min_lon <= max_lon else [(min_lon, 180.0), (-180.0, max_lon)]
+    _, y0 = to_mercator(max_lat, 0)
+    _, y1 = to_mercator(min_lat, 0)
+    return [((lon0 + 180) / 360, y0, (lon1 + 180) / 360, y1) for lon0, lon1 in x_ranges]
+
+
+class ClusterIndex:
+    """Hierarchical grid of location counts in Web Mercator, one level per zoom.
+
+    Each level maps a cell to [count, sum_x, sum_y, xor_of_ids]: the centroid is the mean
+    position, and when a cell holds a single location the XOR is its id. Cells nest inside
+    tiles, so a tile is answered from CLUSTER_CELLS_PER_TILE² lookups. Inserting, moving or
+    removing a location updates one cell per level, and like the nearest-neighbour index
+    every process keeps its own copy, kept up to date through utils.index_sync.
+    """
+
+    def __init__(self, max_zoom: int = CLUSTER_MAX_ZOOM, cells_per_tile: int = CLUSTER_CELLS_PER_TILE):
+        self.max_zoom = max_zoom
+        self.cells_per_tile = cells_per_tile
+        self._lock = threading.Lock()
+        self._levels = [{} for _ in range(max_zoom + 1)]
+        self._points = {}  # id -> (x, y)
+
+    def __len__(self):
+        return len(self._points)
+
+    def _apply(self, location_id: int, x: float, y: float, sign: int):
+        for zoom, cells in enumerate(self._levels):
+            n = self.cells_per_tile << zoom
+            cell = (min(int(x * n), n - 1), min(int(y * n), n - 1))
+            aggregate = cells.get(cell)
+            if aggregate is None:
+                aggregate = cells[cell] = [0, 0.0, 0.0, 0]
+            aggregate[0] += sign
+            aggregate[1] += sign * x
+            aggregate[2] += sign * y
+            aggregate[3] ^= location_id
+            if not aggregate[0]:
+                del cells[cell]
+
+    def _discard(self, location_id: int):
+        point = self._points.pop(location_id, None)
+        if point is not None:
+            self._apply(location_id, *point, -1)
+
+    def rebuild(self, rows):
+        """Replace the whole index with (id, latitude, longitude) rows."""
+        with self._lock:
+            self._levels = [{} for _ in range(self.max_zoom + 1)]
+            self._points = {}
+            for location_id, lat, lon in rows:
+                self._points[location_id] = to_mercator(lat, lon)
+                self._apply(location_id, *self._points[location_id], 1)
+
+    def upsert(self, location_id: int, lat: float, lon: float):
+        """Insert a location or move it to its new coordinates."""
+        with self._lock:
+            self._discard(location_id)
+            self._points[location_id] = to_mercator(lat, lon)
+            self._apply(location_id, *self._points[location_id], 1)
+
+    def remove(self, location_id: int):
+        """Remove a location, if indexed."""
+        with self._lock:
+            self._discard(location_id)
+
+    def clusters(self, zoom: int, x0: float, y0: float, x1: float, y1: float) -> list[dict]:
+        """Clusters of the cells inside the Mercator box [x0, x1) x [y0, y1) at a zoom level."""
+        zoom = max(0, min(zoom, self.max_zoom))
+        n = self.cells_per_tile << zoom
+        ix0, ix1 = max(0, math.floor(x0 * n)), min(n, math.ceil(x1 * n))
+        iy0, iy1 = max(0, math.floor(y0 * n)), min(n, math.ceil(y1 * n))
+
+        with self._lock:
+            cells = self._levels[zoom]
+            if (ix1 - ix0) * (iy1 - iy0) > len(cells):
+                found = [(cell, aggregate) for cell, aggregate in cells.items()
+                         if ix0 <= cell[0] < ix1 and iy0 <= cell[1] < iy1]
+            else:
+                found = [((ix, iy), cells[ix, iy]) for ix in range(ix0, ix1) for iy in range(iy0, iy1)
+                         if (ix, iy) in cells]
+            found = [(cell, tuple(aggregate)) for cell, aggregate in found]
+
+        result = []
+        for _, (count, sum_x, sum_y, id_xor) in sorted(found):
+            lat, lon = from_mercator(sum_x / count, sum_y / count)
+            result.append({"latitude": lat, "longitude": lon, "count": count,
+                           "location_id": id_xor if count == 1 else None})
+        return result
+
+
+def load_cluster_index(db: Session):
+    """(Re)build the process-wide cluster index from the locations table."""
+    cluster_index.rebuild(db.query(Location.id, Location.latitude, Location.longitude))
+
+
+def apply_cluster_changes(changes):
+    """Replay LocationChange entries written by any process into the process-wide index."""
+    for change in changes:
+        if change.deleted:
+            cluster_index.remove(change.id)
+        else:
+            cluster_index.upsert(change.id, change.latitude, change.longitude)
+
+
+cluster_index = ClusterIndex()
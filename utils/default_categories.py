@@ -1,17 +1,19 @@
 from sqlalchemy.orm import Session
-from models.models import Category
+from utils.categories import resolve_category_names
+
+
+DEFAULT_CATEGORIES = [
+    "Restaurante", "Museo", "Parque", "Hospital",
+    "Escuela", "Centro Comercial", "Hotel", "Bar",
+    "Gimnasio", "Supermercado"
+]
 
 
 def create_default_categories(db: Session):
-    """Create default categories if they do not exist."""
-    default_categories = [
-        "Restaurante", "Museo", "Parque", "Hospital",
-        "Escuela", "Centro Comercial", "Hotel", "Bar",
-        "Gimnasio", "Supermercado"
-    ]
+    """Create default categories if they do not exist.
 
-    for cat_name in default_categories:
-        existing = db.query(Category).filter(Category.name == cat_name).first()
-        if not existing:
-            db.add(Category(name=cat_name))
+    One SELECT when they are all there, plus a single INSERT ... ON CONFLICT DO NOTHING
+    for the missing ones, so workers booting together do not race each other.
+    """
+    resolve_category_names(db, DEFAULT_CATEGORIES)
     db.commit()
@@ -1,42 +1,23 @@
-from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from models.models import LocationCategoryReviewed, Location, Category
 from schemas.schemas import RecommendationOut
-from sqlalchemy.orm import aliased
-from sqlalchemy import or_
+from utils.review_policy import REVIEW_PAGE_SIZE
+from utils.reviews import due_reviews
 
 
-def get_fresh_recommendations(db: Session):
-    threshold = datetime.utcnow() - timedelta(days=30)
-
-    # Subconsulta: combinaciones revisadas en los últimos 30 días
-    recent_reviews = db.query(
+def get_fresh_recommendations(db: Session, limit: int = REVIEW_PAGE_SIZE):
+    # Cabeza de la cola de revisión (índice sobre due_at); ubicación y categoría por clave primaria
+    results = due_reviews(
+        db,
+        LocationCategoryReviewed.id,
         LocationCategoryReviewed.location_id,
-        LocationCategoryReviewed.category_id
-    ).filter(
-        LocationCategoryReviewed.last_reviewed >= threshold
-    ).subquery()
-
-    # Aliases para evitar conflicto al usar LocationCategoryReviewed varias veces
-    LCR = aliased(LocationCategoryReviewed)
-    Loc = aliased(Location)
-    Cat = aliased(Category)
-
-    # Consulta principal: combinaciones no revisadas recientemente
-    results = db.query(
-        LCR.id,
-        LCR.location_id,
-        LCR.category_id,
-        Loc.name.label('location_name'),
-        Cat.name.label('category_name'),
-        LCR.last_reviewed
-    ).join(Loc, LCR.location_id == Loc.id) \
-     .join(Cat, LCR.category_id == Cat.id) \
-     .outerjoin(recent_reviews, (LCR.location_id == recent_reviews.c.location_id) &
-                               (LCR.category_id == recent_reviews.c.category_id)) \
-     .filter(recent_reviews.c.location_id.is_(None)) \
-     .order_by(LCR.last_reviewed.asc().nulls_first()) \
-     .limit(10).all()
+        LocationCategoryReviewed.category_id,
+        Location.name.label('location_name'),
+        Category.name.label('category_name'),
+        LocationCategoryReviewed.last_reviewed
+    ).join(Location, LocationCategoryReviewed.location_id == Location.id) \
+     .join(Category, LocationCategoryReviewed.category_id == Category.id) \
+     .limit(limit).all()
 
     return [
         RecommendationOut(
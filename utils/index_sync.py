@@ -0,0 +1,66 @@
+import threading
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from models.models import TableVersion
+from utils.changes import CHANGE_SEQUENCE, location_changes
+from utils.clusters import apply_cluster_changes, load_cluster_index
+from utils.location_index import apply_location_changes, load_location_index
+from utils.search import apply_name_changes, load_name_index
+from utils.table_versions import versions_for
+
+
+class IndexSync:
+    """Keeps the process-local location indexes in step with writes made by any process.
+
+    The indexes are loaded once, then follow the change sequence: when table_versions shows
+    it moved (checked at most every VERSION_CHECK_INTERVAL seconds), the locations written
+    and deleted since the last position are replayed into every index instead of reloading
+    them. Writes of this process are applied by the handlers right away and replayed again,
+    which leaves the indexes unchanged.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._indexes = []  # (name, load, apply)
+        self.position = None
+
+    def register(self, name: str, load, apply):
+        self._indexes.append((name, load, apply))
+
+    @staticmethod
+    def _sequence(db: Session) -> int:
+        # Read on the serving session, so the replayed rows are never newer than its snapshot
+        version = db.execute(select(TableVersion.version).where(TableVersion.table_name == CHANGE_SEQUENCE)).scalar()
+        return version or 0
+
+    def load(self, db: Session, run=lambda name, function, *args: function(*args)):
+        """(Re)build every index; run(name, load, db) wraps each load, e.g. to time it."""
+        with self._lock:
+            # Taken first: a write committed during the load is at worst replayed twice
+            position = self._sequence(db)
+            for name, load, _ in self._indexes:
+                run(name, load, db)
+            self.position = position
+
+    def refresh(self, db: Session):
+        """Replay the changes committed since the last load or refresh, if any. Does not commit."""
+        if self.position is None:
+            self.load(db)
+            return
+        version, = versions_for(db).current(db, (CHANGE_SEQUENCE,))
+        if version <= self.position:
+            return
+        with self._lock:
+            upto = self._sequence(db)
+            if upto <= self.position:
+                return
+            changes = location_changes(db, self.position, upto)
+            for _, _, apply in self._indexes:
+                apply(changes)
+            self.position = upto
+
+
+location_indexes = IndexSync()
+location_indexes.register("location_index", load_location_index, apply_location_changes)
+location_indexes.register("cluster_index", load_cluster_index, apply_cluster_changes)
+location_indexes.register("name_index", load_name_index, apply_name_changes)
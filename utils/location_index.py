@@ -0,0 +1,199 @@
+import heapq
+import math
+import os
+import threading
+from collections import defaultdict
+from sqlalchemy.orm import Session
+from models.models import Location, LocationCategoryReviewed
+from utils.spatial import EARTH_RADIUS_M, haversine_m
+
+
+class LocationGridIndex:
+    """In-memory grid index over location coordinates for k-nearest-neighbour queries.
+
+    Points are bucketed in square lat/lon cells. A query scans rings of cells around the
+    query point and stops once no unscanned cell can hold anything closer than the current
+    k-th result. Every process keeps its own copy: it is built at startup, updated by the
+    location/category write handlers, and catches up with the writes of other processes
+    through utils.index_sync.
+    """
+
+    def __init__(self, cell_deg: float = 0.01):
+        self.cell_deg = cell_deg
+        self._n_lon = math.ceil(360 / cell_deg)
+        self._n_lat = math.ceil(180 / cell_deg)
+        self._lock = threading.RLock()
+        self._points = {}  # id -> (lat, lon, category_ids)
+        self._cells = defaultdict(set)  # (ix, iy) -> ids
+        self._category_cells = defaultdict(lambda: defaultdict(set))  # category_id -> (ix, iy) -> ids
+
+    def __len__(self):
+        return len(self._points)
+
+    def _cell(self, lat: float, lon: float) -> tuple[int, int]:
+        iy = min(int((lat + 90) // self.cell_deg), self._n_lat - 1)
+        ix = int((lon + 180) // self.cell_deg) % self._n_lon
+        return ix, iy
+
+    def _add(self, location_id: int, lat: float, lon: float, category_ids):
+        cell = self._cell(lat, lon)
+        categories = frozenset(category_ids)
+        self._points[location_id] = (lat, lon, categories)
+        self._cells[cell].add(location_id)
+        for category_id in categories:
+            self._category_cells[category_id][cell].add(location_id)
+
+    def _discard(self, location_id: int):
+        point = self._points.pop(location_id, None)
+        if point is None:
+            return
+        lat, lon, categories = point
+        cell = self._cell(lat, lon)
+        _discard_from(self._cells, cell, location_id)
+        for category_id in categories:
+            cells = self._category_cells[category_id]
+            _discard_from(cells, cell, location_id)
+            if not cells:
+                del self._category_cells[category_id]
+
+    def rebuild(self, rows):
+        """Replace the whole index with (id, latitude, longitude, category_ids) rows."""
+        with self._lock:
+            self._points.clear()
+            self._cells.clear()
+            self._category_cells.clear()
+            for location_id, lat, lon, category_ids in rows:
+                self._add(location_id, lat, lon, category_ids)
+
+    def upsert(self, location_id: int, lat: float, lon: float, category_ids=()):
+        """Insert a location or move it to its new coordinates/categories."""
+        with self._lock:
+            self._discard(location_id)
+            self._add(location_id, lat, lon, category_ids)
+
+    def remove(self, location_id: int):
+        """Remove a location, if indexed."""
+        with self._lock:
+            self._discard(location_id)
+
+    def drop_category(self, category_id: int):
+        """Forget a deleted category on every location that had it."""
+        with self._lock:
+            cells = self._category_cells.pop(category_id, {})
+            for ids in cells.values():
+                for location_id in ids:
+                    lat, lon, categories = self._points[location_id]
+                    self._points[location_id] = (lat, lon, categories - {category_id})
+
+    def nearest(self, lat: float, lon: float, k: int, category_id: int | None = None) -> list[tuple[int, float]]:
+        """Return up to k (location_id, distance_m) pairs, closest first."""
+        with self._lock:
+            if category_id is None:
+                cells = self._cells
+            else:
+                cells = self._category_cells.get(category_id, {})
+            if not cells or k <= 0:
+                return []
+
+            heap = []  # max-heap on distance: (-distance, id)
+            ix0, iy0 = self._cell(lat, lon)
+            max_ring = max(self._n_lon, self._n_lat)
+
+            for ring in range(max_ring + 1):
+                # Once a ring has more cells than there are occupied cells, scanning them all is cheaper
+                if 8 * ring > len(cells):
+                    self._scan_all(cells, lat, lon, k, heap)
+                    break
+
+                for cell in self._ring_cells(ix0, iy0, ring):
+                    self._scan(cells.get(cell, ()), lat, lon, k, heap)
+
+                if len(heap) == k and -heap[0][0] <= self._unscanned_bound(lat, lon, ix0, iy0, ring):
+                    break
+
+            return sorted(((location_id, -neg) for neg, location_id in heap), key=lambda item: item[1])
+
+    def _ring_cells(self, ix0: int, iy0: int, ring: int):
+        if ring == 0:
+            yield ix0, iy0
+            return
+        seen = set()
+        for dy in range(-ring, ring + 1):
+            iy = iy0 + dy
+            if not 0 <= iy < self._n_lat:
+                continue
+            dxs = range(-ring, ring + 1) if abs(dy) == ring else (-ring, ring)
+            for dx in dxs:
+                cell = ((ix0 + dx) % self._n_lon, iy)
+                if cell not in seen:
+                    seen.add(cell)
+                    yield cell
+
+    def _unscanned_bound(self, lat: float, lon: float, ix0: int, iy0: int, ring: int) -> float:
+        """Lower bound of the distance from the query point to any cell outside the scanned rings."""
+        lat_lo = (iy0 - ring) * self.cell_deg - 90
+        lat_hi = (iy0 + ring + 1) * self.cell_deg - 90
+        gaps = []
+        if lat_lo > -90:
+            gaps.append(lat - lat_lo)
+        if lat_hi < 90:
+            gaps.append(lat_hi - lat)
+        lat_bound = EARTH_RADIUS_M * math.radians(min(gaps)) if gaps else math.inf
+
+        if 2 * ring + 1 >= self._n_lon:
+            return lat_bound
+
+        lon_lo = (ix0 - ring) * self.cell_deg - 180
+        lon_gap = min(lon - lon_lo, lon_lo + (2 * ring + 1) * self.cell_deg - lon)
+        # Points beyond the longitude band lie inside the latitude band, so their cos(lat) is bounded below
+        cos_band = math.cos(math.radians(min(90.0, max(abs(lat_lo), abs(lat_hi)))))
+        factor = math.sqrt(max(0.0, math.cos(math.radians(lat)) * cos_band))
+        lon_bound = 2 * EARTH_RADIUS_M * math.asin(min(1.0, factor * math.sin(math.radians(min(lon_gap, 180.0)) / 2)))
+        return min(lat_bound, lon_bound)
+
+    def _scan(self, ids, lat: float, lon: float, k: int, heap: list):
+        for location_id in ids:
+            p_lat, p_lon, _ = self._points[location_id]
+            distance = haversine_m(lat, lon, p_lat, p_lon)
+            if len(heap) < k:
+                heapq.heappush(heap, (-distance, location_id))
+            elif distance < -heap[0][0]:
+                heapq.heapreplace(heap, (-distance, location_id))
+
+    def _scan_all(self, cells, lat: float, lon: float, k: int, heap: list):
+        heap.clear()
+        for ids in cells.values():
+            self._scan(ids, lat, lon, k, heap)
+
+
+def _discard_from(cells, cell, location_id: int):
+    ids = cells.get(cell)
+    if ids is not None:
+        ids.discard(location_id)
+        if not ids:
+            del cells[cell]
+
+
+def load_location_index(db: Session):
+    """(Re)build the process-wide index from the locations table."""
+    category_ids = defaultdict(list)
+    for location_id, category_id in db.query(LocationCategoryReviewed.location_id,
+                                              LocationCategoryReviewed.category_id):
+        category_ids[location_id].append(category_id)
+
+    location_index.rebuild(
+        (row.id, row.latitude, row.longitude, category_ids.get(row.id, ()))
+        for row in db.query(Location.id, Location.latitude, Location.longitude)
+    )
+
+
+def apply_location_changes(changes):
+    """Replay LocationChange entries written by any process into the process-wide index."""
+    for change in changes:
+        if change.deleted:
+            location_index.remove(change.id)
+        else:
+            location_index.upsert(change.id, change.latitude, change.longitude, change.category_ids)
+
+
+location_index = LocationGridIndex(cell_deg=float(os.getenv("LOCATION_INDEX_CELL_DEG", "0.01")))
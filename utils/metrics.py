@@ -0,0 +1,250 @@
+import bisect
+import math
+import threading
+import time
+from db.database import (async_engine, checkin_listeners, connect_listeners, engine, env_flag, replica_engines,
+                         request_sql_stats, statement_listeners)
+
+
+METRICS_ENABLED = env_flag("METRICS_ENABLED", True)
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100, 250)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield self.name + "_total", _labels(self.labelnames, labels), value
+
+
+class Histogram:
+    """Cumulative buckets, sum and count per label set, as Prometheus expects them."""
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets) + (math.inf,)
+        self._lock = threading.Lock()
+        self._values = {}  # labels -> [bucket counts..., sum]
+
+    def observe(self, value: float, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                counts = self._values[labels] = [0] * len(self.buckets) + [0.0]
+            counts[index] += 1
+            counts[-1] += value
+
+    def samples(self):
+        with self._lock:
+            values = sorted((labels, list(counts)) for labels, counts in self._values.items())
+        for labels, counts in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield self.name + "_bucket", _labels(self.labelnames, labels, f'le="{_number(bound)}"'), cumulative
+            yield self.name + "_sum", _labels(self.labelnames, labels), counts[-1]
+            yield self.name + "_count", _labels(self.labelnames, labels), cumulative
+
+
+class Gauge:
+    """Value read when the metrics are scraped; collect() returns {labels tuple: value}."""
+
+    def __init__(self, name: str, documentation: str, labelnames, collect):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+
+    def samples(self):
+        for labels, value in sorted(self.collect().items()):
+            yield self.name, _labels(self.labelnames, labels), value
+
+
+class MetricsRegistry:
+    """Process-local metrics rendered in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            kind = type(metric).__name__.lower()
+            name = metric.name + "_total" if kind == "counter" else metric.name
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{sample}{labels} {_number(value)}" for sample, labels, value in metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+def named_engines() -> dict:
+    """Engines reported in the pool metrics, by label."""
+    engines = {"primary": engine}
+    engines.update((f"replica{index}", replica) for index, replica in enumerate(replica_engines, start=1))
+    if async_engine is not None:
+        engines["async"] = async_engine.sync_engine
+    return engines
+
+
+def _engine_label(target) -> str:
+    return next((name for name, candidate in named_engines().items() if candidate is target), "other")
+
+
+def _pool_connections(state: str) -> dict:
+    values = {}
+    for name, candidate in named_engines().items():
+        pool = candidate.pool
+        # Only QueuePool keeps these counts; in-memory SQLite uses a single static connection
+        if hasattr(pool, "checkedout"):
+            values[(name,)] = pool.checkedout() if state == "in_use" else pool.checkedin()
+    return values
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.register(Counter(
+    "http_requests", "HTTP requests by route and status code.", ("method", "route", "status")))
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "Time to serve a request, body included.", ("method", "route")))
+http_response_size = registry.register(Histogram(
+    "http_response_size_bytes", "Size of response bodies.", ("method", "route"), SIZE_BUCKETS))
+http_request_sql_statements = registry.register(Histogram(
+    "http_request_sql_statements", "SQL statements executed per request.", ("method", "route"), STATEMENT_BUCKETS))
+http_request_sql_duration = registry.register(Histogram(
+    "http_request_sql_duration_seconds", "Time spent in SQL per request.", ("method", "route")))
+db_statements = registry.register(Counter(
+    "db_statements", "SQL statements executed, by engine and statement type.", ("engine", "statement")))
+db_statement_duration = registry.register(Histogram(
+    "db_statement_duration_seconds", "Duration of single SQL statements.", ("engine", "statement")))
+db_pool_connect = registry.register(Histogram(
+    "db_pool_connect_seconds", "Time to open a new database connection for the pool.", ("engine",)))
+db_pool_checkout_duration = registry.register(Histogram(
+    "db_pool_checkout_duration_seconds", "Time connections stay checked out of the pool, from checkout to checkin.",
+    ("engine",)))
+db_pool_in_use = registry.register(Gauge(
+    "db_pool_connections_in_use", "Connections checked out of the pool.", ("engine",),
+    lambda: _pool_connections("in_use")))
+db_pool_idle = registry.register(Gauge(
+    "db_pool_connections_idle", "Open connections waiting in the pool.", ("engine",),
+    lambda: _pool_connections("idle")))
+cache_requests = registry.register(Counter(
+    "cache_requests", "Lookups of the in-process caches by result (hit, miss, not_modified).", ("cache", "result")))
+CACHES = ("response", "category", "table_versions")
+cache_hit_ratio = registry.register(Gauge(
+    "cache_hit_ratio", "Share of cache lookups answered without rebuilding, since the process started.", ("cache",),
+    lambda: {(cache,): _hit_ratio(cache) for cache in CACHES if _lookups(cache)}))
+
+
+def _lookups(cache: str) -> float:
+    return sum(cache_requests.value(cache, result) for result in ("hit", "miss", "not_modified"))
+
+
+def _hit_ratio(cache: str) -> float:
+    return round((cache_requests.value(cache, "hit") + cache_requests.value(cache, "not_modified")) / _lookups(cache), 4)
+
+
+def record_cache(cache: str, result: str):
+    cache_requests.inc(cache, result)
+
+
+def _record_statement(conn, statement: str, parameters, seconds: float):
+    labels = (_engine_label(conn.engine), statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER")
+    db_statements.inc(*labels)
+    db_statement_duration.observe(seconds, *labels)
+
+
+def _record_connect(target, seconds: float):
+    db_pool_connect.observe(seconds, _engine_label(target))
+
+
+def _record_checkin(target, seconds: float):
+    db_pool_checkout_duration.observe(seconds, _engine_label(target))
+
+
+statement_listeners.append(_record_statement)
+connect_listeners.append(_record_connect)
+checkin_listeners.append(_record_checkin)
+
+
+class MetricsMiddleware:
+    """Records latency, status, body size and SQL work of every HTTP request.
+
+    Plain ASGI so streamed responses are measured until their last chunk. Requests are
+    labelled with the route template (/locations/{location_id}), never the raw path.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        sql = [0, 0.0]
+        token = request_sql_stats.set(sql)
+        response = {"status": 500, "size": 0}
+
+        async def measured_send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, measured_send)
+        finally:
+            request_sql_stats.reset(token)
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", "unmatched"))
+            http_requests.inc(*labels, response["status"])
+            http_request_duration.observe(time.perf_counter() - start, *labels)
+            http_response_size.observe(response["size"], *labels)
+            http_request_sql_statements.observe(sql[0], *labels)
+            http_request_sql_duration.observe(sql[1], *labels)
@@ -0,0 +1,69 @@
+import base64
+import binascii
+import json
+import os
+from fastapi import HTTPException, Response
+from utils.serialization import json_response
+
+
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "1000"))
+# Items accepted by one bulk request (locations or reviews)
+MAX_BULK_ITEMS = int(os.getenv("MAX_BULK_ITEMS", "10000"))
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_token(payload: dict) -> str:
+    """Opaque, URL safe encoding of a small JSON payload."""
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_token(token: str, detail: str = "Invalid cursor") -> dict:
+    """Inverse of encode_token; a malformed token is a 400."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail=detail)
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail=detail)
+    return payload
+
+
+def encode_cursor(last_id: int) -> str:
+    """Opaque cursor pointing just after the row with the given id."""
+    return encode_token({"after": last_id})
+
+
+def decode_cursor(cursor: str | None) -> int | None:
+    """Return the id encoded in a cursor, or None for the first page."""
+    if not cursor:
+        return None
+    after = decode_token(cursor).get("after")
+    if not isinstance(after, int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return after
+
+
+def parse_fields(fields: str | None, allowed) -> list[str] | None:
+    """Parse a comma separated fields= projection, None meaning every field."""
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(requested))
+
+
+def next_cursor(rows, limit: int) -> str | None:
+    """Cursor for the page after rows, given that limit + 1 rows were fetched."""
+    if len(rows) <= limit:
+        return None
+    return encode_cursor(rows[limit - 1].id)
+
+
+def projected_response(items: list[dict], cursor: str | None) -> Response:
+    """JSON response for projected rows, bypassing the full response model."""
+    return json_response(items, {NEXT_CURSOR_HEADER: cursor} if cursor else None)
@@ -0,0 +1,172 @@
+import logging
+import os
+import re
+from collections import Counter
+from contextvars import ContextVar
+from fastapi.responses import JSONResponse
+from db.database import env_flag, statement_listeners
+
+
+# Development/staging guard against N+1 queries: most SQL statements a request may run (0 = off)
+QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "0"))
+# Budgets for single routes, e.g. "POST /locations/=8,PUT /locations/{location_id}=10"
+QUERY_BUDGET_ROUTES = {
+    route.strip(): int(budget)
+    for route, _, budget in (item.rpartition("=") for item in os.getenv("QUERY_BUDGET_ROUTES", "").split(","))
+    if route.strip()
+}
+# "log" writes a warning; "raise" also fails the request with a 500, for test and CI runs
+QUERY_BUDGET_MODE = os.getenv("QUERY_BUDGET_MODE", "log").lower()
+# Statements slower than this are logged with their parameters and query plan (0 = off)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "0"))
+SLOW_QUERY_EXPLAIN = env_flag("SLOW_QUERY_EXPLAIN", True)
+
+QUERY_GUARD_ENABLED = bool(QUERY_BUDGET or QUERY_BUDGET_ROUTES or SLOW_QUERY_MS)
+
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+MAX_LOGGED_CHARS = 2000
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """A request ran more SQL statements than its budget (QUERY_BUDGET_MODE=raise)."""
+
+
+def _shorten(text: str, limit: int = MAX_LOGGED_CHARS) -> str:
+    text = re.sub(r"\s+", " ", text).strip()
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+class RequestQueries:
+    """SQL statements run while serving one request."""
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.statements = []
+        self.raised = False
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route")
+        return f"{self.scope['method']} {getattr(route, 'path', self.scope['path'])}"
+
+    @property
+    def budget(self) -> int:
+        return QUERY_BUDGET_ROUTES.get(self.route, QUERY_BUDGET)
+
+    @property
+    def over_budget(self) -> bool:
+        return bool(self.budget) and len(self.statements) > self.budget
+
+    def report(self) -> str:
+        """What went over budget, with the statements run more than once (the usual N+1 suspects)."""
+        repeated = [(count, statement) for statement, count in Counter(self.statements).most_common(3) if count > 1]
+        lines = [f"{self.route} ran {len(self.statements)} SQL statements, over its budget of {self.budget}"]
+        lines += [f"  {count}x {_shorten(statement, 300)}" for count, statement in repeated]
+        return "\n".join(lines)
+
+
+_request_queries: ContextVar[RequestQueries | None] = ContextVar("request_queries", default=None)
+
+
+def _count_statement(conn, statement: str, parameters, seconds: float):
+    queries = _request_queries.get()
+    if queries is None:
+        return
+    queries.statements.append(statement)
+    if QUERY_BUDGET_MODE == "raise" and not queries.raised and queries.over_budget:
+        queries.raised = True
+        raise QueryBudgetExceeded(queries.report())
+
+
+def _first_parameters(parameters):
+    # executemany passes a list of parameter sets; the plan is the same for all of them
+    if isinstance(parameters, list) and parameters and isinstance(parameters[0], (tuple, list, dict)):
+        return parameters[0]
+    return parameters
+
+
+def explain(conn, statement: str, parameters) -> str:
+    """Query plan of a statement, run on the connection (and transaction) that executed it.
+
+    EXPLAIN QUERY PLAN on SQLite, EXPLAIN elsewhere. Goes straight to the DBAPI cursor so it
+    is neither timed nor counted itself.
+    """
+    if not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return ""
+    sqlite = conn.dialect.name == "sqlite"
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(("EXPLAIN QUERY PLAN " if sqlite else "EXPLAIN ") + statement, _first_parameters(parameters))
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    if not sqlite:
+        return "\n".join(str(row[0]) for row in rows)
+    # (id, parent, notused, detail) rows, indented like the sqlite3 shell does
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, 0) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return "\n".join(lines)
+
+
+def _log_slow_query(conn, statement: str, parameters, seconds: float):
+    if not SLOW_QUERY_MS or seconds * 1000 < SLOW_QUERY_MS:
+        return
+    queries = _request_queries.get()
+    lines = [f"Slow query: {seconds * 1000:.1f} ms" + (f" in {queries.route}" if queries else ""),
+             f"  SQL: {_shorten(statement)}",
+             f"  Parameters: {_shorten(repr(parameters))}"]
+    if SLOW_QUERY_EXPLAIN:
+        try:
+            plan = explain(conn, statement, parameters)
+        except Exception as e:
+            plan = f"unavailable ({e})"
+        if plan:
+            lines.append("  Plan:\n" + "\n".join("    " + line for line in plan.splitlines()))
+    logger.warning("\n".join(lines))
+
+
+statement_listeners.append(_count_statement)
+statement_listeners.append(_log_slow_query)
+
+
+class QueryGuardMiddleware:
+    """Counts the SQL statements of every request and reports the ones over budget.
+
+    Over budget requests are always logged with their repeated statements. In raise mode
+    the statement that crosses the budget raises QueryBudgetExceeded, and the request
+    fails with a 500 whose detail is the same report.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries(scope)
+        token = _request_queries.set(queries)
+        started = False
+
+        async def tracked_send(message):
+            nonlocal started
+            started = started or message["type"] == "http.response.start"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, tracked_send)
+        except QueryBudgetExceeded as e:
+            if started:
+                raise
+            await JSONResponse(status_code=500, content={"detail": str(e)})(scope, receive, send)
+        finally:
+            _request_queries.reset(token)
+            if queries.over_budget:
+                logger.warning(queries.report())
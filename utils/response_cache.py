@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from fastapi import Request, Response
+from sqlalchemy.orm import Session
+from db.database import client_key, env_flag, wrote_recently
+from utils.metrics import record_cache
+from utils.table_versions import versions_for
+
+
+RESPONSE_CACHE_ENABLED = env_flag("RESPONSE_CACHE_ENABLED", True)
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "60"))
+RESPONSE_CACHE_REDIS_URL = os.getenv("RESPONSE_CACHE_REDIS_URL")
+
+
+class InMemoryBackend:
+    """LRU of serialized responses, each entry expiring after its TTL."""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisBackend:
+    """Shares cached responses between workers through any client with Redis' get/set(px=) API."""
+
+    def __init__(self, client, prefix: str = "locations_api:responses:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self.client.set(self.prefix + key, value, px=max(1, int(ttl * 1000)))
+
+
+def build_backend():
+    """Redis when RESPONSE_CACHE_REDIS_URL is set, otherwise a per-process LRU."""
+    if RESPONSE_CACHE_REDIS_URL:
+        import redis
+        return RedisBackend(redis.Redis.from_url(RESPONSE_CACHE_REDIS_URL))
+    return InMemoryBackend()
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+class ResponseCache:
+    """Caches serialized GET responses keyed by path, query params and table versions.
+
+    The ETag is derived from the same key, so a matching If-None-Match is answered with a
+    304 before touching the backend or the database (beyond the throttled version check).
+    Writes bump the table versions, which changes the key, and old entries age out of the LRU.
+    A commit in this process is seen at once; one made by another worker only after the next
+    version check, so entries can be up to VERSION_CHECK_INTERVAL seconds stale across workers.
+
+    Versions come from the database that serves the request, and the key says which one, so
+    a response built on a lagging replica is never stored under the primary's versions.
+    Clients inside their read-your-writes window bypass the cache.
+    """
+
+    def __init__(self, backend=None, ttl: float = RESPONSE_CACHE_TTL, enabled: bool = RESPONSE_CACHE_ENABLED):
+        self.backend = backend if backend is not None else build_backend()
+        self.ttl = ttl
+        self.enabled = enabled
+
+    @staticmethod
+    def key(request: Request, tables, versions, vary: str = "", source: str = "primary") -> str:
+        params = "&".join(f"{name}={value}" for name, value in sorted(request.query_params.multi_items()))
+        tags = ",".join(f"{table}:{version}" for table, version in zip(tables, versions))
+        return f"{request.url.path}?{params}#{source}:{tags}#{vary}"
+
+    def respond(self, request: Request, db: Session, tables, build, vary: str = "") -> Response:
+        """Answer from the cache, or call build() and store its response if it is a 200.
+
+        vary is mixed into the key for responses that also depend on something other than
+        the tables, such as the current time.
+        """
+        if not self.enabled or wrote_recently(client_key(request)):
+            return build()
+
+        versions = versions_for(db)
+        key = self.key(request, tables, versions.current(db, tables), vary, versions.name)
+        etag = '"' + hashlib.sha1(key.encode()).hexdigest() + '"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request, etag):
+            record_cache("response", "not_modified")
+            return Response(status_code=304, headers=headers)
+
+        cached = self.backend.get(key)
+        if cached is not None:
+            stored_headers, body = cached.split(b"\n", 1)
+            headers.update(json.loads(stored_headers))
+            headers["X-Cache"] = "HIT"
+            record_cache("response", "hit")
+            return Response(content=body, media_type="application/json", headers=headers)
+
+        record_cache("response", "miss")
+        response = build()
+        if response.status_code == 200:
+            stored_headers = {name: value for name, value in response.headers.items()
+                              if name not in ("content-length", "content-type")}
+            self.backend.set(key, json.dumps(stored_headers).encode() + b"\n" + response.body, self.ttl)
+        response.headers.update(headers)
+        response.headers["X-Cache"] = "MISS"
+        return response
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,95 @@
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import Integer, cast, func, literal, select, update
+from sqlalchemy.orm import Session
+from models.models import Category, Location, LocationCategoryReviewed, NEVER_REVIEWED_DUE_AT
+
+
+# Days until a reviewed pair is due again, unless its category sets review_interval_days
+REVIEW_INTERVAL_DAYS = float(os.getenv("REVIEW_INTERVAL_DAYS", "30"))
+
+# Each point of Location.rate brings the next review forward by this many hours
+REVIEW_RATE_WEIGHT_HOURS = float(os.getenv("REVIEW_RATE_WEIGHT_HOURS", "0"))
+
+# Pairs returned by /reviews/pending and /recommendations/reviews, and leased by default
+REVIEW_PAGE_SIZE = int(os.getenv("REVIEW_PAGE_SIZE", "10"))
+
+
+def next_due_at(last_reviewed: datetime | None, interval_days: float | None = None, rate: float | None = None) -> datetime:
+    """When a pair reviewed at last_reviewed should be reviewed again.
+
+    Pairs never reviewed are due at the epoch, ahead of everything else and in creation order.
+    """
+    if last_reviewed is None:
+        return NEVER_REVIEWED_DUE_AT
+    interval = timedelta(days=REVIEW_INTERVAL_DAYS if interval_days is None else interval_days)
+    return last_reviewed + interval - timedelta(hours=REVIEW_RATE_WEIGHT_HOURS * (rate or 0.0))
+
+
+def due_at_sql(db: Session, last_reviewed, interval_days, rate):
+    """next_due_at as a SQL expression over columns or subqueries, or None on other databases.
+
+    Lets the due dates be computed by the UPDATE that writes them, whatever the row count.
+    """
+    seconds = func.coalesce(interval_days, REVIEW_INTERVAL_DAYS) * 86400 \
+        - func.coalesce(rate, 0.0) * (REVIEW_RATE_WEIGHT_HOURS * 3600)
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        # DateTime is stored as 'YYYY-MM-DD HH:MM:SS.ffffff': add whole microseconds and
+        # format back, so the result sorts and compares like the values SQLAlchemy writes.
+        # strftime() rounds fractions to milliseconds, so it only gets the whole seconds
+        micros = cast(func.strftime("%s", func.substr(last_reviewed, 1, 19)), Integer) * 1_000_000 \
+            + cast(func.substr(last_reviewed, 21, 6), Integer) + cast(func.round(seconds * 1_000_000), Integer)
+        return func.datetime(micros // 1_000_000, "unixepoch") \
+            .op("||")(func.printf(".%06d", micros % 1_000_000))
+    if dialect == "postgresql":
+        return last_reviewed + func.make_interval(0, 0, 0, 0, 0, 0, seconds)
+    return None
+
+
+def _interval_and_rate():
+    # Correlated to the pair being updated
+    interval = select(Category.review_interval_days) \
+        .where(Category.id == LocationCategoryReviewed.category_id).scalar_subquery()
+    rate = select(Location.rate).where(Location.id == LocationCategoryReviewed.location_id).scalar_subquery()
+    return interval, rate
+
+
+def reviewed_due_at(db: Session, reviewed_at: datetime):
+    """SQL expression for the due_at of a pair reviewed at reviewed_at, or None on other databases."""
+    return due_at_sql(db, literal(reviewed_at, LocationCategoryReviewed.last_reviewed.type), *_interval_and_rate())
+
+
+def reschedule(db: Session, *criteria):
+    """Recompute due_at of the reviewed pairs matching criteria. Does not commit.
+
+    Called whenever an input of next_due_at changes (a category's interval, a location's
+    rate), so reading the queue never needs date arithmetic. criteria may only refer to
+    LocationCategoryReviewed columns. One set-based UPDATE on SQLite and PostgreSQL, however
+    many pairs match; other databases compute the dates in Python.
+    """
+    db.flush()
+    due_at = due_at_sql(db, LocationCategoryReviewed.last_reviewed, *_interval_and_rate())
+    if due_at is not None:
+        db.execute(
+            update(LocationCategoryReviewed)
+            .where(LocationCategoryReviewed.last_reviewed.isnot(None), *criteria)
+            .values(due_at=due_at)
+            .execution_options(synchronize_session=False)
+        )
+        return
+
+    rows = db.query(
+        LocationCategoryReviewed.id,
+        LocationCategoryReviewed.last_reviewed,
+        Category.review_interval_days,
+        Location.rate
+    ).join(Category, LocationCategoryReviewed.category_id == Category.id) \
+     .join(Location, LocationCategoryReviewed.location_id == Location.id) \
+     .filter(LocationCategoryReviewed.last_reviewed.isnot(None), *criteria).all()
+
+    if rows:
+        db.execute(update(LocationCategoryReviewed), [
+            {"id": row.id, "due_at": next_due_at(row.last_reviewed, row.review_interval_days, row.rate)}
+            for row in rows
+        ])
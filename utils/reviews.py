@@ -0,0 +1,86 @@
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import or_, tuple_, update
+from sqlalchemy.orm import Query, Session
+from models.models import LocationCategoryReviewed
+from utils.review_policy import reschedule, reviewed_due_at
+from utils.table_versions import bump_table_version
+
+
+# Keeps each statement well under SQLite's bound-parameter limit (two per pair)
+PAIRS_PER_STATEMENT = 400
+
+REVIEW_LEASE_TTL = int(os.getenv("REVIEW_LEASE_TTL", "300"))
+MAX_REVIEW_LEASE_TTL = int(os.getenv("MAX_REVIEW_LEASE_TTL", "3600"))
+MAX_REVIEW_LEASE_SIZE = int(os.getenv("MAX_REVIEW_LEASE_SIZE", "100"))
+
+
+def _not_leased(now: datetime):
+    return or_(LocationCategoryReviewed.lease_expires_at.is_(None), LocationCategoryReviewed.lease_expires_at <= now)
+
+
+def due_reviews(db: Session, *columns, now: datetime | None = None) -> Query:
+    """Associations due for review and not leased, most overdue (never reviewed) first.
+
+    With a LIMIT this reads the head of the ix_lcr_due_at index, so the cost does not grow
+    with the table.
+    """
+    now = now or datetime.utcnow()
+    return db.query(*(columns or (LocationCategoryReviewed,))) \
+        .filter(LocationCategoryReviewed.due_at <= now, _not_leased(now)) \
+        .order_by(LocationCategoryReviewed.due_at, LocationCategoryReviewed.id)
+
+
+def lease_due_reviews(db: Session, worker: str, n: int, ttl: int, now: datetime | None = None) -> list[int]:
+    """Claim up to n due associations for a reviewer for ttl seconds. Does not commit.
+
+    A single UPDATE ... WHERE id IN (head of the queue) AND not leased RETURNING id: the
+    repeated lease check makes it a compare-and-set, so two reviewers never get the same pair.
+    On PostgreSQL the inner SELECT uses FOR UPDATE SKIP LOCKED, so concurrent claims take the
+    next rows instead of waiting; SQLite runs writes one at a time.
+    """
+    now = now or datetime.utcnow()
+    head = due_reviews(db, LocationCategoryReviewed.id, now=now).limit(n).with_for_update(skip_locked=True)
+    result = db.execute(
+        update(LocationCategoryReviewed)
+        .where(LocationCategoryReviewed.id.in_(head.statement), _not_leased(now))
+        .values(leased_by=worker, lease_expires_at=now + timedelta(seconds=ttl))
+        .returning(LocationCategoryReviewed.id)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalars().all()
+
+
+def mark_pairs_reviewed(db: Session, pairs, reviewed_at: datetime | None = None) -> set[tuple[int, int]]:
+    """Mark (location_id, category_id) pairs as reviewed without loading them.
+
+    Runs one UPDATE ... WHERE (location_id, category_id) IN (...) RETURNING per chunk of pairs
+    and returns the pairs that matched an association. Releases their leases and schedules
+    their next review with the review policy, in the same statement where the database can
+    compute the date. Does not commit.
+    """
+    reviewed_at = reviewed_at or datetime.utcnow()
+    pairs = list(dict.fromkeys(pairs))
+    matched = set()
+    values = {"was_reviewed": True, "last_reviewed": reviewed_at, "leased_by": None, "lease_expires_at": None}
+    due_at = reviewed_due_at(db, reviewed_at)
+    if due_at is not None:
+        values["due_at"] = due_at
+
+    for start in range(0, len(pairs), PAIRS_PER_STATEMENT):
+        chunk = pairs[start:start + PAIRS_PER_STATEMENT]
+        result = db.execute(
+            update(LocationCategoryReviewed)
+            .where(tuple_(LocationCategoryReviewed.location_id, LocationCategoryReviewed.category_id).in_(chunk))
+            .values(values)
+            .returning(LocationCategoryReviewed.id, LocationCategoryReviewed.location_id,
+                       LocationCategoryReviewed.category_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        if result and due_at is None:
+            reschedule(db, LocationCategoryReviewed.id.in_([row.id for row in result]))
+        matched.update((row.location_id, row.category_id) for row in result)
+
+    if matched:
+        bump_table_version(db, "location_category_reviewed")
+    return matched
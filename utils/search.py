@@ -0,0 +1,172 @@
+import bisect
+import re
+import threading
+import unicodedata
+from sqlalchemy import Column, Integer, MetaData, String, Table, func, literal_column, or_, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from models.models import Location
+
+
+# FTS5 index over locations.name/description (SQLite only), an external-content table
+# kept in sync by triggers. Own MetaData so create_all leaves it alone.
+fts_metadata = MetaData()
+locations_fts = Table(
+    "locations_fts", fts_metadata,
+    Column("rowid", Integer, primary_key=True),
+    Column("name", String),
+    Column("description", String),
+)
+
+FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS locations_fts USING fts5(
+        name, description, content='locations', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS locations_fts_ai AFTER INSERT ON locations BEGIN
+        INSERT INTO locations_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS locations_fts_ad AFTER DELETE ON locations BEGIN
+        INSERT INTO locations_fts(locations_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS locations_fts_au AFTER UPDATE OF name, description ON locations BEGIN
+        INSERT INTO locations_fts(locations_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO locations_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END""",
+]
+
+_TERM = re.compile(r"\w+")
+
+
+def uses_fts(bind) -> bool:
+    """Whether text search can use the SQLite FTS5 index."""
+    return bind.dialect.name == "sqlite"
+
+
+def ensure_search_index(conn: Connection):
+    """Create the FTS5 index and its sync triggers, filling it on first creation."""
+    if not uses_fts(conn):
+        return
+
+    existed = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'locations_fts'")
+    ).first()
+    for statement in FTS_DDL:
+        conn.execute(text(statement))
+    if not existed:
+        conn.execute(text("INSERT INTO locations_fts(locations_fts) VALUES ('rebuild')"))
+
+
+def search_terms(q: str) -> list[str]:
+    """Words of a search query; punctuation is dropped so user input never breaks the MATCH syntax."""
+    return _TERM.findall(q)
+
+
+def _fts_query(terms: list[str]) -> str:
+    # Every term quoted; the last one also matches as a prefix, so results follow the user while they type
+    return " ".join(f'"{term}"' for term in terms) + "*"
+
+
+def apply_text_search(query, bind, terms: list[str]):
+    """Restrict a Location query to rows containing every term, best matches first.
+
+    On SQLite this joins the FTS5 matches ranked by bm25; other databases fall back to
+    ILIKE on name and description.
+    """
+    if uses_fts(bind):
+        matches = select(locations_fts.c.rowid.label("id"), func.bm25(literal_column("locations_fts")).label("rank")) \
+            .where(literal_column("locations_fts").op("MATCH")(_fts_query(terms))).subquery()
+        return query.join(matches, matches.c.id == Location.id).order_by(matches.c.rank, Location.id)
+
+    return query.filter(*(
+        or_(Location.name.ilike(f"%{term}%"), Location.description.ilike(f"%{term}%")) for term in terms
+    )).order_by(Location.id)
+
+
+def normalize(value: str) -> str:
+    """Lower case without accents, so 'Café' and 'cafe' autocomplete alike."""
+    decomposed = unicodedata.normalize("NFKD", value.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+class NamePrefixIndex:
+    """Sorted list of normalized location names for type-ahead, searched with bisect.
+
+    Every word of a name starts an entry ('plaza mayor', 'mayor'), so a prefix matches at the
+    start of any word. Lookups are O(log n + k); like the other in-memory indexes every
+    process keeps its own copy, built at startup, updated by the location write handlers and
+    kept up to date with the other processes through utils.index_sync.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = []  # sorted (key, location_id)
+        self._names = {}  # location_id -> name
+
+    def __len__(self):
+        return len(self._names)
+
+    @staticmethod
+    def _entries(location_id: int, name: str):
+        words = normalize(name).split()
+        return sorted({(" ".join(words[start:]), location_id) for start in range(len(words))})
+
+    def _discard(self, location_id: int):
+        name = self._names.pop(location_id, None)
+        if name is None:
+            return
+        for entry in self._entries(location_id, name):
+            index = bisect.bisect_left(self._keys, entry)
+            if index < len(self._keys) and self._keys[index] == entry:
+                del self._keys[index]
+
+    def rebuild(self, rows):
+        """Replace the whole index with (id, name) rows."""
+        with self._lock:
+            self._names = {location_id: name for location_id, name in rows if name}
+            self._keys = sorted(entry for location_id, name in self._names.items()
+                                for entry in self._entries(location_id, name))
+
+    def upsert(self, location_id: int, name: str | None):
+        with self._lock:
+            self._discard(location_id)
+            if name:
+                self._names[location_id] = name
+                for entry in self._entries(location_id, name):
+                    bisect.insort(self._keys, entry)
+
+    def remove(self, location_id: int):
+        with self._lock:
+            self._discard(location_id)
+
+    def complete(self, prefix: str, limit: int = 10) -> list[dict]:
+        """Locations with a word starting with prefix, in alphabetical order of the match."""
+        prefix = " ".join(normalize(prefix).split())
+        if not prefix:
+            return []
+        result = {}
+        with self._lock:
+            index = bisect.bisect_left(self._keys, (prefix,))
+            while index < len(self._keys) and len(result) < limit:
+                key, location_id = self._keys[index]
+                if not key.startswith(prefix):
+                    break
+                result.setdefault(location_id, self._names[location_id])
+                index += 1
+        return [{"id": location_id, "name": name} for location_id, name in result.items()]
+
+
+def load_name_index(db: Session):
+    """(Re)build the process-wide autocomplete index from the locations table."""
+    name_index.rebuild(db.query(Location.id, Location.name).filter(Location.name.isnot(None)))
+
+
+def apply_name_changes(changes):
+    """Replay LocationChange entries written by any process into the process-wide index."""
+    for change in changes:
+        if change.deleted:
+            name_index.remove(change.id)
+        else:
+            name_index.upsert(change.id, change.name)
+
+
+name_index = NamePrefixIndex()
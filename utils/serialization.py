@@ -0,0 +1,33 @@
+from functools import lru_cache
+import orjson
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def to_json_line(item: dict) -> bytes:
+    """Serialize one row as an NDJSON line."""
+    return orjson.dumps(item, option=orjson.OPT_APPEND_NEWLINE)
+
+
+def json_response(content, headers: dict | None = None) -> Response:
+    """Serialize plain dicts/lists built from trusted database rows, without a response model.
+
+    Routes keep their response_model for the OpenAPI docs; this only skips validating
+    what the database already guarantees.
+    """
+    return Response(content=orjson.dumps(content), media_type="application/json", headers=headers)
+
+
+@lru_cache
+def json_adapter(response_model) -> TypeAdapter:
+    return TypeAdapter(response_model)
+
+
+def model_json_response(response_model, data, headers: dict | None = None) -> Response:
+    """Validate data against response_model and serialize it with pydantic in one pass."""
+    adapter = json_adapter(response_model)
+    body = adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+    return Response(content=body, media_type="application/json", headers=headers)
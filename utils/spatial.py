@@ -0,0 +1,131 @@
+import math
+from sqlalchemy import Column, Float, Integer, MetaData, Table, and_, or_, select, text
+from sqlalchemy.engine import Connection
+from models.models import Location
+
+
+EARTH_RADIUS_M = 6371008.8
+
+# R*Tree virtual table mirroring locations.latitude/longitude (SQLite only).
+# It lives in its own MetaData so create_all never tries to create it as a plain table.
+rtree_metadata = MetaData()
+locations_rtree = Table(
+    "locations_rtree", rtree_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("min_lat", Float),
+    Column("max_lat", Float),
+    Column("min_lon", Float),
+    Column("max_lon", Float),
+)
+
+RTREE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS locations_rtree USING rtree(id, min_lat, max_lat, min_lon, max_lon)",
+    """CREATE TRIGGER IF NOT EXISTS locations_rtree_ai AFTER INSERT ON locations BEGIN
+        INSERT INTO locations_rtree VALUES (new.id, new.latitude, new.latitude, new.longitude, new.longitude);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS locations_rtree_au AFTER UPDATE OF latitude, longitude ON locations BEGIN
+        UPDATE locations_rtree SET min_lat = new.latitude, max_lat = new.latitude,
+                                   min_lon = new.longitude, max_lon = new.longitude
+        WHERE id = new.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS locations_rtree_ad AFTER DELETE ON locations BEGIN
+        DELETE FROM locations_rtree WHERE id = old.id;
+    END""",
+]
+
+
+def uses_rtree(bind) -> bool:
+    """Whether the spatial queries can use the SQLite R*Tree index."""
+    return bind.dialect.name == "sqlite"
+
+
+def ensure_spatial_index(conn: Connection):
+    """Create the R*Tree index and its sync triggers, backfilling it on first creation."""
+    if not uses_rtree(conn):
+        return
+
+    existed = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'locations_rtree'")
+    ).first()
+    for statement in RTREE_DDL:
+        conn.execute(text(statement))
+    if not existed:
+        conn.execute(text(
+            "INSERT INTO locations_rtree SELECT id, latitude, latitude, longitude, longitude FROM locations"
+        ))
+
+
+def parse_bbox(bbox: str) -> tuple[float, float, float, float]:
+    """Parse a 'min_lon,min_lat,max_lon,max_lat' string (GeoJSON order).
+
+    min_lon may be greater than max_lon for boxes that cross the antimeridian.
+    """
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(value) for value in bbox.split(","))
+    except ValueError:
+        raise ValueError("bbox must be 'min_lon,min_lat,max_lon,max_lat'")
+
+    if not (-90 <= min_lat <= max_lat <= 90):
+        raise ValueError("bbox latitudes must satisfy -90 <= min_lat <= max_lat <= 90")
+    if not (-180 <= min_lon <= 180 and -180 <= max_lon <= 180):
+        raise ValueError("bbox longitudes must be between -180 and 180")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def _lon_ranges(min_lon: float, max_lon: float) -> list[tuple[float, float]]:
+    """Split a longitude interval in two when it crosses the antimeridian."""
+    if min_lon <= max_lon:
+        return [(min_lon, max_lon)]
+    return [(min_lon, 180.0), (-180.0, max_lon)]
+
+
+def bbox_condition(bind, min_lon: float, min_lat: float, max_lon: float, max_lat: float):
+    """Build an exact WHERE clause for Location rows inside the bbox.
+
+    On SQLite the candidates come from the R*Tree; the column comparisons then trim the
+    float32 rounding of the index. Other backends use the (latitude, longitude) index.
+    """
+    lon_ranges = _lon_ranges(min_lon, max_lon)
+    exact = and_(
+        Location.latitude.between(min_lat, max_lat),
+        or_(*(Location.longitude.between(lo, hi) for lo, hi in lon_ranges)),
+    )
+    if not uses_rtree(bind):
+        return exact
+
+    candidates = select(locations_rtree.c.id).where(
+        locations_rtree.c.max_lat >= min_lat,
+        locations_rtree.c.min_lat <= max_lat,
+        or_(*(and_(locations_rtree.c.max_lon >= lo, locations_rtree.c.min_lon <= hi) for lo, hi in lon_ranges)),
+    )
+    return and_(Location.id.in_(candidates), exact)
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in meters between two points given in degrees."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def radius_bbox(lat: float, lon: float, radius_m: float) -> tuple[float, float, float, float]:
+    """Smallest lon/lat box that contains the circle, as (min_lon, min_lat, max_lon, max_lat)."""
+    d_lat = math.degrees(radius_m / EARTH_RADIUS_M)
+    min_lat, max_lat = lat - d_lat, lat + d_lat
+
+    # The circle reaches a pole: every longitude is inside
+    if min_lat <= -90 or max_lat >= 90:
+        return -180.0, max(min_lat, -90.0), 180.0, min(max_lat, 90.0)
+
+    d_lon = math.degrees(math.asin(min(1.0, math.sin(radius_m / EARTH_RADIUS_M) / math.cos(math.radians(lat)))))
+    if d_lon >= 180:
+        return -180.0, min_lat, 180.0, max_lat
+
+    min_lon, max_lon = lon - d_lon, lon + d_lon
+    if min_lon < -180:
+        min_lon += 360
+    if max_lon > 180:
+        max_lon -= 360
+    return min_lon, min_lat, max_lon, max_lat
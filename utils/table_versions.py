@@ -0,0 +1,99 @@
+import os
+import threading
+import time
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+from db.database import async_engine, engine, insert_ignore, replica_engines
+from utils.metrics import record_cache
+from models.models import TableVersion
+
+
+# How often a worker re-reads table_versions to notice writes made by other workers
+VERSION_CHECK_INTERVAL = float(os.getenv("VERSION_CHECK_INTERVAL", "1.0"))
+
+
+def bump_table_version(db: Session, table_name: str) -> int:
+    """Increment the change counter of a table and return its new value. Does not commit.
+
+    The counter row stays locked until the transaction ends, so versions are handed out in
+    commit order. Once the transaction commits, this process' tracker is refreshed right away.
+    """
+    statement = update(TableVersion).where(TableVersion.table_name == table_name) \
+        .values(version=TableVersion.version + 1).returning(TableVersion.version)
+    version = db.execute(statement).scalar()
+    if version is None:
+        db.execute(insert_ignore(db, TableVersion).values(table_name=table_name, version=0))
+        version = db.execute(statement).scalar()
+    db.info.setdefault("bumped_tables", set()).add(table_name)
+    return version
+
+
+class TableVersionTracker:
+    """Process-local copy of the table_versions of one database, so version checks rarely hit it.
+
+    Re-read at most every VERSION_CHECK_INTERVAL seconds, and immediately after this process
+    commits a transaction that bumped a version. Callbacks registered with on_change run
+    after such commits, with the set of bumped tables. Versions are always read from the
+    tracker's own engines, whatever session asks: a replica lagging behind the primary has
+    its own tracker, and its versions are never mixed with the primary's.
+    """
+
+    def __init__(self, name: str, binds):
+        self.name = name
+        self.binds = [bind for bind in binds if bind is not None]
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._checked_at = None
+        self._listeners = []
+
+    def _read(self, db: Session | None) -> dict:
+        statement = select(TableVersion.table_name, TableVersion.version)
+        if db is not None and db.get_bind() in self.binds:
+            return dict(db.execute(statement).all())
+        with self.binds[0].connect() as conn:
+            return dict(conn.execute(statement).all())
+
+    def current(self, db: Session | None, tables) -> tuple[int, ...]:
+        """Versions of the given tables."""
+        if self._checked_at is None or time.monotonic() - self._checked_at >= VERSION_CHECK_INTERVAL:
+            record_cache("table_versions", "miss")
+            versions = self._read(db)
+            with self._lock:
+                self._versions = versions
+                self._checked_at = time.monotonic()
+        else:
+            record_cache("table_versions", "hit")
+        return tuple(self._versions.get(table, 0) for table in tables)
+
+    def invalidate(self, tables=()):
+        """Force a re-read on the next check and notify listeners."""
+        with self._lock:
+            self._checked_at = None
+        for listener in self._listeners:
+            listener(set(tables))
+
+    def on_change(self, listener):
+        self._listeners.append(listener)
+
+
+# The primary, also reached through the async engine when DB_ASYNC is on
+table_versions = TableVersionTracker("primary", [engine, async_engine.sync_engine if async_engine else None])
+_replica_versions = {replica: TableVersionTracker(f"replica{index}", [replica])
+                     for index, replica in enumerate(replica_engines, start=1)}
+
+
+def versions_for(db: Session) -> TableVersionTracker:
+    """Tracker of the database a session reads from."""
+    return _replica_versions.get(db.get_bind(), table_versions)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_bumped_tables(session):
+    bumped = session.info.pop("bumped_tables", None)
+    if bumped:
+        table_versions.invalidate(bumped)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_bumped_tables(session):
+    session.info.pop("bumped_tables", None)